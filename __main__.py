@@ -16,10 +16,53 @@ In addition, you should have the following subfolders
     Sounds        (sound effects for the game)
     Images        (image files to use in the game)
 
-Moving any of these folders or files will prevent the game from working properly"""
+Moving any of these folders or files will prevent the game from working properly
+
+To play many games without graphics instead (see batch.py), run
+
+    python breakout simulate --games N --workers K [--storm N]
+
+To save the games you play to a replay file, or to play a replay file back
+without graphics (see replay.py), run
+
+    python breakout record FILE
+    python breakout replay FILE
+
+To show the frame time statistics of the game (see perf.py), run
+
+    python breakout stats
+
+To write a trace of every frame that can be opened in chrome://tracing or
+Perfetto (see tracing.py), run
+
+    python breakout trace FILE
+
+To measure how long the game takes to start and show its first frame (see
+bench.py), run
+
+    python breakout bench --runs N
+
+The game modules are only imported by the command that needs them, so this
+does not load Kivy."""
+import sys
 from constants import *
-from breakout import *
 
 # Application code
 if __name__ == '__main__':
-    Breakout(width=GAME_WIDTH,height=GAME_HEIGHT).run()
+    if len(sys.argv) > 1 and sys.argv[1] == 'simulate':
+        import batch
+        batch.main(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == 'replay':
+        import replay
+        replay.main(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        import bench
+        bench.main(sys.argv[2:])
+    else:
+        from breakout import *
+        stats = len(sys.argv) == 2 and sys.argv[1] == 'stats'
+        trace = sys.argv[2] if len(sys.argv) == 3 and sys.argv[1] == 'trace' else None
+        game = Breakout(width=GAME_WIDTH,height=GAME_HEIGHT,stats=stats,overlay=stats,trace=trace)
+        if len(sys.argv) == 3 and sys.argv[1] == 'record':
+            game.record(sys.argv[2])
+        game.run()
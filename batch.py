@@ -0,0 +1,145 @@
+# batch.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Batch runner for Breakout
+
+This module plays many complete games of Breakout without graphics, spread over
+several processes, and sums up the results.  It is used to tune the rules of the
+game (such as NUMBER_TURNS or the brick layout) without having to play them.
+
+The games are instances of Simulation (see simulation.py).  The paddle is moved
+by a scripted policy instead of the mouse.  Each game gets its own seed for the
+random generator that serves the ball, so a run can be reproduced exactly.
+With --storm N, every game also serves a Storm of N extra balls with its first
+ball, to see how the rules hold up with many balls in play.
+
+To run a batch from the command line, type
+
+    python breakout simulate --games N --workers K [--storm N]
+
+in the directory containing breakout.  The games are streamed back from the
+workers as they finish, and a summary is printed at the end."""
+import argparse
+import functools
+import multiprocessing
+import random
+import statistics
+from constants import *
+from simulation import *
+
+#: the most updates a single game may last before it is stopped
+MAX_TICKS = 100000
+
+
+def follow(sim, touch):
+    '''Returns: the next mouse position for a paddle that chases the ball.
+
+    The paddle slides by the distance the mouse moves, so the mouse is moved by
+    the distance from the center of the paddle to the center of the ball.
+
+    Precondition: sim is a Simulation with a ball in play; touch is the last
+    mouse position (a float).'''
+    ball = sim.getBall()
+    return touch + (ball[0] + BALL_DIAMETER/2) - (sim.getPaddle() + PADDLE_WIDTH/2)
+
+
+def play(seed, policy=follow, storm=0):
+    '''Returns: the result of a complete game played with the given seed, as a dict.
+
+    The game is played until the tries run out, the wall is empty, or MAX_TICKS
+    updates have passed.  A new ball is served as soon as one is lost.  The dict
+    has the keys 'seed', 'score', 'tries' (tries used), 'ticks' (updates played),
+    'cleared' (the number of updates to clear the wall, or None if it was not
+    cleared), 'touches' (paddle hits) and 'storm' (the bricks broken by the
+    storm, which are also in the score).
+
+    Precondition: seed is an int; policy is a function taking a Simulation and the
+    last mouse position (a float), and returning the next one; storm is the
+    number of extra balls served with the first ball (an int >= 0).'''
+    sim = Simulation(random.Random(seed))
+    sim.createBall()
+    if storm > 0:
+        sim.createStorm(storm)
+    touch = float(GAME_WIDTH/2)
+    ticks = 0
+    while sim.getTries() > 0 and not sim.getWin() and ticks < MAX_TICKS:
+        touch = policy(sim, touch)
+        sim.update(touch)
+        ticks = ticks + 1
+        if sim.getBall()[1] <= 0 and sim.getTries() > 0:
+            sim.createBall()
+    return {'seed': seed, 'score': sim.score(), 'tries': NUMBER_TURNS - sim.getTries(),
+            'ticks': ticks, 'cleared': ticks if sim.getWin() else None,
+            'touches': sim.getTouches(),
+            'storm': 0 if storm == 0 else int(sim.getStorm().getCredit().sum())}
+
+
+def run(games, workers=1, seed=0, storm=0):
+    '''Yields the results of the given number of games as they finish.
+
+    Game k is played with the seed seed+k.  The games are played in a pool of
+    worker processes, and may finish in any order; each result holds its seed.
+
+    Precondition: games is an int >= 0; workers is an int >= 1; seed is an int;
+    storm is the number of extra balls of each game (an int >= 0).'''
+    seeds = range(seed, seed + games)
+    game = functools.partial(play, storm=storm)
+    if workers == 1:
+        for result in map(game, seeds):
+            yield result
+        return
+    with multiprocessing.Pool(workers) as pool:
+        chunk = max(1, games // (workers*8))
+        for result in pool.imap_unordered(game, seeds, chunk):
+            yield result
+
+
+def summarize(results):
+    '''Returns: a dict of summary statistics of the given game results.
+
+    The dict has the number of games, the mean, median, minimum and maximum score,
+    the mean tries used, the fraction of games that cleared the wall, the mean
+    updates to clear it (None if none did), the mean paddle touches and the mean
+    bricks broken by the storm.
+
+    Precondition: results is an iterable of dicts returned by play.'''
+    scores = []
+    tries = []
+    touches = []
+    storms = []
+    cleared = []
+    for result in results:
+        scores.append(result['score'])
+        tries.append(result['tries'])
+        touches.append(result['touches'])
+        storms.append(result['storm'])
+        if not result['cleared'] is None:
+            cleared.append(result['cleared'])
+    if len(scores) == 0:
+        return {'games': 0}
+    return {'games': len(scores),
+            'score': statistics.mean(scores), 'median': statistics.median(scores),
+            'min': min(scores), 'max': max(scores),
+            'tries': statistics.mean(tries), 'win rate': len(cleared)/len(scores),
+            'ticks to clear': statistics.mean(cleared) if len(cleared) > 0 else None,
+            'touches': statistics.mean(touches), 'storm': statistics.mean(storms)}
+
+
+def main(args):
+    '''Runs the simulate command with the given command line arguments.
+
+    Precondition: args is a list of strings (the arguments after "simulate").'''
+    parser = argparse.ArgumentParser(prog='breakout simulate',
+                                     description='Play many games of Breakout without graphics.')
+    parser.add_argument('--games', type=int, default=100, help='number of games to play')
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                        help='number of worker processes')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first game')
+    parser.add_argument('--storm', type=int, default=0,
+                        help='number of extra balls served with the first ball of each game')
+    options = parser.parse_args(args)
+    if options.games < 0 or options.workers < 1 or options.storm < 0:
+        parser.error('games and storm must be >= 0 and workers must be >= 1')
+    summary = summarize(run(options.games, options.workers, options.seed, options.storm))
+    for key in summary:
+        print('%-15s %s' % (key, summary[key]))
@@ -0,0 +1,299 @@
+# bench.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Startup benchmark for Breakout
+
+This module measures how long Breakout takes to start: from the moment the
+process is launched to the moment the first frame of the game is on screen.
+Each run starts a fresh Python process (so nothing is already imported or
+cached in memory), which reports the time at which it reached each phase:
+
+    python    the interpreter is running the game (Python and __main__ loaded)
+    game2d    game2d is imported (this should not load Kivy or pygame)
+    breakout  breakout is imported and the Breakout app is made
+    frame     the first frame has been drawn and shown in the window
+
+The times are wall-clock times, in milliseconds from the launch.  To run the
+benchmark from the command line, type
+
+    python breakout bench --runs N
+
+in the directory containing breakout.  A window opens and closes once per run.
+The median of each phase is printed at the end.
+
+The game logic and the drawing it asks for can also be timed on their own,
+without a window or a GPU, by running the whole app on a RecordingBackend
+(see game2d.py), or on a RasterBackend to include drawing the pixels on the
+CPU (see raster.py):
+
+    python breakout bench --headless FRAMES [--raster]
+
+The memory taken by each brick, in each of the ways a wall can be kept, is
+measured for a wall of MEMORY_WALL bricks with
+
+    python breakout bench --memory
+
+and the number of shapes made per second, with the attributes checked or not
+(see game2d.setValidation), with
+
+    python breakout bench --shapes COUNT"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from constants import *
+
+#: the phases reported by each run, in order
+STARTUP_PHASES = ('python', 'game2d', 'breakout', 'frame')
+#: the rows and columns of the wall measured by the memory benchmark
+MEMORY_WALL = (100, 100)
+
+
+def startup(runs):
+    '''Yields the timings of the given number of launches of Breakout.
+
+    Each timing is a dict with a key for each of STARTUP_PHASES, giving the
+    milliseconds from the launch of the process to the end of that phase, and
+    the key 'loaded' listing the modules among kivy and pygame that importing
+    game2d loaded (it should be empty).
+
+    Precondition: runs is an int >= 0.'''
+    folder = os.path.dirname(os.path.abspath(__file__))
+    for run in range(runs):
+        launched = time.time()
+        output = subprocess.run([sys.executable, folder, 'bench', '--child', repr(launched)],
+                                stdout=subprocess.PIPE, universal_newlines=True, check=True).stdout
+        yield json.loads(output.strip().splitlines()[-1])
+
+
+def headless(frames, raster=False):
+    '''Returns: the timings of the given number of frames of Breakout without a window.
+
+    The game is started at once, and started again whenever it pauses or ends.
+    The result is a dict with the milliseconds per frame ('frame ms'), the
+    drawing instructions sent to the view per frame ('instructions'), and the
+    instructions made by the backend of each kind ('made').
+
+    If raster is True, the game draws on a RasterBackend, and the picture is
+    taken after every frame.  The result then has the milliseconds taken by
+    getFrame ('raster ms') and the pixels it redrew per frame ('pixels')
+    instead of 'made'.
+
+    Precondition: frames is an int >= 0; raster is a bool.'''
+    import game2d
+    import breakout
+    if raster:
+        import raster as module
+        backend = module.RasterBackend(GAME_WIDTH, GAME_HEIGHT)
+    else:
+        backend = game2d.RecordingBackend()
+    game = breakout.Breakout(width=GAME_WIDTH, height=GAME_HEIGHT, backend=backend)
+    game.runFrames(0)
+    emitted = game.view.emitted
+    drawing = 0.0
+    pixels = 0
+    start = time.perf_counter()
+    for frame in range(frames):
+        # Press and release the mouse to leave any menu or pause
+        if game.getState() in (STATE_INACTIVE, STATE_PAUSED, STATE_COMPLETE):
+            game.view.setTouch(game2d.GPoint(GAME_WIDTH/2, GAME_HEIGHT/2))
+        else:
+            game.view.setTouch(None)
+        game.runFrames(1)
+        if raster:
+            taken = time.perf_counter()
+            backend.getFrame()
+            drawing = drawing + time.perf_counter() - taken
+            pixels = pixels + backend.getRedrawn()
+    elapsed = time.perf_counter() - start
+    game.on_stop()
+    count = max(frames, 1)
+    result = {'frame ms': elapsed*1000/count, 'instructions': (game.view.emitted-emitted)/count}
+    if raster:
+        result['raster ms'] = drawing*1000/count
+        result['pixels'] = pixels/count
+    else:
+        result['made'] = backend.getMade()
+    return result
+
+
+def memory(rows, columns):
+    '''Returns: the bytes per brick of a wall of rows*columns bricks, kept in each way.
+
+    The result is a dict with the bytes per brick of a list of GRectangle
+    ('GRectangle'), the same once drawn ('GRectangle drawn'), a list of GBox
+    ('GBox'), one GBatch once drawn ('GBatch drawn'), and the arrays of a
+    simulation.Wall ('Wall arrays').  Drawing is done on a NullBackend, so
+    the instructions are the smallest a backend can make.  Only the memory
+    still held once the wall is made is counted (traced by tracemalloc).
+
+    Precondition: rows and columns are ints > 0.'''
+    import game2d
+    import simulation
+    view = game2d.GView(game2d.NullBackend())
+    frames = [(BRICK_SEP_H/2 + c*(BRICK_WIDTH+BRICK_SEP_H), r*(BRICK_HEIGHT+BRICK_SEP_V),
+               BRICK_WIDTH, BRICK_HEIGHT) for r in range(rows) for c in range(columns)]
+    colors = [ROW_COLORS[r % len(ROW_COLORS)] for r in range(rows) for c in range(columns)]
+
+    def rectangles(drawn):
+        bricks = [game2d.GRectangle(x=x, y=y, width=w, height=h, fillcolor=color, linecolor=color)
+                  for (x, y, w, h), color in zip(frames, colors)]
+        if drawn:
+            for brick in bricks:
+                brick.draw(view)
+        return bricks
+
+    def batch():
+        bricks = game2d.GBatch(frames=frames, colors=colors)
+        bricks.draw(view)
+        return bricks
+
+    # Make the shared color instructions before measuring
+    rectangles(True)
+    count = rows*columns
+    result = {'GRectangle': _traced(lambda: rectangles(False))/count,
+              'GRectangle drawn': _traced(lambda: rectangles(True))/count,
+              'GBox': _traced(lambda: [game2d.GBox(*frame) for frame in frames])/count,
+              'GBatch drawn': _traced(batch)/count}
+    wall = simulation.Wall(rows, columns)
+    arrays = wall.getEdges() + (wall.getMask(),)
+    result['Wall arrays'] = sum(array.nbytes for array in arrays)/count
+    return result
+
+
+def shapes(count):
+    '''Returns: the bricks made per second, as GRectangle, with and without validation.
+
+    The result is a dict with the rate when every attribute is checked
+    ('validated'), when validation is off ('unchecked'), and when the bricks
+    are made with GRectangle.trusted while validation is on ('trusted').
+    Each rate is the best of three runs of count bricks.
+
+    Precondition: count is an int > 0.'''
+    import game2d
+    game2d.GView(game2d.NullBackend())
+    colors = [ROW_COLORS[i % len(ROW_COLORS)] for i in range(count)]
+
+    def make(constructor):
+        best = None
+        for run in range(3):
+            start = time.perf_counter()
+            for color in colors:
+                constructor(x=10, y=20, width=BRICK_WIDTH, height=BRICK_HEIGHT,
+                            fillcolor=color, linecolor=color)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return count/best
+
+    validate = game2d.getValidation()
+    try:
+        game2d.setValidation(True)
+        result = {'validated': make(game2d.GRectangle)}
+        game2d.setValidation(False)
+        result['unchecked'] = make(game2d.GRectangle)
+        game2d.setValidation(True)
+        result['trusted'] = make(game2d.GRectangle.trusted)
+    finally:
+        game2d.setValidation(validate)
+    return result
+
+
+def _traced(make):
+    '''Returns: the bytes allocated by make() that are still held by what it returns.
+
+    Precondition: make is a function with no arguments.'''
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        # Keep the result alive until the memory is measured, or it would be freed
+        kept = make()
+        return tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def _child(launched):
+    '''Runs one launch of the benchmark: starts Breakout, and prints the timings
+    as a line of JSON once the first frame is shown.
+
+    Precondition: launched is the time the process was launched, from time.time().'''
+    times = {'python': time.time()}
+    import game2d
+    times['game2d'] = time.time()
+    loaded = [name for name in ('kivy', 'pygame') if name in sys.modules]
+    import breakout
+
+    class Probe(breakout.Breakout):
+        """The Breakout app, stopped after its first frame is shown"""
+
+        def draw(self):
+            breakout.Breakout.draw(self)
+            if not 'frame' in times and not self._app is None:
+                # The frame is shown when the window flips it to the screen
+                times['frame'] = None
+                self._app.root_window.bind(on_flip=self._flipped)
+
+        def _flipped(self, window):
+            if times['frame'] is None:
+                times['frame'] = time.time()
+                result = {key: (times[key] - launched)*1000 for key in STARTUP_PHASES}
+                result['loaded'] = loaded
+                print(json.dumps(result))
+                sys.stdout.flush()
+                self.stop()
+
+    game = Probe(width=GAME_WIDTH, height=GAME_HEIGHT)
+    times['breakout'] = time.time()
+    game.run()
+
+
+def main(args):
+    '''Runs the bench command with the given command line arguments.
+
+    Precondition: args is a list of strings (the arguments after "bench").'''
+    parser = argparse.ArgumentParser(prog='breakout bench',
+                                     description='Measure the startup time of Breakout.')
+    parser.add_argument('--runs', type=int, default=5, help='number of launches to time')
+    parser.add_argument('--headless', type=int, default=None, metavar='FRAMES',
+                        help='time this many frames without a window instead')
+    parser.add_argument('--raster', action='store_true',
+                        help='with --headless, draw the pixels on the CPU')
+    parser.add_argument('--memory', action='store_true',
+                        help='measure the bytes per brick of a %dx%d wall instead' % MEMORY_WALL)
+    parser.add_argument('--shapes', type=int, default=None, metavar='COUNT',
+                        help='measure the shapes made per second instead')
+    parser.add_argument('--child', type=float, default=None, help=argparse.SUPPRESS)
+    options = parser.parse_args(args)
+    if not options.child is None:
+        _child(options.child)
+        return
+    if options.memory:
+        result = memory(*MEMORY_WALL)
+        for key in result:
+            print('%-16s %8.1f bytes' % (key, result[key]))
+        return
+    if not options.shapes is None:
+        if options.shapes < 1:
+            parser.error('count must be >= 1')
+        result = shapes(options.shapes)
+        for key in result:
+            print('%-10s %10.0f shapes/s' % (key, result[key]))
+        return
+    if not options.headless is None:
+        if options.headless < 0:
+            parser.error('frames must be >= 0')
+        result = headless(options.headless, options.raster)
+        for key in result:
+            print('%-12s %s' % (key, result[key]))
+        return
+    if options.runs < 1:
+        parser.error('runs must be >= 1')
+    results = list(startup(options.runs))
+    for phase in STARTUP_PHASES:
+        print('%-10s %8.1f ms' % (phase, statistics.median([result[phase] for result in results])))
+    loaded = sorted(set(name for result in results for name in result['loaded']))
+    print('%-10s %s' % ('loaded', ', '.join(loaded) if loaded else 'nothing'))
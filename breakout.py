@@ -8,9 +8,11 @@ There should not be any need for additional classes in this module.
 If you need more classes, 99% of the time they belong in either the gameplay
 module or the models module. If you are ensure about where a new class should go, 
 post a question on Piazza."""
+import random
 from constants import *
 from gameplay import *
 from game2d import *
+from replay import Recorder
 
 
 # PRIMARY RULE: Breakout can only access attributes in gameplay.py via getters/setters
@@ -53,8 +55,10 @@ class Breakout(GameApp):
             the last mouse position (if Button was pressed)
         _game   [GModel, or None if there is no game currently active]: 
             the game controller, which manages the paddle, ball, and bricks
-        _message 
-            creates a welcome screen that tells the player to click in order to begin 
+        _message [GLabel]
+            the message in the middle of the screen: the welcome screen that tells
+            the player to click in order to begin, the countdown, or the end of the
+            game.  It is shown in every state but STATE_ACTIVE.
     ADDITIONAL INVARIANTS: Attribute _game is only None if _state is STATE_INACTIVE.
     
     You may have more attributes if you wish (you might need an attribute to store
@@ -63,14 +67,45 @@ class Breakout(GameApp):
     
     LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
     _frames       [int, >=0]
-            frames since game is initialized
+            ticks since the countdown started
     _lives        [int >=0]
             number of tries the player has left
     _score        [GLabel]
             a message that is always displayed at the top right corner
             that indiciates the eliminated blocks (makes use of the method
             score in gameplay)
+    _recorder     [Recorder or None]
+            saves every game to a replay file (see replay.py), if recording.
+            It is set by the method record, before the game is run.
+    _shown        [Gameplay or None]
+            the game currently attached to the view.  The wall, paddle and
+            ball stay in the view while attached, so they are not drawn
+            every frame.
+    
+    The labels _message and _score are made once, in init.  Their text is
+    changed as the game goes on, which only renders text when it differs
+    from what the label already shows.
     """
+    # There is no recorder unless record is called
+    _recorder = None
+    
+    def getState(self):
+        """Returns the current state of the game (one of the STATE constants)"""
+        return self._state
+    
+    def record(self, path):
+        """Records the games played to a replay file.
+        
+        Call this before the method run.  The file is closed when the app stops.
+        
+        Precondition: path is a string naming a file that can be written."""
+        self._recorder = Recorder(path)
+    
+    def on_stop(self):
+        """Special Kivy method called when the app stops; closes the replay file"""
+        if not self._recorder is None:
+            self._recorder.close()
+        GameApp.on_stop(self)
     
     def init(self):
         """Initialize the game state.
@@ -88,6 +123,10 @@ class Breakout(GameApp):
         self._last = None
         self._frames = 0
         self._lives = 3
+        self._shown = None
+        self.view.clear()
+        self._message = GLabel(text='Press to Play!', x = GAME_WIDTH/2- 45, y = GAME_HEIGHT/2)
+        self._score = GLabel(text='Score: 0', x = 0, y = GAME_HEIGHT - 20)
         
     def update(self,dt):
         """Animate a single frame in the game.
@@ -134,31 +173,31 @@ class Breakout(GameApp):
         You are allowed to add more states if you wish. Should you do so,
         you should describe them here.
         
-        Precondition: dt is the time since last update (a float).  This
-        parameter can be safely ignored. It is only relevant for debugging
-        if your game is running really slowly. If dt > 0.5, you have a 
-        framerate problem because you are trying to do something too complex."""
+        Precondition: dt is the length of a tick (a float).  GameApp calls
+        this method `tick` times a second however fast the screen is drawn,
+        so the ball and the countdown move at the same speed on any machine.
+        This parameter can be safely ignored."""
         if self._state == STATE_INACTIVE:
-            self._message = GLabel(text='Press to Play!', x = GAME_WIDTH/2- 45, y = GAME_HEIGHT/2)
-            self._game = Gameplay()
+            self._setMessage('Press to Play!', GAME_WIDTH/2- 45, GAME_HEIGHT/2)
             if self._view.touch != None and self._last == None:
+                self._newGame()
                 self._state = STATE_COUNTDOWN
         if self._state == STATE_COUNTDOWN:
             self.countdownHelper()
         if self._state == STATE_ACTIVE:
             self.activeHelper()
         if self._state == STATE_PAUSED:
-            self._message = GLabel(text= str(self._game.getTries()) + ' lives left.', x = GAME_WIDTH/2- 45, y = GAME_HEIGHT/2)
+            self._setMessage(str(self._game.getTries()) + ' lives left.', GAME_WIDTH/2- 45, GAME_HEIGHT/2)
             if self._last == None and self._view.touch != None:
                 self._frames = 0
                 self._state = STATE_COUNTDOWN
         if self._state == STATE_COMPLETE:
             if self._game.getTries() == 0:
-                self._message = GLabel(text= 'GAME OVER, YOUR SCORE WAS ' + str(self._game.score()), x = GAME_WIDTH/2- 100, y = GAME_HEIGHT/2)
+                self._setMessage('GAME OVER, YOUR SCORE WAS ' + str(self._game.score()), GAME_WIDTH/2- 100, GAME_HEIGHT/2)
                 if self._last == None and self._view.touch != None:
                     self.init()
             elif self._game.getWin():
-                self._message = GLabel(text= 'YOU WIN!', x = GAME_WIDTH/2- 45, y = GAME_HEIGHT/2)
+                self._setMessage('YOU WIN!', GAME_WIDTH/2- 45, GAME_HEIGHT/2)
                 if self._last == None and self._view.touch != None:
                     self.init()
         self._last = self._view.touch
@@ -172,9 +211,10 @@ class Breakout(GameApp):
             current game's tries have reached 0 or if the _win bool has become True.
             Then the state will change to STATE_COMPLETE.
         '''
-        self._score = GLabel(text ='Score: ' + str(self._game.score()), x = 0, y = GAME_HEIGHT - 20)
-        self._message = None
+        self._score.text = 'Score: ' + str(self._game.score())
         self._game.update(self._view.touch)
+        if not self._recorder is None:
+            self._recorder.update(self._view.touch)
         ball = self._game.getBall()
         if ball != None and ball.y <= 0:
             self._state = STATE_PAUSED
@@ -184,23 +224,38 @@ class Breakout(GameApp):
     def countdownHelper(self):
         ''' Helper Function for STATE_COUNTDOWN. This displays the seconds before entering STATE_ACTIVE
             
-            When frames since the initialization of the state are between 0 and 60 (one second),
+            When ticks since the initialization of the state are between 0 and tick (one second),
             the screen will display '3'. Breakout will then countdown from 3 before
             creating the ball and going into STATE_ACTIVE.
         '''
         self._game.updatePaddle(self._view.touch)
+        if not self._recorder is None:
+            self._recorder.paddle(self._view.touch)
         self._frames = self._frames + 1
-        self._score = GLabel(text = 'Score: ' + str(self._game.score()), x = 0, y = GAME_HEIGHT - 20)
-        if 0 < self._frames <= 60:
-            self._message = GLabel(text='3', x = GAME_WIDTH/2-3, y = GAME_HEIGHT/2+20) 
-        if 60 < self._frames <= 120:
-            self._message = GLabel(text='2', x = GAME_WIDTH/2-3, y = GAME_HEIGHT/2+20) 
-        if 120 < self._frames <= 180:
-            self._message = GLabel(text='1', x = GAME_WIDTH/2-3, y = GAME_HEIGHT/2+20)
-        if self._frames > 180:
+        self._score.text = 'Score: ' + str(self._game.score())
+        second = self.tick
+        if 0 < self._frames <= second:
+            self._setMessage('3', GAME_WIDTH/2-3, GAME_HEIGHT/2+20)
+        if second < self._frames <= 2*second:
+            self._setMessage('2', GAME_WIDTH/2-3, GAME_HEIGHT/2+20)
+        if 2*second < self._frames <= 3*second:
+            self._setMessage('1', GAME_WIDTH/2-3, GAME_HEIGHT/2+20)
+        if self._frames > 3*second:
             self._game.createBall()
+            if not self._recorder is None:
+                self._recorder.serve()
             self._state = STATE_ACTIVE
     
+    def _newGame(self):
+        '''Starts a new game, served by a random generator with a fresh seed.
+        
+        The seed is saved to the replay file when recording, so the game can be
+        played again exactly.'''
+        seed = random.getrandbits(63)
+        self._game = Gameplay(random.Random(seed))
+        if not self._recorder is None:
+            self._recorder.game(seed, self._game.getSimulation())
+    
     def draw(self):
         """Draws the game objects to the view.
         
@@ -209,23 +264,53 @@ class Breakout(GameApp):
         that easy!
         
         Many of the GObjects (such as the paddle, ball, and bricks) are
-        attributes in Gameplay. In order to draw them, you either need to
-        add getters for these attributes or you need to add a draw method
-        to class Gameplay.  We suggest the latter.  See the example 
-        subcontroller.py from class."""
-        if self._state == STATE_INACTIVE:
-            self._message.draw(self.view)
-        elif self._state == STATE_COUNTDOWN:
-            self._game.draw(self.view)
-            self._message.draw(self.view)
-            self._score.draw(self.view)
-        elif self._state == STATE_PAUSED:
-            self._game.draw(self.view)
-            self._message.draw(self.view)
-            self._score.draw(self.view)
-        elif self._state == STATE_COMPLETE:
-            self._message.draw(self.view)
+        attributes in Gameplay. Instead of drawing them every frame, the
+        game and the labels are attached to the view while they are on
+        screen, so only the objects that change cost anything to redraw.
+        
+        While the game is moving, the paddle and ball are drawn between the
+        last two ticks (see alpha in GameApp), so they move smoothly even
+        when the screen is drawn at a different rate than the game ticks."""
+        playing = self._state in (STATE_COUNTDOWN, STATE_PAUSED, STATE_ACTIVE)
+        self._showGame(self._game if playing else None)
+        if playing:
+            moving = self._state in (STATE_COUNTDOWN, STATE_ACTIVE)
+            self._game.interpolate(self.alpha if moving else 1.0)
+        self._show(self._message, self._state != STATE_ACTIVE)
+        self._show(self._score, playing)
+    
+    def _setMessage(self, text, x, y):
+        '''Changes the message in the middle of the screen.
+        
+        The message is laid out once, for its new text and position.
+        
+        Precondition: text is a string; x and y are the position of the message
+        (ints or floats).'''
+        with self._message.batch():
+            self._message.text = text
+            self._message.setPosition(x, y)
+    
+    def _show(self, label, visible):
+        '''Attaches label to the view if visible is True, and detaches it otherwise.
+        
+        Precondition: label is a GLabel; visible is a bool.'''
+        if visible:
+            self.view.attach(label)
         else:
-            self._game.draw(self.view)
-            self._game.drawBall(self.view)
-            self._score.draw(self.view)
\ No newline at end of file
+            self.view.detach(label)
+    
+    def _showGame(self, game):
+        '''Attaches game to the view in place of the game currently shown.
+        
+        The wall, paddle and ball of an attached game stay in the view, so they
+        are only attached when the game is first shown and detached when it is
+        hidden.  Bricks are detached as they are destroyed.
+        
+        Precondition: game is a Gameplay object or None (to show no game).'''
+        if self._shown is game:
+            return
+        if not self._shown is None:
+            self._shown.detach()
+        if not game is None:
+            game.attach(self.view)
+        self._shown = game
@@ -17,7 +17,13 @@
 
 
 class RGB(object):
-    """An instance is a RGB color value."""
+    """An instance is a RGB color value.
+
+    The attributes are kept in slots, so a color takes little memory.  Colors
+    that are never changed should be made with `intern`, so that all of them
+    share one object."""
+
+    __slots__ = ('red', 'green', 'blue', 'alpha')
 
     # METHODS
 
@@ -84,61 +90,82 @@ class RGB(object):
         return (self.red/255.0, self.green/255.0, self.blue/255.0)
 
 
+# Interned colors, by their (r,g,b,a) values
+_INTERNED = {}
+
+
+def intern(r, g, b, a=255):
+    """Returns: the shared RGB object (r,g,b,a), making it the first time.
+
+    Every call with the same values returns the same object, so a color used
+    by many shapes (like the color of a row of bricks) exists only once, and
+    two interned colors are equal exactly when they are the same object.  An
+    interned color must never be changed; make a new RGB object instead.
+
+    **Precondition**: r, g, b, a must all be in 0..255"""
+    key = (r, g, b, a)
+    color = _INTERNED.get(key)
+    if color is None:
+        color = RGB(r, g, b, a)
+        _INTERNED[key] = color
+    return color
+
+
 # Color Constants
 
 
 # The color Carnelian, or Cornell Red
 
-CARNELIAN = RGB(179, 27, 27)
+CARNELIAN = intern(179, 27, 27)
 
 #: The color white
 
-WHITE = RGB(255, 255, 255)
+WHITE = intern(255, 255, 255)
 
 #: The color light gray
 
-LIGHT_GRAY = RGB(192, 192, 192)
+LIGHT_GRAY = intern(192, 192, 192)
 
 #: The color gray
 
-GRAY = RGB(128, 128, 128)
+GRAY = intern(128, 128, 128)
 
 #: The color dark gray
 
-DARK_GRAY = RGB(64, 64, 64)
+DARK_GRAY = intern(64, 64, 64)
 
 #: The color black
 
-BLACK = RGB(0, 0, 0)
+BLACK = intern(0, 0, 0)
 
 #: The color red,
 
-RED = RGB(255, 0, 0)
+RED = intern(255, 0, 0)
 
 #: The color pink
 
-PINK = RGB(255, 175, 175)
+PINK = intern(255, 175, 175)
 
 #: The color orange
 
-ORANGE = RGB(255, 200, 0)
+ORANGE = intern(255, 200, 0)
 
 #: The color yellow
 
-YELLOW = RGB(255, 255, 0)
+YELLOW = intern(255, 255, 0)
 
 #: The color green
 
-GREEN = RGB(0, 255, 0)
+GREEN = intern(0, 255, 0)
 
 #: The color magenta
 
-MAGENTA = RGB(255, 0, 255)
+MAGENTA = intern(255, 0, 255)
 
 #: The color cyan
 
-CYAN = RGB(0, 255, 255)
+CYAN = intern(0, 255, 255)
 
 #: The color blue
 
-BLUE = RGB(0, 0, 255)
\ No newline at end of file
+BLUE = intern(0, 0, 255)
\ No newline at end of file
@@ -92,4 +92,6 @@ try:
 except: # Leave the contants alone
     pass
 
-### ADD MORE CONSTANTS (PROPERLY COMMENTED) AS NECESSARY ###
\ No newline at end of file
+### ADD MORE CONSTANTS (PROPERLY COMMENTED) AS NECESSARY ###
+#: the most bounces the ball can make in a single update
+MAX_BOUNCES = 8
@@ -0,0 +1,222 @@
+# env.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Vectorized environment for Breakout
+
+This module has BreakoutEnv, an environment in the style of Gym for training
+agents to play Breakout.  It steps a batch of independent games in lockstep:
+each game has its own bricks, paddle, ball and random generator, but all of
+them are kept in numpy arrays and moved together by array operations.  This
+costs far less than looping over as many Simulation objects in Python.
+
+The rules are those of Simulation (see simulation.py), as played by batch.py:
+the action of a game is the distance to slide its paddle, and a new ball is
+served as soon as one is lost.  A game stepped here with the same seed and the
+same actions is exactly the game a Simulation plays, to the last bit.
+
+    env = BreakoutEnv(64)
+    obs = env.reset(0)
+    while training:
+        obs, rewards, dones = env.step(policy(obs))
+
+A game that ends is started again at once with a new seed, so every step
+returns a full batch.  It does not import game2d, so it needs no display."""
+import random
+import numpy
+import simulation
+from constants import *
+
+#: the numbers at the start of each observation; the bricks come after them
+OBSERVATION = ('paddle', 'x', 'y', 'vx', 'vy')
+
+
+class BreakoutEnv(object):
+    """An instance is a batch of games of Breakout stepped together.
+
+    Game k of the batch is row k of every array.  The observation of a game is
+    a row of floats: the numbers named in OBSERVATION (the left of the paddle,
+    the bottom left corner and velocity of the ball), then 1.0 for each brick
+    still in the wall and 0.0 for each brick broken.
+
+    INSTANCE ATTRIBUTES:
+        _bricks  [tuple of 4 numpy arrays]: the left, bottom, right and top of each brick
+        _paddle  [numpy array of floats]: the x coordinate of the left of each paddle
+        _x       [numpy array of floats]: x coordinate of the left side of each ball
+        _y       [numpy array of floats]: y coordinate of the bottom of each ball
+        _vx      [numpy array of floats]: velocity of each ball in x direction
+        _vy      [numpy array of floats]: velocity of each ball in y direction
+        _tries   [numpy array of ints]: the tries left in each game
+        _count   [numpy array of ints]: the paddle touches of each game since its
+                 last lost ball (the touchCount of Simulation)
+        _alive   [numpy array of bools, shape (games, bricks)]: the bricks still
+                 in each wall
+        _rngs    [list of random.Random]: the random generator of each game
+        _seeds   [numpy array of ints]: the seed of the game in each row
+        _next    [int]: the seed of the next game to start
+        _steps   [numpy array of ints]: the steps taken in each game
+        _limit   [int > 0]: the most steps a game may last
+    """
+
+    def getSize(self):
+        '''Returns: the number of games in the batch'''
+        return len(self._paddle)
+
+    def getSeeds(self):
+        '''Returns: a copy of the numpy array of the seed of the game in each row'''
+        return self._seeds.copy()
+
+    def getTries(self):
+        '''Returns: a copy of the numpy array of the tries left in each game'''
+        return self._tries.copy()
+
+    def getScores(self):
+        '''Returns: a numpy array of the score of each game (its bricks broken)'''
+        return self._alive.shape[1] - self._alive.sum(axis=1)
+
+    def __init__(self, games, limit=100000):
+        '''Creates a batch of the given number of games.
+
+        The games are not ready until reset is called.
+
+        Precondition: games is an int > 0; limit is an int > 0, the most steps
+        a game may last before it is stopped (as MAX_TICKS in batch.py).'''
+        assert type(games) == int and games > 0, repr(games)+' is not a positive int'
+        assert type(limit) == int and limit > 0, repr(limit)+' is not a positive int'
+        wall = simulation.Wall()
+        self._bricks = wall.getBricks(numpy.arange(wall.getSize()))
+        self._paddle = numpy.zeros(games)
+        self._x = numpy.zeros(games)
+        self._y = numpy.zeros(games)
+        self._vx = numpy.zeros(games)
+        self._vy = numpy.zeros(games)
+        self._tries = numpy.zeros(games, dtype=int)
+        self._count = numpy.zeros(games, dtype=int)
+        self._alive = numpy.zeros((games, wall.getSize()), dtype=bool)
+        self._rngs = [None]*games
+        self._seeds = numpy.zeros(games, dtype=int)
+        self._next = 0
+        self._steps = numpy.zeros(games, dtype=int)
+        self._limit = limit
+
+    def reset(self, seed=0):
+        '''Starts every game again, and returns the observations.
+
+        Game k gets the seed seed+k, as in batch.run.  The games started later
+        (when a game ends) get the seeds after those.
+
+        Precondition: seed is an int.'''
+        self._next = seed
+        self._start(numpy.arange(self.getSize()))
+        return self._observe()
+
+    def step(self, actions):
+        '''Moves every game forward by one update, and returns the tuple
+        (observations, rewards, dones).
+
+        rewards is a numpy array of the bricks broken in each game in this step,
+        and dones a numpy array of bools, True for the games that ended in it:
+        they ran out of tries, cleared the wall, or lasted the most steps.  Those
+        games are started again with new seeds before this returns, so their
+        observations are the first of their new games.
+
+        Precondition: actions is a sequence (or numpy array) of floats with one
+        entry per game, the distance to slide each paddle.'''
+        actions = numpy.asarray(actions, dtype=float)
+        assert actions.shape == self._paddle.shape, repr(actions.shape)+' is not one action per game'
+        before = self._alive.sum(axis=1)
+        self._movePaddles(actions)
+        self._moveBalls()
+        rewards = before - self._alive.sum(axis=1)
+        self._steps = self._steps + 1
+        won = ~self._alive.any(axis=1)
+        lost = self._y <= 0
+        dones = won | (self._tries == 0) | (self._steps >= self._limit)
+        serve = numpy.flatnonzero(lost & ~dones)
+        for k in serve:
+            self._serve(k)
+        self._start(numpy.flatnonzero(dones))
+        return (self._observe(), rewards, dones)
+
+    def _start(self, games):
+        '''Starts new games in the given rows, with the next seeds.
+
+        Precondition: games is a numpy array of row indices.'''
+        for k in games:
+            self._rngs[k] = random.Random(self._next)
+            self._seeds[k] = self._next
+            self._next = self._next + 1
+        self._paddle[games] = float(GAME_WIDTH/2-PADDLE_WIDTH/2)
+        self._tries[games] = NUMBER_TURNS
+        self._count[games] = 0
+        self._alive[games] = True
+        self._steps[games] = 0
+        for k in games:
+            self._serve(k)
+
+    def _serve(self, k):
+        '''Serves a new ball in game k, as Simulation.createBall.
+
+        Precondition: k is a row index.'''
+        rng = self._rngs[k]
+        self._x[k] = float(GAME_WIDTH/2 - BALL_DIAMETER/2)
+        self._y[k] = float(GAME_HEIGHT/2)
+        self._vy[k] = -5.0
+        self._vx[k] = rng.uniform(1.0,5.0)
+        self._vx[k] = self._vx[k] * rng.choice([-1.0, 1.0])
+
+    def _observe(self):
+        '''Returns: the observations of the games, as a numpy array of floats'''
+        return numpy.hstack([self._paddle[:, None], self._x[:, None], self._y[:, None],
+                             self._vx[:, None], self._vy[:, None], self._alive])
+
+    def _movePaddles(self, actions):
+        '''Slides each paddle by its action, as Simulation._movePaddle.
+
+        Precondition: actions is a numpy array of floats, one per game.'''
+        self._paddle = numpy.where(self._paddle + actions < 0, 0.0,
+                                   numpy.where(self._paddle + PADDLE_WIDTH > GAME_WIDTH,
+                                               float(GAME_WIDTH - PADDLE_WIDTH),
+                                               self._paddle + actions))
+
+    def _moveBalls(self):
+        '''Moves every ball for one update, as Simulation.updateBall.
+
+        The balls are processed together, one bounce at a time, as in Storm.update,
+        and their impacts are found by simulation.collide, as are those of a Storm.
+        Each game has its own wall, so a ball only breaks the bricks of its game.'''
+        speed = self._vy.copy()
+        above = self._y > 0
+        lift = simulation.lifted(self._x, self._y, self._vy, self._paddle)
+        self._vy[lift] = -self._vy[lift]
+        self._count[lift] = self._count[lift] + 1
+        active = numpy.arange(self.getSize())
+        time = numpy.ones(len(active))
+        for bounce in range(MAX_BOUNCES):
+            if len(active) == 0:
+                break
+            x = self._x[active]
+            y = self._y[active]
+            dx = self._vx[active]*time
+            dy = self._vy[active]*time
+            t, flipx, flipy, paddle, bricks = simulation.collide(x, y, dx, dy, self._paddle[active],
+                                                                 self._bricks, self._alive[active])
+            hit = t <= 1.0
+            miss = ~hit
+            self._x[active[miss]] = x[miss] + dx[miss]
+            self._y[active[miss]] = y[miss] + dy[miss]
+            self._x[active[hit]] = x[hit] + dx[hit]*t[hit]
+            self._y[active[hit]] = y[hit] + dy[hit]*t[hit]
+            touch = active[hit & paddle & flipy & (self._vy[active] < 0)]
+            self._count[touch] = self._count[touch] + 1
+            flip = active[hit & flipx]
+            self._vx[flip] = -self._vx[flip]
+            flip = active[hit & flipy]
+            self._vy[flip] = -self._vy[flip]
+            self._alive[active] &= ~bricks
+            time = time[hit]*(1-t[hit])
+            active = active[hit]
+        lost = above & (self._y <= 0)
+        self._tries[lost] = self._tries[lost] - 1
+        self._count[lost] = 0
+        fast = self._count == 10
+        self._vy[fast] = -speed[fast]*1.3
@@ -8,47 +8,39 @@ to create your game. DO NOT MODIFY THE CODE IN THIS FILE.  See the
 online documentation in Assignment 6 for more guidance.  It includes
 information not displayed in this module."""
 
-# Basic Kivy Modules
-import kivy
-import kivy.app
-import kivy.uix.label
-
-# Lower-level kivy modules to support animation
-from kivy.config import *
-from kivy.clock import Clock
-from kivy.graphics import *
-from kivy.graphics.instructions import *
-from kivy.config import Config
-
-# Widgets necessary for some technical workarounds
-from kivy.uix.floatlayout import FloatLayout
-from kivy.uix.label import Label
-
-# Additional miscellaneous modules
+# Kivy and pygame are slow to import, so they are only loaded when first
+# needed (see _load_kivy, _init_sound and GameApp.run)
+import abc
+import array
+import collections
+import contextlib
 import os
 import os.path
 import numpy
 import random
 import colormodel
-import pygame.mixer
 import sys
+import time
+from functools import reduce
+from perf import FrameStats
+import tracing
 
 # User-defined resources
 FONT_PATH  = str(os.path.join(os.path.dirname(__file__), 'Fonts'))
 SOUND_PATH = str(os.path.join(os.path.dirname(__file__), 'Sounds'))
 IMAGE_PATH = str(os.path.join(os.path.dirname(__file__), 'Images'))
 
-import kivy.resources
-kivy.resources.resource_add_path(FONT_PATH)
-kivy.resources.resource_add_path(SOUND_PATH)
-kivy.resources.resource_add_path(IMAGE_PATH)
-
-# Initialize the sound engine.
+# Settings of the sound engine, initialized by the first Sound
 FREQUENCY = 44100
 BITSIZE   = -16
 CHANNELS  = 2
 BUFFER    = 1024
-pygame.mixer.init(FREQUENCY,BITSIZE,CHANNELS,BUFFER)
+
+# True once the sound engine is initialized (see _init_sound)
+_INITIALIZED = False
+
+# True once the Kivy graphics are loaded (see _load_kivy)
+_LOADED = False
 
 #### CONSTANTS ####
 
@@ -58,10 +50,27 @@ CACHE_POS    = 1
 CACHE_SIZE   = 2
 CACHE_COLOR  = 3
 CACHE_SOURCE = 4
+CACHE_FRAME  = 5   # Position and size together
 
 # LINE SIZE
 LINE_SIZE = 1
 
+# Most rectangles in a single GBatch mesh (mesh indices are 16 bit)
+BATCH_SIZE = 16000
+
+# Most text textures kept for GLabel
+LABEL_CACHE_SIZE = 64
+_TEXTURES = collections.OrderedDict()
+
+# Drawing instructions sent to a view since the program started (see GView.emitted)
+_EMITTED = 0
+
+# Frames between updates of the statistics overlay of GameApp
+OVERLAY_PERIOD = 30
+
+# Whether shapes check the values given to their attributes (see setValidation)
+_VALIDATE = True
+
 #### HIDDEN HELPER FUNCTIONS ####
 def  _same_side(p1, p2, a, b):
     """Return: True is p1, p2 are on the same side of segment ba.
@@ -104,6 +113,18 @@ def _is_color(x):
     return False
 
 
+def _gl_color(x):
+    """Return: the color x as a 4-element list of float between 0 and 1
+    
+    Precondition: x represents a color."""
+    assert not _VALIDATE or _is_color(x), f'{x} is not a valid color'
+    if type(x) in [tuple, list] and len(x) == 3:
+        return list(x)+[1.0]
+    elif type(x) in [colormodel.RGB]:
+        return x.glColor()
+    return list(x)
+
+
 def _is_image_file(name):
     """Return: True if name is the name of an image file"""
     if type(name) != str:
@@ -128,8 +149,89 @@ def _is_sound_file(name):
     return os.path.exists(SOUND_PATH+'/'+name)
 
 
+def _load_kivy():
+    """Loads the Kivy graphics the first time a shape or a view is made.
+    
+    Importing Kivy is slow, so this module waits until it is needed.  This
+    adds the drawing instructions (`Color`, `Rectangle`, `Mesh`, ...) to
+    this module and registers the resource folders with Kivy.  It does
+    nothing if the graphics are already loaded."""
+    global _LOADED, Color, Line, Rectangle, Ellipse, Mesh, InstructionGroup, Texture
+    if _LOADED:
+        return
+    
+    import kivy.resources
+    from kivy.graphics import Color, Line, Rectangle, Ellipse, Mesh, InstructionGroup
+    from kivy.graphics.texture import Texture
+    kivy.resources.resource_add_path(FONT_PATH)
+    kivy.resources.resource_add_path(SOUND_PATH)
+    kivy.resources.resource_add_path(IMAGE_PATH)
+    _LOADED = True
+
+
+def _init_sound():
+    """Initializes the sound engine the first time a sound is made.
+    
+    It does nothing if the sound engine is already initialized."""
+    global _INITIALIZED
+    if _INITIALIZED:
+        return
+    
+    import pygame.mixer
+    pygame.mixer.init(FREQUENCY,BITSIZE,CHANNELS,BUFFER)
+    _INITIALIZED = True
+
+
 #### FUNCTIONS ####
 
+def setValidation(on):
+    """Turns the checking of the attributes of shapes on or off.
+    
+        :param on: True to check every value given to a shape, False to trust them
+        **Precondition**: a bool
+    
+    Validation is on by default, so that a mistake fails at once with a clear
+    message while a game is written.  A finished game may turn it off to make
+    and change shapes faster; a wrong value then fails later, or not at all.
+    Running Python with -O removes the checks whatever this is set to.  To
+    skip the checks for a single shape, use `GObject.trusted` instead."""
+    global _VALIDATE
+    assert type(on) == bool, f'{on} is not a bool'
+    _VALIDATE = on
+
+
+def getValidation():
+    """**Returns**: True if shapes check the values given to their attributes."""
+    return _VALIDATE
+
+
+def _text_texture(text,font_name,font_size,bold,color):
+    """Return: the texture for the given text, rendered with the given font.
+    
+    Rendering text is slow, so textures are kept in a cache shared by all of
+    the `GLabel` objects.  The cache holds the LABEL_CACHE_SIZE textures used
+    most recently; the least recently used texture is evicted first.
+    
+    Precondition: text is a string, font_name is a font name, font_size is an
+    int or float, bold is a bool, and color is a 4-element list of float."""
+    key = (text,font_name,font_size,bold,tuple(color))
+    if key in _TEXTURES:
+        _TEXTURES.move_to_end(key)
+        return _TEXTURES[key]
+    
+    from kivy.core.text import Label as CoreLabel
+    label = CoreLabel(text=text,font_name=font_name,font_size=font_size,
+                      bold=bold,color=list(color))
+    label.refresh()
+    texture = label.texture
+    if texture is None:
+        texture = Texture.create(size=(1,1))
+    _TEXTURES[key] = texture
+    if len(_TEXTURES) > LABEL_CACHE_SIZE:
+        _TEXTURES.popitem(last=False)
+    return texture
+
+
 def Sound(filename):
     """Creates a new Sound object for the given file.
     
@@ -140,8 +242,11 @@ def Sound(filename):
     
         :param filename: string providing the name of a sound file
     
+    The sound engine is initialized the first time a sound is made.
     See the online documentation for more information."""
     assert (_is_sound_file(filename)), f'{filename} is not a sound file'
+    _init_sound()
+    import pygame.mixer
     absname = filename if os.path.isabs(filename) else str(os.path.join(SOUND_PATH, filename))
     return pygame.mixer.Sound(absname)
 
@@ -165,9 +270,10 @@ class SoundLibrary(object):
     """
     
     def __init__(self):
-        """**Constructor**: Create a new, empty sound library."""
-        if not _INITIALIZED:
-            init()
+        """**Constructor**: Create a new, empty sound library.
+        
+        The sound engine is initialized the first time a library is made."""
+        _init_sound()
         self._data = {}
     
     def __len__(self):
@@ -192,7 +298,7 @@ class SoundLibrary(object):
             **Precondition**:: filename is the name of a valid sound file.
         
         """
-        assert is_sound_file(filename), f'{filename} is not a sound file'
+        assert _is_sound_file(filename), f'{filename} is not a sound file'
         self._data[key] = Sound(filename)
     
     def __delitem__(self, key):
@@ -203,6 +309,15 @@ class SoundLibrary(object):
         """
         del self._data[key]
     
+    @tracing.traced('sound')
+    def play(self, key):
+        """Plays the sound with the given name.
+            
+            :param key: The key identifying a sound object
+            **Precondition**:: key is a string.
+        """
+        self._data[key].play()
+    
     def __iter__(self):
         """**Returns**: The iterator for this sound dictionary."""
         return self._data.iterkeys()
@@ -212,6 +327,344 @@ class SoundLibrary(object):
         return self._data.iterkeys()
 
 
+#### RENDER BACKENDS ####
+
+class Backend(abc.ABC):
+    """The interface of the renderers behind a `GView`.
+    
+    A backend makes the drawing instructions of the shapes: colors, rectangles
+    (which may show an image or a text texture), ellipses, lines and meshes,
+    plus the groups that hold them.  A shape keeps the instructions it made and
+    changes their attributes (`pos`, `size`, `texture`, `source`, `vertices`)
+    in place when it moves, so every instruction must allow that.  A color
+    instruction has the attribute `rgba`, and a texture the attribute `size`.
+    
+    A group has the methods `add`, `remove` and `clear`.  The `canvas` is the
+    group that a view draws into.
+    
+    Shapes use the backend of the last `GView` made (see `_backend`).  The
+    backends are `KivyBackend`, which draws in a window, and `NullBackend`
+    and `RecordingBackend`, which do no GPU work at all.
+    
+    This is an abstract class.  A backend must define every method and the
+    property `canvas`; the property `widget` is None unless it is redefined.
+    A backend that misses one of them cannot be made."""
+    
+    @abc.abstractmethod
+    def color(self,r,g,b,a=1.0):
+        """**Returns**: a new instruction setting the color of what follows.
+        
+            :param r, g, b, a: The color components
+            **Precondition**: floats between 0 and 1"""
+    
+    @abc.abstractmethod
+    def rectangle(self,pos,size,source=None,texture=None):
+        """**Returns**: a new instruction drawing a rectangle.
+        
+            :param pos: The bottom left corner
+            **Precondition**: a pair of int or float
+        
+            :param size: The width and height
+            **Precondition**: a pair of int or float
+        
+            :param source: The name of an image file shown in the rectangle
+            **Precondition**: a string or None
+        
+            :param texture: A text texture shown in the rectangle
+            **Precondition**: a texture made by `text`, or None"""
+    
+    @abc.abstractmethod
+    def ellipse(self,pos,size):
+        """**Returns**: a new instruction drawing an ellipse inside a rectangle.
+        
+            :param pos: The bottom left corner of the rectangle
+            **Precondition**: a pair of int or float
+        
+            :param size: The width and height of the rectangle
+            **Precondition**: a pair of int or float"""
+    
+    @abc.abstractmethod
+    def line(self,points):
+        """**Returns**: a new instruction drawing a closed line through points.
+        
+            :param points: The alternating x and y values of the points
+            **Precondition**: a sequence of int or float of even length"""
+    
+    @abc.abstractmethod
+    def mesh(self,vertices,indices,mode):
+        """**Returns**: a new instruction drawing a mesh of triangles.
+        
+            :param vertices: x, y, u, v for each vertex
+            **Precondition**: a list of int or float
+        
+            :param indices: The vertices of the triangles
+            **Precondition**: a sequence of int
+        
+            :param mode: How the indices make triangles
+            **Precondition**: one of 'triangles', 'triangle_strip', 'triangle_fan'"""
+    
+    @abc.abstractmethod
+    def group(self):
+        """**Returns**: a new, empty group of instructions."""
+    
+    @abc.abstractmethod
+    def text(self,text,font_name,font_size,bold,color):
+        """**Returns**: a texture with the given text rendered in it.
+        
+        The precondition is that of `_text_texture`."""
+    
+    @property
+    @abc.abstractmethod
+    def canvas(self):
+        """The group drawn by the view.
+        
+        **Invariant**: Immutable group of this backend."""
+    
+    @property
+    def widget(self):
+        """The Kivy widget shown in the window, or None if there is no window.
+        
+        **Invariant**: Immutable Kivy widget, or None."""
+        return None
+
+
+class KivyBackend(Backend):
+    """The backend that draws with Kivy, in the window of a `GameApp`.
+    
+    Kivy is loaded when the first instance is made.  The widget (a
+    FloatLayout) is only made when the canvas is first needed."""
+    
+    def __init__(self):
+        """**Initializer**: creates a new Kivy backend, loading Kivy."""
+        _load_kivy()
+        self._widget = None
+    
+    def color(self,r,g,b,a=1.0):
+        return Color(r,g,b,a)
+    
+    def rectangle(self,pos,size,source=None,texture=None):
+        if not texture is None:
+            return Rectangle(pos=pos,size=size,texture=texture)
+        if not source is None:
+            return Rectangle(pos=pos,size=size,source=source)
+        return Rectangle(pos=pos,size=size)
+    
+    def ellipse(self,pos,size):
+        return Ellipse(pos=pos,size=size)
+    
+    def line(self,points):
+        return Line(points=points,cap='round',joint='round',close=True)
+    
+    def mesh(self,vertices,indices,mode):
+        return Mesh(vertices=vertices,indices=indices,mode=mode)
+    
+    def group(self):
+        return InstructionGroup()
+    
+    def text(self,text,font_name,font_size,bold,color):
+        return _text_texture(text,font_name,font_size,bold,color)
+    
+    @property
+    def canvas(self):
+        return self.widget.canvas
+    
+    @property
+    def widget(self):
+        if self._widget is None:
+            from kivy.uix.floatlayout import FloatLayout
+            self._widget = FloatLayout()
+        return self._widget
+
+
+class _Instruction(object):
+    """A drawing instruction of a `NullBackend`.
+    
+    It only holds its kind ('color', 'rectangle', ...) and the attributes it
+    was made with, so that shapes can change them as they would in Kivy."""
+    
+    def __init__(self,kind,**keywords):
+        """**Initializer**: creates an instruction of the given kind and attributes"""
+        self.kind = kind
+        self.__dict__.update(keywords)
+    
+    def __repr__(self):
+        """**Returns**: an unambiguous string for this instruction."""
+        return '_Instruction('+repr(self.kind)+')'
+
+
+class _Group(object):
+    """A group of instructions of a `NullBackend`, which keeps nothing."""
+    
+    def add(self,cmd):
+        pass
+    
+    def remove(self,cmd):
+        pass
+    
+    def clear(self):
+        pass
+
+
+class _RecordedGroup(_Group):
+    """A group of instructions of a `RecordingBackend`.
+    
+    Instance Attributes:
+        children: The instructions and groups in this group, in drawing order
+    """
+    
+    def __init__(self):
+        """**Initializer**: creates an empty group"""
+        self.children = []
+    
+    def add(self,cmd):
+        self.children.append(cmd)
+    
+    def remove(self,cmd):
+        if cmd in self.children:
+            self.children.remove(cmd)
+    
+    def clear(self):
+        self.children = []
+
+
+class NullBackend(Backend):
+    """A backend that does no drawing at all.
+    
+    Its instructions only hold their attributes and its groups keep nothing,
+    so a game can run (and be timed) without a window or a GPU.  The size of a
+    text texture is estimated from the length of the text and the font size."""
+    
+    def __init__(self):
+        """**Initializer**: creates a new null backend"""
+        self._canvas = self.group()
+    
+    def color(self,r,g,b,a=1.0):
+        return _Instruction('color',rgba=[r,g,b,a])
+    
+    def rectangle(self,pos,size,source=None,texture=None):
+        return _Instruction('rectangle',pos=pos,size=size,source=source,texture=texture)
+    
+    def ellipse(self,pos,size):
+        return _Instruction('ellipse',pos=pos,size=size)
+    
+    def line(self,points):
+        return _Instruction('line',points=points)
+    
+    def mesh(self,vertices,indices,mode):
+        return _Instruction('mesh',vertices=vertices,indices=indices,mode=mode)
+    
+    def group(self):
+        return _Group()
+    
+    def text(self,text,font_name,font_size,bold,color):
+        return _Instruction('texture',size=(int(0.6*font_size*len(text)),int(1.2*font_size)))
+    
+    @property
+    def canvas(self):
+        return self._canvas
+
+
+class RecordingBackend(NullBackend):
+    """A backend that does no drawing, but records what would be drawn.
+    
+    Its groups keep their instructions, so the instructions on screen can be
+    listed with `getDrawn`, and it counts the instructions made of each kind."""
+    
+    def __init__(self):
+        """**Initializer**: creates a new recording backend"""
+        self._made = collections.Counter()
+        NullBackend.__init__(self)
+    
+    def getMade(self):
+        """**Returns**: a dict of the number of instructions made of each kind.
+        
+        The kinds are 'color', 'rectangle', 'ellipse', 'line', 'mesh',
+        'texture' and 'group'."""
+        return dict(self._made)
+    
+    def getDrawn(self):
+        """**Returns**: the list of the instructions in the canvas, in drawing order.
+        
+        The groups are replaced by the instructions in them."""
+        result = []
+        pending = [iter(self._canvas.children)]
+        while pending:
+            for cmd in pending[-1]:
+                if isinstance(cmd,_RecordedGroup):
+                    pending.append(iter(cmd.children))
+                else:
+                    result.append(cmd)
+                break
+            else:
+                pending.pop()
+        return result
+    
+    def color(self,r,g,b,a=1.0):
+        self._made['color'] += 1
+        return NullBackend.color(self,r,g,b,a)
+    
+    def rectangle(self,pos,size,source=None,texture=None):
+        self._made['rectangle'] += 1
+        return NullBackend.rectangle(self,pos,size,source,texture)
+    
+    def ellipse(self,pos,size):
+        self._made['ellipse'] += 1
+        return NullBackend.ellipse(self,pos,size)
+    
+    def line(self,points):
+        self._made['line'] += 1
+        return NullBackend.line(self,points)
+    
+    def mesh(self,vertices,indices,mode):
+        self._made['mesh'] += 1
+        return NullBackend.mesh(self,vertices,indices,mode)
+    
+    def group(self):
+        self._made['group'] += 1
+        return _RecordedGroup()
+    
+    def text(self,text,font_name,font_size,bold,color):
+        self._made['texture'] += 1
+        return NullBackend.text(self,text,font_name,font_size,bold,color)
+
+
+# The backend of the last GView made, used by the shapes (see _backend)
+_BACKEND = None
+
+
+def _backend():
+    """**Returns**: the backend the shapes draw with.
+    
+    This is the backend of the last `GView` made.  If no view was made yet, it
+    is a new `KivyBackend` (which loads Kivy)."""
+    global _BACKEND
+    if _BACKEND is None:
+        _BACKEND = KivyBackend()
+        _COLORS.clear()
+    return _BACKEND
+
+
+# The shared color instructions of the backend in _BACKEND, by their rgba
+_COLORS = {}
+
+
+def _color(value):
+    """**Returns**: the shared color instruction of the backend for a color.
+    
+        :param value: The color
+        **Precondition**: value represents a color (see `_is_color`)
+    
+    Shapes of the same color share one instruction, made the first time it is
+    needed.  It is never changed in place: a shape that changes color takes
+    the instruction of its new color instead."""
+    key = tuple(_gl_color(value))
+    cmd = _COLORS.get(key)
+    if cmd is None:
+        cmd = _backend().color(*key)
+        _COLORS[key] = cmd
+    return cmd
+
+
 #### GEOMETRY CLASSES ####
 
 class GPoint(object):
@@ -219,6 +672,8 @@ class GPoint(object):
     
     This class is used primarily for recording and handling mouse locations."""
     
+    __slots__ = ('_x','_y')
+    
     # PROPERTIES 
     @property
     def x(self):
@@ -229,7 +684,7 @@ class GPoint(object):
     
     @x.setter
     def x(self,value):
-        assert type(value) in [int, float], f'{value}  is not a number'
+        assert not _VALIDATE or type(value) in [int, float], f'{value}  is not a number'
         self._x = float(value)
     
     @property
@@ -241,7 +696,7 @@ class GPoint(object):
     
     @y.setter
     def y(self,value):
-        assert (type(value) in [int, float]), f'{value} is not a number'
+        assert not _VALIDATE or type(value) in [int, float], f'{value} is not a number'
         self._y = float(value)
     
     # METHODS
@@ -376,6 +831,122 @@ class GPoint(object):
                           (self.y-other.y)*(self.y-other.y))
 
 
+class GBox(object):
+    """Instances are a rectangle in 2D space, with no drawing.
+    
+    A box has the geometry of a `GRectangle`, but no colors and no drawing
+    instructions, so it takes a fraction of the memory.  It is meant for the
+    models that are never drawn themselves, like the bricks of a wall drawn
+    by a `GBatch`.
+    
+    To stay small, the attributes are plain slots and are not checked.
+    
+    Instance Attributes:
+        x: The horizontal coordinate of the left hand side (a float)
+        y: The vertical coordinate of the bottom (a float)
+        width: The horizontal width (a float >= 0)
+        height: The vertical height (a float >= 0)
+    """
+    
+    __slots__ = ('x','y','width','height')
+    
+    # PROPERTIES
+    @property
+    def left(self):
+        """The horizontal coordinate of the left hand side.
+        
+        **Invariant**: Immutable float, equal to `x`."""
+        return self.x
+    
+    @property
+    def right(self):
+        """The horizontal coordinate of the right hand side.
+        
+        **Invariant**: Immutable float, equal to `x+width`."""
+        return self.x + self.width
+    
+    @property
+    def bottom(self):
+        """The vertical coordinate of the bottom.
+        
+        **Invariant**: Immutable float, equal to `y`."""
+        return self.y
+    
+    @property
+    def top(self):
+        """The vertical coordinate of the top.
+        
+        **Invariant**: Immutable float, equal to `y+height`."""
+        return self.y + self.height
+    
+    # METHODS
+    def __init__(self, x=0, y=0, width=0, height=0):
+        """**Constructor**: creates a new box with the given geometry.
+        
+            :param x: the left hand side
+            **Precondition**: value is an int or float.
+        
+            :param y: the bottom
+            **Precondition**: value is an int or float.
+        
+            :param width: the width
+            **Precondition**: value is an int or float >= 0.
+        
+            :param height: the height
+            **Precondition**: value is an int or float >= 0.
+        
+        All values are 0.0 by default."""
+        self.x = float(x)
+        self.y = float(y)
+        self.width = float(width)
+        self.height = float(height)
+    
+    def __repr__(self):
+        """**Returns**: Unambiguous String representation of this GBox. """
+        return "GBox(%r,%r,%r,%r)" % (self.x,self.y,self.width,self.height)
+    
+    def contains(self,x,y):
+        """Return: True if this box contains the point (x,y), False otherwise.
+        
+            :param x: x coordinate of point to check
+            **Precondition**: an int or float
+            
+            :param y: y coordinate of point to check
+            **Precondition**: an int or float"""
+        return self.x <= x <= self.x+self.width and self.y <= y <= self.y+self.height
+    
+    def collides(self,other):
+        """Return: True if this box overlaps the box other, False otherwise.
+        
+            :param other: the box to check
+            **Precondition**: a `GBox` or a `GObject`"""
+        return (self.x < other.x+other.width and other.x < self.x+self.width and
+                self.y < other.y+other.height and other.y < self.y+self.height)
+
+
+class _Layer(object):
+    """Adapter that lets a `GObject` draw itself into an InstructionGroup.
+    
+    It has the same `draw` method as `GView`, so it may be passed to the draw
+    method of any shape.  It is used for shapes attached to a `GView`.  Like
+    `GView`, it skips a color that is already the current one."""
+    
+    def __init__(self,group):
+        """**Initializer**: creates an adapter for the given InstructionGroup"""
+        self._group = group
+        self._color = None
+    
+    def draw(self,cmd):
+        """Adds the giving drawing command to the group."""
+        global _EMITTED
+        if cmd is self._color:
+            return
+        if hasattr(cmd,'rgba'):
+            self._color = cmd
+        _EMITTED += 1
+        self._group.add(cmd)
+
+
 class GObject(object):
     """Instances provide basic geometry information for drawing to a `GView`
     
@@ -383,6 +954,9 @@ class GObject(object):
     of the subclasses: GRectangle, GEllipse, GLine, GTriangle, GPolygon, GImage, 
     and GLabel."""
     
+    __slots__ = ('_x','_y','_width','_height','_fillcolor','_linecolor','_cache_on','_group',
+                 '_pending','__weakref__')
+    
     # PROPERTIES 
     @property
     def x(self):
@@ -393,10 +967,9 @@ class GObject(object):
     
     @x.setter
     def x(self,value):
-        assert type(value) in [int, float], f'{value} is not a number'
+        assert not _VALIDATE or type(value) in [int, float], f'{value} is not a number'
         self._x = float(value)
-        if self._cache_on:
-            self._cache(CACHE_POS)
+        self._changed(CACHE_POS)
     
     @property
     def y(self):
@@ -407,10 +980,9 @@ class GObject(object):
     
     @y.setter
     def y(self,value):
-        assert type(value) in [int, float], f'{value} is not a number'
+        assert not _VALIDATE or type(value) in [int, float], f'{value} is not a number'
         self._y = float(value)  
-        if self._cache_on:
-            self._cache(CACHE_POS)
+        self._changed(CACHE_POS)
     
     @property
     def width(self):
@@ -421,10 +993,9 @@ class GObject(object):
     
     @width.setter
     def width(self,value):
-        assert type(value) in [int, float], f'{value} is not a number'
+        assert not _VALIDATE or type(value) in [int, float], f'{value} is not a number'
         self._width = float(value)
-        if self._cache_on:
-            self._cache(CACHE_SIZE)
+        self._changed(CACHE_SIZE)
     
     @property
     def height(self):
@@ -435,10 +1006,9 @@ class GObject(object):
     
     @height.setter
     def height(self,value):
-        assert type(value) in [int, float], f'{value} is not a number'
+        assert not _VALIDATE or type(value) in [int, float], f'{value} is not a number'
         self._height = float(value)
-        if self._cache_on:
-            self._cache(CACHE_SIZE)
+        self._changed(CACHE_SIZE)
     
     @property
     def center_x(self):
@@ -518,19 +1088,12 @@ class GObject(object):
         **Invariant**: Must be a 4-element list of float between 0 and 1. If you 
         assign it a RGB or HSV object from module `colormodel`, it will convert
         the color for your automatically."""
-        return self._fillcolor.rgba
+        return list(self._fillcolor.rgba)
     
     @fillcolor.setter
     def fillcolor(self,value):
-        assert _is_color(value), f'{value} is not a valid color'
-        if type(value) in [tuple, list] and len(value) == 3:
-            value = list(value)+[1.0]
-        elif type(value) in [colormodel.RGB]:
-            value = value.glColor()
-        
-        self._fillcolor = Color(value[0],value[1],value[2],value[3])
-        if self._cache_on:
-            self._cache(CACHE_COLOR)
+        self._fillcolor = _color(value)
+        self._changed(CACHE_COLOR)
         
     @property
     def linecolor(self):
@@ -542,19 +1105,12 @@ class GObject(object):
         **Invariant**: Must be a 4-element list of float between 0 and 1. If you 
         assign it a RGB or HSV object from module `colormodel`, it will convert
         the color for your automatically."""
-        return self._linecolor.rgba
+        return list(self._linecolor.rgba)
     
     @linecolor.setter
     def linecolor(self,value):
-        assert _is_color(value), f'{value} is not a valid color'
-        if type(value) in [tuple, list] and len(value) == 3:
-            value = list(value)+[1.0]
-        elif type(value) in [colormodel.RGB]:
-            value = value.glColor()
-        
-        self._linecolor = Color(value[0],value[1],value[2],value[3])
-        if self._cache_on:
-            self._cache(CACHE_COLOR)
+        self._linecolor = _color(value)
+        self._changed(CACHE_COLOR)
     
     def __init__(self,**keywords):
         """**Constructor**: creates a new GObject to support drawing.
@@ -578,33 +1134,42 @@ class GObject(object):
         # Set the properties.
         # Set cache check to correct value
         self._cache_on = False
-        
-        # Have to initialize size first
-        self.width  = keywords['width']  if  'width' in keywords else 0.0
-        self.height = keywords['height'] if 'height' in keywords else 0.0
-                
-        # Now (relative) position
-        if 'x' in keywords:
-            self.x = keywords['x']
-        elif 'left' in keywords:
-            self.left = keywords['left']
-        elif 'center_x' in keywords:
-            self.center_x = keywords['center_x']
-        elif 'right' in keywords:
-            self.right = keywords['right']
-        else:
-            self._x = 0.0
-        
-        if 'y' in keywords:
-            self.y = keywords['y']
-        elif 'bottom' in keywords:
-            self.bottom = keywords['bottom']
-        elif 'center_y' in keywords:
-            self.center_y = keywords['center_y']
-        elif 'top' in keywords:
-            self.top = keywords['top']
+        self._group = None
+        self._pending = None
+        
+        if not _VALIDATE and 'x' in keywords and 'y' in keywords:
+            # The values are trusted and nothing is cached yet: skip the setters
+            self._width  = float(keywords['width'])  if  'width' in keywords else 0.0
+            self._height = float(keywords['height']) if 'height' in keywords else 0.0
+            self._x = float(keywords['x'])
+            self._y = float(keywords['y'])
         else:
-            self._y = 0.0
+            # Have to initialize size first
+            self.width  = keywords['width']  if  'width' in keywords else 0.0
+            self.height = keywords['height'] if 'height' in keywords else 0.0
+                
+            # Now (relative) position
+            if 'x' in keywords:
+                self.x = keywords['x']
+            elif 'left' in keywords:
+                self.left = keywords['left']
+            elif 'center_x' in keywords:
+                self.center_x = keywords['center_x']
+            elif 'right' in keywords:
+                self.right = keywords['right']
+            else:
+                self._x = 0.0
+        
+            if 'y' in keywords:
+                self.y = keywords['y']
+            elif 'bottom' in keywords:
+                self.bottom = keywords['bottom']
+            elif 'center_y' in keywords:
+                self.center_y = keywords['center_y']
+            elif 'top' in keywords:
+                self.top = keywords['top']
+            else:
+                self._y = 0.0
         
         self.fillcolor = keywords['fillcolor'] if 'fillcolor' in keywords else (1.0,1.0,1.0,1.0)
         self.linecolor = keywords['linecolor'] if 'linecolor' in keywords else (0,0,0,1)
@@ -621,11 +1186,145 @@ class GObject(object):
         This method always returns `False` for a `GObject`."""
         return False
     
+    @classmethod
+    def trusted(cls,**keywords):
+        """**Constructor**: creates a new shape without checking the keywords.
+        
+            :param keywords: dictionary of keyword arguments 
+            **Precondition**: the keywords of the constructor of this class
+        
+        This makes the same shape as the constructor, but skips the checks of
+        the values given to it, whether or not validation is on (see
+        `setValidation`).  It is meant for shapes made in bulk from values
+        already known to be right, like the bricks of a wall.  Changes made
+        to the shape later are checked as usual."""
+        global _VALIDATE
+        validate = _VALIDATE
+        _VALIDATE = False
+        try:
+            return cls(**keywords)
+        finally:
+            _VALIDATE = validate
+    
+    def setPosition(self,x,y):
+        """Moves this shape so that its bottom left corner is at (x,y).
+        
+            :param x: the new value of `x`
+            **Precondition**: an int or float
+            
+            :param y: the new value of `y`
+            **Precondition**: an int or float
+        
+        This is the same as setting `x` and then `y`, but the drawing cache is
+        only updated once."""
+        assert not _VALIDATE or type(x) in [int, float], f'{x} is not a number'
+        assert not _VALIDATE or type(y) in [int, float], f'{y} is not a number'
+        self._x = float(x)
+        self._y = float(y)
+        self._changed(CACHE_POS)
+    
+    def setFrame(self,x,y,width,height):
+        """Moves and resizes this shape to the rectangle (x,y,width,height).
+        
+            :param x: the new value of `x`
+            **Precondition**: an int or float
+            
+            :param y: the new value of `y`
+            **Precondition**: an int or float
+            
+            :param width: the new value of `width`
+            **Precondition**: an int or float
+            
+            :param height: the new value of `height`
+            **Precondition**: an int or float
+        
+        This is the same as setting the four attributes, but the drawing cache
+        is only updated once."""
+        assert not _VALIDATE or type(x) in [int, float], f'{x} is not a number'
+        assert not _VALIDATE or type(y) in [int, float], f'{y} is not a number'
+        assert not _VALIDATE or type(width) in [int, float], f'{width} is not a number'
+        assert not _VALIDATE or type(height) in [int, float], f'{height} is not a number'
+        self._width = float(width)
+        self._height = float(height)
+        self._x = float(x)
+        self._y = float(y)
+        self._changed(CACHE_FRAME)
+    
+    @contextlib.contextmanager
+    def batch(self):
+        """Context manager that updates the drawing cache once, at the end.
+        
+        Inside the `with` block, changes to the attributes of this shape are
+        made at once, but the drawing instructions are only brought up to date
+        when the block ends, once for all of them.  For example
+        
+            with label.batch():
+                label.text = 'Score: 10'
+                label.font_size = 24
+                label.center_x = 400
+        
+        lays out the label once instead of three times.  Reading a size that
+        depends on the cache (like the size of a `GLabel`) inside the block
+        gives the value from before the block, and a label is anchored (see
+        `halign` and `valign`) where the block leaves it.  Batches may be
+        nested; only the outermost one updates the cache."""
+        if not self._pending is None:
+            yield self
+            return
+        self._pending = set()
+        try:
+            yield self
+        finally:
+            styles = self._pending
+            self._pending = None
+            self._flush(styles)
+    
     def _cache(self,style=CACHE_ALL):
         """Helper method to cache data to speed drawing. This method should be  
         overridden for specific drawing instructions."""
         pass
     
+    def _changed(self,style):
+        """Helper method to push a change to the drawing cache.
+        
+        If this shape is attached to a `GView`, new drawing instructions made by
+        the cache also replace the old ones in the view.  Positions and sizes are
+        changed in place by the cache, so they never need this.
+        
+        Inside a batch, the change is only recorded (see `batch`)."""
+        if not self._pending is None:
+            self._pending.add(style)
+        elif self._cache_on:
+            self._cache(style)
+            if not self._group is None and not style in (CACHE_POS, CACHE_SIZE, CACHE_FRAME):
+                self._regroup()
+    
+    def _flush(self,styles):
+        """Helper method to push the changes recorded by a batch to the cache.
+        
+        The changes are merged into one: position and size changes become a
+        single CACHE_FRAME, and anything more becomes CACHE_ALL."""
+        if len(styles) == 1:
+            self._changed(styles.pop())
+        elif len(styles) > 1:
+            if styles <= {CACHE_POS, CACHE_SIZE, CACHE_FRAME}:
+                self._changed(CACHE_FRAME)
+            else:
+                self._changed(CACHE_ALL)
+    
+    def _retain(self,group):
+        """Helper method to keep the drawing instructions of this shape in group.
+        
+        This is used by `GView.attach`.  If group is None, the shape is detached."""
+        self._group = group
+        if not group is None:
+            self._regroup()
+    
+    def _regroup(self):
+        """Helper method to refill the retained group with the drawing instructions"""
+        self._group.clear()
+        self.draw(_Layer(self._group))
+    
     def draw(self,view):
         """Draw this shape in the provide view.
         
@@ -651,6 +1350,8 @@ class GLine(GObject):
     line.  The attribute `fillcolor` is unused (even though it is inherited
     from `GObject`)."""
     
+    __slots__ = ('_points','_lcache')
+    
     # PROPERTIES 
     @property
     def x(self):
@@ -732,12 +1433,11 @@ class GLine(GObject):
     
     @points.setter
     def points(self,value):
-        assert type(value) in [tuple,list], f'{value} is not a tuple or list'
-        assert len(value) % 2 == 0 and len(value) > 2, f'{len(value)} is not the correct size'
-        assert reduce(_and, map(_is_num,value)), f'{value} is not a tuple of numbers'
+        assert not _VALIDATE or type(value) in [tuple,list], f'{value} is not a tuple or list'
+        assert not _VALIDATE or (len(value) % 2 == 0 and len(value) > 2), f'{len(value)} is not the correct size'
+        assert not _VALIDATE or reduce(_and, map(_is_num,value)), f'{value} is not a tuple of numbers'
         self._points = tuple(value)
-        if self._cache_on:
-            self._cache(CACHE_ALL)
+        self._changed(CACHE_ALL)
     
     def __init__(self,**keywords):
         """**Constructor**: creates a new sequence of line segments.
@@ -758,10 +1458,58 @@ class GLine(GObject):
         Therefore `point` and `linecolor` are the two primary keywords
         used by this constructor."""
         self._cache_on = False
+        self._group = None
+        self._pending = None
         self.points = keywords['points'] if 'points' in keywords else ()
         self.fillcolor = keywords['fillcolor'] if 'fillcolor' in keywords else (1,1,1,1)
         self.linecolor = keywords['linecolor'] if 'linecolor' in keywords else (0,0,0,1)
     
+    def setPosition(self,x,y):
+        """Moves this line so that the bottom left corner of its bounding box is at (x,y).
+        
+            :param x: the new left of the bounding box
+            **Precondition**: an int or float
+            
+            :param y: the new bottom of the bounding box
+            **Precondition**: an int or float
+        
+        Every point is moved by the same amount.  The bounding box and the
+        drawing instructions are computed once, for the new points."""
+        self.setFrame(x,y,None,None)
+    
+    def setFrame(self,x,y,width,height):
+        """Moves and stretches this line so that its bounding box is (x,y,width,height).
+        
+            :param x: the new left of the bounding box
+            **Precondition**: an int or float
+            
+            :param y: the new bottom of the bounding box
+            **Precondition**: an int or float
+            
+            :param width: the new width of the bounding box, or None to keep it
+            **Precondition**: an int or float, or None
+            
+            :param height: the new height of the bounding box, or None to keep it
+            **Precondition**: an int or float, or None
+        
+        The points are scaled about the bottom left corner of the bounding box
+        (a side of size 0 stays 0), then moved.  The bounding box and the drawing
+        instructions are computed once, for the new points."""
+        assert not _VALIDATE or type(x) in [int, float], f'{x} is not a number'
+        assert not _VALIDATE or type(y) in [int, float], f'{y} is not a number'
+        assert not _VALIDATE or (width is None or type(width) in [int, float]), f'{width} is not a number'
+        assert not _VALIDATE or (height is None or type(height) in [int, float]), f'{height} is not a number'
+        xs = self._points[0::2]
+        ys = self._points[1::2]
+        left, bottom = min(xs), min(ys)
+        sx = 1.0 if width is None or max(xs) == left else width/float(max(xs)-left)
+        sy = 1.0 if height is None or max(ys) == bottom else height/float(max(ys)-bottom)
+        points = []
+        for px, py in zip(xs,ys):
+            points.append(x+(px-left)*sx)
+            points.append(y+(py-bottom)*sy)
+        self.points = points
+    
     def _cache(self,style=CACHE_ALL):
         """Helper method to cache data to speed drawing. This method should be  
         overridden for specific drawing instructions."""
@@ -788,7 +1536,7 @@ class GLine(GObject):
         self._y = mny
         self._width  = mxx-mnx
         self._height = mxy-mny
-        self._lcache = Line(points=self.points,cap='round',joint='round',close=True)
+        self._lcache = _backend().line(self.points)
     
     def contains(self,x,y):
         """Return: True if this shape contains the point (x,y), False otherwise.
@@ -825,6 +1573,8 @@ class GTriangle(GLine):
     The interior (fill) color of this rectangle is `fillcolor`, while `linecolor`
     is the color of the border."""
     
+    __slots__ = ('_mcache',)
+    
     @property
     def points(self):
         """The sequence of points that make up this triangle.
@@ -835,12 +1585,11 @@ class GTriangle(GLine):
     
     @points.setter
     def points(self,value):
-        assert type(value) in [tuple,list], f'{value} is not a tuple or list'
-        assert len(value) == 6, f'{len(value)} does not have 6 elements'
-        assert reduce(lambda x, y: x and y, map(_is_num,value)), f'{value} is not a tuple of numbers'
+        assert not _VALIDATE or type(value) in [tuple,list], f'{value} is not a tuple or list'
+        assert not _VALIDATE or len(value) == 6, f'{len(value)} does not have 6 elements'
+        assert not _VALIDATE or (reduce(lambda x, y: x and y, map(_is_num,value))), f'{value} is not a tuple of numbers'
         self._points = tuple(value)
-        if self._cache_on:
-            self._cache(CACHE_ALL)
+        self._changed(CACHE_ALL)
     
     def __init__(self,**keywords):
         """**Constructor**: creates a new solid triangle.
@@ -867,7 +1616,7 @@ class GTriangle(GLine):
         vertices = ()
         for x in range(3):
             vertices += self.points[2*x:2*x+2]+(0,0)
-        self._mcache = Mesh(vertices=vertices, indices=range(size), mode='triangle_strip')
+        self._mcache = _backend().mesh(vertices,range(size),'triangle_strip')
     
     def contains(self,x,y):
         """Return: True if this shape contains the point (x,y), False otherwise.
@@ -907,6 +1656,8 @@ class GPolygon(GLine):
     We use this approach to define polygons as it allows us to avoid complex 
     tesselation algorithms."""
     
+    __slots__ = ('_centroid','_mcache')
+    
     @property
     def centroid(self):
         """The base of the triangle fan representing this polygon.  
@@ -920,11 +1671,11 @@ class GPolygon(GLine):
 
     @centroid.setter
     def centroid(self,value):
-        assert type(value) in [tuple,list], f'{value} is not a tuple or list'
-        assert len(value) == 2, f'{value} does not have 2 elements'
-        assert reduce(lambda x, y: x and y, map(_is_num,value)), f'{value} is not a list of numbers'
+        assert not _VALIDATE or type(value) in [tuple,list], f'{value} is not a tuple or list'
+        assert not _VALIDATE or len(value) == 2, f'{value} does not have 2 elements'
+        assert not _VALIDATE or (reduce(lambda x, y: x and y, map(_is_num,value))), f'{value} is not a list of numbers'
         self._centroid = tuple(value)
-        self._cache()
+        self._changed(CACHE_ALL)
         
     def __init__(self,**keywords):
         """**Constructor**: creates a new solid polyon
@@ -961,12 +1712,12 @@ class GPolygon(GLine):
         """Helper method to cache data to speed drawing. This method should be  
         overridden for specific drawing instructions."""
         GLine._cache(self)
-        size = len(self.points)/2
+        size = len(self.points)//2
         vertices = self.centroid+(0,0)
         for x in range(size):
             vertices += self.points[2*x:2*x+2]+(0,0)
         vertices += self.points[0:2]+(0,0)
-        self._mcache = Mesh(vertices=vertices, indices=range(size+2), mode='triangle_fan')
+        self._mcache = _backend().mesh(vertices,range(size+2),'triangle_fan')
     
     def contains(self,x,y):
         """Return: True if this shape contains the point (x,y), False otherwise.
@@ -1011,6 +1762,7 @@ class GRectangle(GObject):
     `center_x`, `center_y`, `right`, and `top`, all inherited from `GObject`.  
     See that class for more information."""
     
+    __slots__ = ('_scache','_lcache')
     
     def __init__(self,**keywords):
         """**Constructor**: creates a new solid rectangle
@@ -1033,17 +1785,22 @@ class GRectangle(GObject):
         """Helper method to cache data to speed drawing. This method should be  
         overridden for specific drawing instructions."""
         if self._scache is None:
-            self._scache = Rectangle(pos=(self.x, self.y), size=(self.width, self.height))
-            self._lcache = Rectangle(pos=(self.x-LINE_SIZE,self.y-LINE_SIZE),size=(self.width+2*LINE_SIZE,self.height+2*LINE_SIZE))        
+            self._scache = _backend().rectangle(pos=(self.x, self.y), size=(self.width, self.height))
+            self._lcache = _backend().rectangle(pos=(self.x-LINE_SIZE,self.y-LINE_SIZE),size=(self.width+2*LINE_SIZE,self.height+2*LINE_SIZE))        
         elif style == CACHE_POS:
             self._scache.pos=(self.x, self.y)
             self._lcache.pos=(self.x-LINE_SIZE, self.y-LINE_SIZE) 
         elif style == CACHE_SIZE:
             self._scache.size=(self.width, self.height)
             self._lcache.size=(self.width+2*LINE_SIZE, self.height+2*LINE_SIZE)
+        elif style == CACHE_FRAME:
+            self._scache.pos=(self.x, self.y)
+            self._scache.size=(self.width, self.height)
+            self._lcache.pos=(self.x-LINE_SIZE, self.y-LINE_SIZE)
+            self._lcache.size=(self.width+2*LINE_SIZE, self.height+2*LINE_SIZE)
         else:
-            self._scache = Rectangle(pos=(self.x, self.y), size=(self.width, self.height))
-            self._lcache = Rectangle(pos=(self.x-LINE_SIZE,self.y-LINE_SIZE),size=(self.width+2*LINE_SIZE,self.height+2*LINE_SIZE))
+            self._scache = _backend().rectangle(pos=(self.x, self.y), size=(self.width, self.height))
+            self._lcache = _backend().rectangle(pos=(self.x-LINE_SIZE,self.y-LINE_SIZE),size=(self.width+2*LINE_SIZE,self.height+2*LINE_SIZE))
     
     def contains(self,x,y):
         """Return: True if this shape contains the point (x,y), False otherwise.
@@ -1084,6 +1841,8 @@ class GEllipse(GRectangle):
     `center_x`, `center_y`, `right`, and `top`, all inherited from `GObject`.  
     See that class for more information."""
     
+    __slots__ = ()
+    
     def __init__(self,**keywords):
         """**Constructor**: creates a new solid ellipse
         
@@ -1103,17 +1862,22 @@ class GEllipse(GRectangle):
         """Helper method to cache data to speed drawing. This method should be  
         overridden for specific drawing instructions."""
         if self._scache is None:
-            self._scache = Ellipse(pos=(self.x, self.y), size=(self.width, self.height))
-            self._lcache = Ellipse(pos=(self.x-LINE_SIZE,self.y-LINE_SIZE),size=(self.width+2*LINE_SIZE,self.height+2*LINE_SIZE))
+            self._scache = _backend().ellipse(pos=(self.x, self.y), size=(self.width, self.height))
+            self._lcache = _backend().ellipse(pos=(self.x-LINE_SIZE,self.y-LINE_SIZE),size=(self.width+2*LINE_SIZE,self.height+2*LINE_SIZE))
         if style == CACHE_POS:
             self._scache.pos=(self.x, self.y)
             self._lcache.pos=(self.x-LINE_SIZE, self.y-LINE_SIZE) 
         elif style == CACHE_SIZE:
             self._scache.size=(self.width, self.height)
             self._lcache.size=(self.width+2*LINE_SIZE, self.height+2*LINE_SIZE)
+        elif style == CACHE_FRAME:
+            self._scache.pos=(self.x, self.y)
+            self._scache.size=(self.width, self.height)
+            self._lcache.pos=(self.x-LINE_SIZE, self.y-LINE_SIZE)
+            self._lcache.size=(self.width+2*LINE_SIZE, self.height+2*LINE_SIZE)
         else:
-            self._scache = Ellipse(pos=(self.x, self.y), size=(self.width, self.height))
-            self._lcache = Ellipse(pos=(self.x-LINE_SIZE,self.y-LINE_SIZE),size=(self.width+2*LINE_SIZE,self.height+2*LINE_SIZE))
+            self._scache = _backend().ellipse(pos=(self.x, self.y), size=(self.width, self.height))
+            self._lcache = _backend().ellipse(pos=(self.x-LINE_SIZE,self.y-LINE_SIZE),size=(self.width+2*LINE_SIZE,self.height+2*LINE_SIZE))
     
     def contains(self,x,y):
         """Return: True if this shape contains the point (x,y), False otherwise.
@@ -1140,6 +1904,300 @@ class GEllipse(GRectangle):
         return (dx+dy) <= 1.0
 
 
+def _corners(rects):
+    """**Returns**: the mesh vertices of rectangles, as a numpy array of shape (k,16).
+    
+    Each row is x, y, u, v for the four corners of a rectangle, counterclockwise
+    from the bottom left, as 32 bit floats.
+    
+        :param rects: x, y, w, h of each rectangle
+        **Precondition**: a numpy array of floats of shape (k,4)"""
+    x, y, w, h = rects[:,0], rects[:,1], rects[:,2], rects[:,3]
+    result = numpy.zeros((len(rects),16),dtype=numpy.float32)
+    result[:,0] = x
+    result[:,1] = y
+    result[:,4] = x+w
+    result[:,5] = y
+    result[:,8] = x+w
+    result[:,9] = y+h
+    result[:,12] = x
+    result[:,13] = y+h
+    return result
+
+
+class GBatch(GObject):
+    """Instances represent many solid rectangles drawn together.
+    
+    The rectangles are given by the attribute `frames`, a sequence of (x,y,w,h)
+    tuples whose (x,y) is the bottom left corner.  Each rectangle has its own
+    fill color, given by the attribute `colors`.  Instead of one `Rectangle`
+    instruction per rectangle, the batch packs all of the rectangles of the same
+    color into a single `Mesh`, so drawing costs one command per color, no
+    matter how many rectangles there are.
+    
+    Individual rectangles can be hidden with the method `hide`, and shown again
+    with `show`.  This only changes the vertices of that rectangle in its mesh;
+    the mesh is not rebuilt.  The rectangles have no border, so `linecolor` is
+    unused.
+    
+    The frames and the vertices of each mesh are kept in numpy arrays, which
+    the backend uses as they are.  A Kivy mesh can only be given all of its
+    vertices at once, so each change still sends the whole array (of at most
+    BATCH_SIZE rectangles) to the GPU.  To send it once for many changes, make
+    them inside a `batch` block:
+    
+        with bricks.batch():
+            for i in broken:
+                bricks.hide(i)
+    
+    The position and size attributes are the bounding box of all of the
+    rectangles.  They are immutable."""
+    
+    __slots__ = ('_rects','_colors','_visible','_mcache','_meshes','_where','_dirty')
+    
+    # PROPERTIES 
+    @property
+    def x(self):
+        """The horizontal coordinate of the left hand side.
+        
+        **Invariant**: Immutable float. It is equivalent to attribute `left`."""
+        return self._x
+    
+    @property
+    def y(self):
+        """The vertical coordinate of the bottom
+        
+        **Invariant**: Immutable float. It is equivalent to attribute `bottom`."""
+        return self._y
+    
+    @property
+    def width(self):
+        """The horizontal width of this shape. Positive values go to the right.
+        
+        **Invariant**: Immutable float.""" 
+        return self._width
+    
+    @property
+    def height(self):
+        """The vertical height of this shape. Positive values go up.
+        
+        **Invariant**: Immutable float.""" 
+        return self._height
+    
+    @property
+    def frames(self):
+        """The rectangles in this batch, as (x,y,w,h) tuples.
+        
+        The rectangles are kept in a numpy array, so the tuples are made each
+        time this is read.
+        
+        **Invariant**: Immutable tuple of 4-element tuples of float."""
+        return tuple(map(tuple,self._rects.tolist()))
+    
+    @property
+    def colors(self):
+        """The fill color of each rectangle in this batch.
+        
+        **Invariant**: Immutable tuple of 4-element lists of float between 0 and 1,
+        one for each rectangle.  Rectangles of the same color share one list."""
+        return self._colors
+    
+    def __init__(self,**keywords):
+        """**Constructor**: creates a new batch of solid rectangles
+        
+            :param keywords: dictionary of keyword arguments 
+            **Precondition**: See below.
+        
+        To use the constructor for this class, you should provide it with a 
+        list of keyword arguments that initialize various attributes. For 
+        example, to create a red and a blue square, use the constructor call
+        
+            GBatch(frames=[(0,0,10,10),(20,0,10,10)],colors=[colormodel.RED,colormodel.BLUE])
+        
+        If `colors` is not given, every rectangle uses `fillcolor`."""
+        self._cache_on = False
+        self._group = None
+        self._pending = None
+        self.fillcolor = keywords['fillcolor'] if 'fillcolor' in keywords else (1.0,1.0,1.0,1.0)
+        self.linecolor = keywords['linecolor'] if 'linecolor' in keywords else (0,0,0,1)
+        
+        frames = keywords['frames'] if 'frames' in keywords else ()
+        for frame in frames:
+            assert not _VALIDATE or (len(frame) == 4 and reduce(_and, map(_is_num,frame))), f'{frame} is not a rectangle'
+        self._rects = numpy.array(frames,dtype=float).reshape(-1,4)
+        
+        if 'colors' in keywords:
+            assert not _VALIDATE or len(keywords['colors']) == len(frames), f'{keywords["colors"]} does not have one color per rectangle'
+            # Rectangles of the same color share one list
+            shared = {}
+            colors = []
+            for color in keywords['colors']:
+                color = _gl_color(color)
+                colors.append(shared.setdefault(tuple(color),color))
+            self._colors = tuple(colors)
+        else:
+            self._colors = (self.fillcolor,)*len(frames)
+        self._visible = bytearray(b'\x01')*len(frames)
+        
+        rects = self._rects
+        if len(frames) == 0:
+            self._x = self._y = self._width = self._height = 0.0
+        else:
+            self._x = float(rects[:,0].min())
+            self._y = float(rects[:,1].min())
+            self._width  = float((rects[:,0]+rects[:,2]).max())-self._x
+            self._height = float((rects[:,1]+rects[:,3]).max())-self._y
+        self._mcache = None
+        self._dirty = set()
+    
+    def setPosition(self,x,y):
+        """Not allowed: the position of a batch is immutable."""
+        raise AttributeError('the position of a GBatch is immutable')
+    
+    def setFrame(self,x,y,width,height):
+        """Not allowed: the position and size of a batch are immutable."""
+        raise AttributeError('the position and size of a GBatch are immutable')
+    
+    def isVisible(self,i):
+        """**Returns**: True if rectangle i is not hidden.
+        
+            :param i: the position of the rectangle in `frames`
+            **Precondition**: an int in 0..len(frames)-1"""
+        return bool(self._visible[i])
+    
+    def hide(self,i):
+        """Hides the rectangle i of this batch.
+        
+            :param i: the position of the rectangle in `frames`
+            **Precondition**: an int in 0..len(frames)-1
+        
+        The four vertices of the rectangle are collapsed onto one point, so it
+        no longer covers any pixels.  Only that rectangle is changed in its mesh."""
+        if not self._visible[i]:
+            return
+        self._visible[i] = 0
+        if not self._mcache is None:
+            k = self._where[2*i]
+            pos = self._where[2*i+1]
+            self._meshes[k][1][pos:pos+16] = 0.0
+            self._send(k)
+    
+    def show(self,i):
+        """Shows the rectangle i of this batch again, after it was hidden.
+        
+            :param i: the position of the rectangle in `frames`
+            **Precondition**: an int in 0..len(frames)-1
+        
+        Only that rectangle is changed in its mesh."""
+        if self._visible[i]:
+            return
+        self._visible[i] = 1
+        if not self._mcache is None:
+            k = self._where[2*i]
+            pos = self._where[2*i+1]
+            self._meshes[k][1][pos:pos+16] = _corners(self._rects[i:i+1])[0]
+            self._send(k)
+    
+    def showAll(self):
+        """Shows every rectangle of this batch that is hidden.
+        
+        Each mesh is changed once, however many of its rectangles were hidden,
+        so this is much faster than calling `show` for each of them."""
+        visible = numpy.frombuffer(self._visible,dtype=numpy.uint8)
+        hidden = numpy.flatnonzero(visible == 0)
+        if len(hidden) == 0:
+            return
+        visible[hidden] = 1
+        if self._mcache is None:
+            return
+        where = numpy.frombuffer(self._where,dtype=self._where.typecode).reshape(-1,2)[hidden]
+        corners = _corners(self._rects[hidden])
+        with self.batch():
+            for k in numpy.unique(where[:,0]):
+                mine = where[:,0] == k
+                self._meshes[k][1].reshape(-1,16)[where[mine,1]//16] = corners[mine]
+                self._dirty.add(int(k))
+    
+    def _send(self,k):
+        """Helper method to send mesh k to the backend after its vertices changed.
+        
+        Inside a batch, it is only sent at the end of the batch (see `_flush`)."""
+        if self._pending is None:
+            mesh, vertices = self._meshes[k]
+            mesh.vertices = vertices
+        else:
+            self._dirty.add(k)
+    
+    def _flush(self,styles):
+        """Helper method to push the changes recorded by a batch to the cache.
+        
+        Each mesh with hidden or shown rectangles is sent to the backend once."""
+        for k in sorted(self._dirty):
+            mesh, vertices = self._meshes[k]
+            mesh.vertices = vertices
+        self._dirty.clear()
+        GObject._flush(self,styles)
+    
+    def _cache(self,style=CACHE_ALL):
+        """Helper method to cache data to speed drawing. This method should be  
+        overridden for specific drawing instructions."""
+        if style in (CACHE_POS, CACHE_SIZE, CACHE_FRAME) and not self._mcache is None:
+            return
+        
+        # Group the rectangles by color, at most BATCH_SIZE per mesh
+        groups = {}
+        for i in range(len(self._colors)):
+            groups.setdefault(tuple(self._colors[i]),[]).append(i)
+        
+        corners = _corners(self._rects)
+        corners[numpy.frombuffer(self._visible,dtype=numpy.uint8) == 0] = 0.0
+        self._mcache = []
+        self._meshes = []
+        where = numpy.zeros((len(self._colors),2),dtype=numpy.int64)
+        for color in groups:
+            members = groups[color]
+            for start in range(0,len(members),BATCH_SIZE):
+                chunk = numpy.array(members[start:start+BATCH_SIZE])
+                vertices = corners[chunk].ravel()
+                base = 4*numpy.arange(len(chunk),dtype=numpy.uint16)[:,None]
+                indices = (base + numpy.array([0,1,2,2,3,0],dtype=numpy.uint16)).ravel()
+                where[chunk,0] = len(self._meshes)
+                where[chunk,1] = 16*numpy.arange(len(chunk))
+                mesh = _backend().mesh(vertices,indices,'triangles')
+                self._meshes.append((mesh,vertices))
+                self._mcache.append((_color(color),mesh))
+        # The mesh and offset of each rectangle, as plain ints for hide and show
+        self._where = array.array('q',where.ravel().tobytes())
+    
+    def contains(self,x,y):
+        """Return: True if this shape contains the point (x,y), False otherwise.
+        
+            :param x: x coordinate of point to check
+            **Precondition**: an int or float
+            
+            :param y: y coordinate of point to check
+            **Precondition**: an int or float
+        
+        The point must be in one of the rectangles that are not hidden."""
+        rects = self._rects
+        visible = numpy.frombuffer(self._visible,dtype=numpy.uint8) != 0
+        return bool((visible & (rects[:,0] <= x) & (x <= rects[:,0]+rects[:,2]) &
+                     (rects[:,1] <= y) & (y <= rects[:,1]+rects[:,3])).any())
+    
+    def draw(self,view):
+        """Draw this shape in the provide view.
+        
+            :param view: view to draw to
+            **Precondition**: an *instance of* `GView`
+        
+        Ideally view should be the one provided by `Game`."""
+        # Invoke the cache
+        GObject.draw(self,view)
+        for color, mesh in self._mcache:
+            view.draw(color)
+            view.draw(mesh)
+
+
 class GImage(GRectangle):
     """Instance represents a rectangular image.
     
@@ -1158,6 +2216,9 @@ class GImage(GRectangle):
     represent irregular shapes.  However, the `contains` method still
     treats this shape as a rectangle.
     """
+    
+    __slots__ = ('_source',)
+    
     @property
     def source(self):
         """The source file for this image.
@@ -1167,9 +2228,9 @@ class GImage(GRectangle):
 
     @source.setter
     def source(self,value):
-        assert value is None or _is_image_file(value), f'{value} is not an image file'
+        assert not _VALIDATE or (value is None or _is_image_file(value)), f'{value} is not an image file'
         self._source = value
-        self._cache()
+        self._changed(CACHE_SOURCE)
         
     def __init__(self,**keywords):
         """**Constructor**: creates a new rectangle image
@@ -1188,7 +2249,7 @@ class GImage(GRectangle):
         GRectangle.__init__(self,**keywords)
         if 'source' in keywords:
             value =  keywords['source']
-            assert value is None or _is_image_file(value), f'{value} is not an image file'
+            assert not _VALIDATE or (value is None or _is_image_file(value)), f'{value} is not an image file'
             self._source = value
         else:
             self._source = None
@@ -1198,15 +2259,18 @@ class GImage(GRectangle):
         """Helper method to cache data to speed drawing. This method should be  
         overridden for specific drawing instructions."""
         if self._scache is None:
-            self._scache = Rectangle(pos=(self.x, self.y), size=(self.width, self.height), source=self._source)        
+            self._scache = _backend().rectangle(pos=(self.x, self.y), size=(self.width, self.height), source=self._source)        
         elif style == CACHE_POS:
             self._scache.pos=(self.x, self.y)
         elif style == CACHE_SIZE:
             self._scache.size=(self.width, self.height)
+        elif style == CACHE_FRAME:
+            self._scache.pos=(self.x, self.y)
+            self._scache.size=(self.width, self.height)
         elif style == CACHE_SOURCE:
             self._scache.source = self._source
         else:
-            self._scache = Rectangle(pos=(self.x, self.y), size=(self.width, self.height), source=self._source)        
+            self._scache = _backend().rectangle(pos=(self.x, self.y), size=(self.width, self.height), source=self._source)        
     
     def draw(self,view):
         """Draw this shape in the provide view.
@@ -1245,31 +2309,35 @@ class GLabel(GRectangle):
     fonts you will need the .ttf file for the bold version of that
     font.  See `ComicSans.ttf` and `ComicSansBold.ttf` for an example."""
     
+    __slots__ = ('_text','_font_size','_font_name','_bold','_halign','_valign','_texture','_tcache','_wcache')
+    
     @property
     def font_size(self):
         """Size of the text font in points.
         
         **Invariant**: A positive number (int or float)"""
-        return self._label.font_size
+        return self._font_size
 
     @font_size.setter
     def font_size(self,value):
-        assert type(value) in (int,float), f'{value} is not a number'
-        self._label.font_size = value
-        self._label.texture_update()
+        assert not _VALIDATE or type(value) in (int,float), f'{value} is not a number'
+        if value != self._font_size:
+            self._font_size = value
+            self._relayout(CACHE_ALL)
 
     @property
     def font_name(self):
         """File name for the .ttf file to use as a font
         
         **Invariant**: string referring to a .ttf file in folder Fonts"""
-        return self._label.font_name
+        return self._font_name
 
     @font_name.setter
     def font_name(self,value):
-        assert _is_font_file(value), f'{value} is not a font name'
-        self._label.font_name = value
-        self._label.texture_update()
+        assert not _VALIDATE or _is_font_file(value), f'{value} is not a font name'
+        if value != self._font_name:
+            self._font_name = value
+            self._relayout(CACHE_ALL)
 
     @property
     def bold(self):
@@ -1281,13 +2349,14 @@ class GLabel(GRectangle):
         an example.
         
         **Invariant**: boolean"""
-        return self._label.bold
+        return self._bold
 
     @bold.setter
     def bold(self,value):
-        assert type(value) == bool, f'{value} is not a bool'
-        self._label.bold = value
-        self._label.texture_update()
+        assert not _VALIDATE or type(value) == bool, f'{value} is not a bool'
+        if value != self._bold:
+            self._bold = value
+            self._relayout(CACHE_ALL)
 
     @property
     def text(self):
@@ -1298,14 +2367,18 @@ class GLabel(GRectangle):
         '\\n'. The `size` attribute of this label grows to make sure
         that the entire text fits inside of the rectangle.
         
+        Assigning the text the label already has does nothing, so a label
+        may be updated every frame for free while its text is unchanged.
+        
         **Invariant**: string"""
-        return self._label.text
+        return self._text
     
     @text.setter
     def text(self,value):
-        assert type(value) == str, f'{value} is not a string'
-        self._label.text = value
-        self._label.texture_update()
+        assert not _VALIDATE or type(value) == str, f'{value} is not a string'
+        if value != self._text:
+            self._text = value
+            self._relayout(CACHE_ALL)
 
     @property
     def halign(self):
@@ -1321,10 +2394,9 @@ class GLabel(GRectangle):
     
     @halign.setter
     def halign(self,value):
-        assert value in ('left','right','center'), f'{value} is not a valid horizontal alignment'
+        assert not _VALIDATE or value in ('left','right','center'), f'{value} is not a valid horizontal alignment'
         self._halign = value
-        self._label.halign = value
-        self._cache(CACHE_POS)
+        self._relayout(CACHE_POS)
 
     @property
     def valign(self):
@@ -1340,10 +2412,9 @@ class GLabel(GRectangle):
     
     @valign.setter
     def valign(self,value):
-        assert value in ('top','middle','bottom'), f'{value} is not a valid vertical alignment'
+        assert not _VALIDATE or value in ('top','middle','bottom'), f'{value} is not a valid vertical alignment'
         self._valign = value
-        self._label.valign = value
-        self._cache(CACHE_POS)
+        self._relayout(CACHE_POS)
 
     def __init__(self,**keywords):
         """**Constructor**: creates a new text label.
@@ -1365,42 +2436,88 @@ class GLabel(GRectangle):
             keywords['fillcolor'] = [0.0,0.0,0.0,0.0]
         
         GRectangle.__init__(self,**keywords)
-        self._label = Label(**keywords)
-        self._label.size_hint = (None,None)
+        self._texture = None
+        self._tcache = None
+        self._wcache = _color((1,1,1,1))
+        
+        self._text = keywords['text'] if 'text' in keywords else ''
+        self._font_size = keywords['font_size'] if 'font_size' in keywords else 15
+        self._font_name = keywords['font_name'] if 'font_name' in keywords else 'Roboto'
+        self._bold = keywords['bold'] if 'bold' in keywords else False
+        self._halign = keywords['halign'] if 'halign' in keywords else 'left'
+        self._valign = keywords['valign'] if 'valign' in keywords else 'bottom'
+        
+        # The same checks as the setters, which are skipped to lay out only once
+        assert not _VALIDATE or type(self._text) == str, f'{self._text} is not a string'
+        assert not _VALIDATE or type(self._font_size) in (int,float), f'{self._font_size} is not a number'
+        assert not _VALIDATE or not 'font_name' in keywords or _is_font_file(self._font_name), f'{self._font_name} is not a font name'
+        assert not _VALIDATE or type(self._bold) == bool, f'{self._bold} is not a bool'
+        assert not _VALIDATE or self._halign in ('left','right','center'), f'{self._halign} is not a valid horizontal alignment'
+        assert not _VALIDATE or self._valign in ('top','middle','bottom'), f'{self._valign} is not a valid vertical alignment'
+        self._cache()
+    
+    def _relayout(self,style):
+        """Helper method to lay out this label again after its text changed.
         
-        if 'halign' in keywords:
-            self._halign = keywords['halign']
+        A label is laid out even before it is drawn, as its size depends on
+        its text.  Inside a batch, this waits until the batch ends."""
+        if self._pending is None:
+            self._cache(style)
         else:
-            self._halign = 'left'
-            self._label._halign = 'left'
-
-        if 'valign' in keywords:
-            self._valign = keywords['valign']
-        else:
-            self._valign = 'bottom'
-            self._label._valign = 'bottom'
+            self._pending.add(style)
+    
+    def _flush(self,styles):
+        """Helper method to push the changes recorded by a batch to the cache.
         
-        self._label.bind(texture_size=self._callback)
-
-    def _callback(self,instance=None,value=None):
-        """Workaround to deal with parameter requirements for callbacks"""
-        self._cache()
+        The label is laid out once.  Only a change of color needs the retained
+        instructions to be replaced, as the others are changed in place."""
+        if len(styles) == 0:
+            return
+        self._cache(CACHE_POS if styles == {CACHE_POS} else CACHE_ALL)
+        if CACHE_COLOR in styles and self._cache_on and not self._group is None:
+            self._regroup()
     
+    def _place(self):
+        """Helper method to return the position of the text inside the label
+        
+        The text is anchored inside of the label rectangle according to
+        `halign` and `valign`."""
+        tw, th = self._texture.size
+        if self._halign == 'left':
+            tx = self.x
+        elif self._halign == 'center':
+            tx = self.center_x-tw/2.0
+        else: # 'right'
+            tx = self.right-tw
+        
+        if self._valign == 'top':
+            ty = self.top-th
+        elif self._valign == 'middle':
+            ty = self.center_y-th/2.0
+        else: # 'bottom'
+            ty = self.y
+        return (tx, ty)
+    
+    @tracing.traced('GLabel._cache')
     def _cache(self,style=CACHE_ALL):
         """Helper method to cache data to speed drawing. This method should be  
-        overridden for specific drawing instructions."""
+        overridden for specific drawing instructions.
+        
+        The text texture is made by the backend.  With Kivy it comes from a
+        cache shared by all labels (see `_text_texture`), so this never
+        renders text that some label rendered recently."""
         if style == CACHE_POS and not self._scache is None:
-            self._label.pos=(self.x, self.y)
             self._scache.pos = (self.x, self.y)
+            self._tcache.pos = self._place()
             return
-    
-        self._label.size = self._label.texture_size
-        self._label.pos = (self.x, self.y)
-        self._label.color = self._linecolor.rgba
+        
+        self._texture = _backend().text(self._text,self._font_name,self._font_size,
+                                      self._bold,self._linecolor.rgba)
+        tw, th = self._texture.size
         
         # Resize the outside if necessary
-        width  = max(self._width,self._label.width)
-        height = max(self._height,self._label.height)
+        width  = max(self._width,tw)
+        height = max(self._height,th)
    
         # Reset to horizontal anchor position.
         if self._halign == 'left':
@@ -1426,23 +2543,15 @@ class GLabel(GRectangle):
         else:
             self._height = height
         
-        # Internal Horizontal placement
-        if self._halign == 'left':
-            self._label.x = self.x
-        elif self._halign == 'center':
-            self._label.center_x = self.center_x
-        else: # 'ightr'
-            self._label.right = self.right
-        
-        # Internal Vertical placement
-        if self._valign == 'top':
-            self._label.top = self.top
-        elif self._valign == 'middle':
-            self._label.center_y = self.center_y
-        else: # 'bottom'
-            self._label.y = self.y
-        
-        self._scache = Rectangle(pos=(self.x, self.y), size=(self.width, self.height))
+        if self._scache is None:
+            self._scache = _backend().rectangle(pos=(self.x, self.y), size=(self.width, self.height))
+            self._tcache = _backend().rectangle(pos=self._place(), size=(tw, th), texture=self._texture)
+        else:
+            self._scache.pos = (self.x, self.y)
+            self._scache.size = (self.width, self.height)
+            self._tcache.texture = self._texture
+            self._tcache.pos = self._place()
+            self._tcache.size = (tw, th)
     
     def draw(self,view):
         """Draw this shape in the provide view.
@@ -1455,18 +2564,38 @@ class GLabel(GRectangle):
         GObject.draw(self,view)
         view.draw(self._fillcolor)
         view.draw(self._scache)
-        view.draw(self._label.canvas)
+        view.draw(self._wcache)
+        view.draw(self._tcache)
 
 
 #### APPLICATION CLASSES ####
 
-class GView(FloatLayout):
+class GView(object):
     """The view class for a `Game` application.
     
     You may need to access an instance of this class to draw `GObject` 
     instances.  However, you will never need to construct one.
     You should only use the one provided in the `view` attribute of
-    `Game`. See class `Game` for more information."""
+    `Game`. See class `Game` for more information.
+    
+    The view draws with a `Backend`.  By default this is a `KivyBackend`,
+    which draws into a Kivy FloatLayout, the `widget` of the view.  With a
+    `NullBackend` or a `RecordingBackend` there is no widget and no window;
+    the mouse is then set with `setTouch`."""
+    
+    @property
+    def backend(self):
+        """The backend this view (and every shape made after it) draws with.
+        
+        **Invariant**: Immutable instance of Backend."""
+        return self._backend
+    
+    @property
+    def widget(self):
+        """The Kivy widget this view draws into, or None if there is no window.
+        
+        **Invariant**: Immutable instance of FloatLayout, or None."""
+        return self._backend.widget
     
     @property
     def touch(self):
@@ -1485,15 +2614,61 @@ class GView(FloatLayout):
         
         return GPoint(self._touch.x,self._touch.y)
     
-    def __init__(self):
-        """**Initializer**: creates a new GView"""
-        FloatLayout.__init__(self)
-        self.bind(on_touch_down=self._capture_touch)
-        self.bind(on_touch_move=self._capture_touch)
-        self.bind(on_touch_up=self._release_touch)
-        self._frame = InstructionGroup()
-        self.canvas.add(self._frame)
+    @property
+    def emitted(self):
+        """The number of drawing instructions sent to the canvas so far.
+        
+        This counts the commands drawn every frame, and those of attached shapes
+        each time they change.  The difference between two frames is the work
+        done by the canvas for that frame.
+        
+        **Invariant**: int >= 0."""
+        return _EMITTED
+    
+    def __init__(self,backend=None):
+        """**Initializer**: creates a new GView
+        
+            :param backend: The backend to draw with
+            **Precondition**: a `Backend`, or None for a new `KivyBackend`
+        
+        The backend becomes the one used by the shapes made from now on."""
+        global _BACKEND
+        if backend is None:
+            backend = KivyBackend()
+        assert isinstance(backend,Backend), f'{backend} is not a Backend'
+        self._backend = backend
+        _BACKEND = backend
+        _COLORS.clear()
+        canvas = backend.canvas
+        self._backdrop = backend.rectangle(pos=(0,0),size=(0,0))
+        canvas.add(backend.color(1,1,1))
+        canvas.add(self._backdrop)
+        self._scene = backend.group()
+        canvas.add(self._scene)
+        self._frame = backend.group()
+        canvas.add(self._frame)
+        self._attached = {}
+        self._kept = {}
+        self._color = None
         self._touch = None
+        
+        widget = backend.widget
+        if not widget is None:
+            widget.bind(on_touch_down=self._capture_touch)
+            widget.bind(on_touch_move=self._capture_touch)
+            widget.bind(on_touch_up=self._release_touch)
+            widget.bind(pos=self._resize,size=self._resize)
+            self._resize(widget,None)
+    
+    def setTouch(self,point):
+        """Sets the mouse press, as the window does when the mouse is used.
+        
+            :param point: The position of the mouse, or None if it is released
+            **Precondition**: a `GPoint`, or None
+        
+        This lets a script or a test drive a view that has no window."""
+        assert point is None or isinstance(point,GPoint), f'{point} is not a GPoint'
+        self._touch = point
     
     def _capture_touch(self,view,touch):
         """Helper method to respond (and grap) a mouse press"""
@@ -1504,26 +2679,111 @@ class GView(FloatLayout):
         """Helper method to respond (and release) a mouse release"""
         self._touch = None
     
+    def _resize(self,view,value):
+        """Helper method to keep the white background the size of the view"""
+        self._backdrop.pos = view.pos
+        self._backdrop.size = view.size
+    
     def draw(self,cmd):
         """Adds the giving drawing command to this canvas for drawing.
         
+        Commands added this way only last for the current animation frame.
+        A color instruction that is already the current color (the last color
+        added this frame) is skipped, as it would not change anything.
+        
             :param cmd: The drawing command
             **Invariant**: cmd is a Kivy drawing instruction.
         """
+        global _EMITTED
+        if cmd is self._color:
+            return
+        if hasattr(cmd,'rgba'):
+            self._color = cmd
+        _EMITTED += 1
         self._frame.add(cmd)
     
+    def attach(self,obj):
+        """Adds the given shape to this view until it is detached.
+        
+            :param obj: The shape to add
+            **Precondition**: obj is a `GObject`.
+        
+        Unlike shapes drawn with the `draw` method of `GObject`, which must be
+        drawn again every animation frame, an attached shape stays on screen.
+        Any change to its attributes is shown automatically, so an attached
+        shape should not also be drawn.  Attaching a shape twice has no effect."""
+        if obj in self._attached:
+            return
+        group = self._backend.group()
+        obj._retain(group)
+        self._scene.add(group)
+        self._attached[obj] = group
+    
+    def detach(self,obj):
+        """Removes the given shape from this view.
+        
+            :param obj: The shape to remove
+            **Precondition**: obj is a `GObject`.
+        
+        Detaching a shape that is not attached has no effect."""
+        if not obj in self._attached:
+            return
+        self._scene.remove(self._attached.pop(obj))
+        obj._retain(None)
+    
+    def isAttached(self,obj):
+        """**Returns**: True if the given shape is attached to this view.
+        
+            :param obj: The shape to check
+            **Precondition**: obj is a `GObject`."""
+        return obj in self._attached
+    
+    def keep(self,key,value):
+        """Keeps a value with this view until it is taken with `take`.
+        
+            :param key: The name to keep the value under
+            **Precondition**: a hashable value
+        
+            :param value: The value to keep
+            **Precondition**: any value
+        
+        This lets a shape that is costly to make, and was made for this view,
+        be used again by the next one that needs it.  It is kept no longer than
+        the view.  A value already kept under key is replaced."""
+        self._kept[key] = value
+    
+    def take(self,key):
+        """**Returns**: the value kept under key (see `keep`), or None if there is none.
+        
+            :param key: The name the value was kept under
+            **Precondition**: a hashable value
+        
+        The value is no longer kept once it is taken."""
+        return self._kept.pop(key,None)
+    
+    def clear(self):
+        """Detaches every shape from this view."""
+        for obj in list(self._attached):
+            self.detach(obj)
+    
     def _redraw(self):
-        """Helper called to refresh the screen each animation frame"""
-        self.canvas.remove(self._frame)
+        """Helper called to refresh the screen each animation frame
+        
+        Only the commands added with `draw` are removed.  Attached shapes and
+        the background stay in the canvas."""
         self._frame.clear()
-        self._frame = InstructionGroup()
-        self.canvas.add(self._frame)
-        self._frame.add(Color(1,1,1))
-        self._frame.add(Rectangle(pos=self.pos,size=self.size))
+        self._color = None
 
 
-class GameApp(kivy.app.App):
-    """Primary controller class for a simple game application."""
+class GameApp(object):
+    """Primary controller class for a simple game application.
+    
+    Kivy is not imported until the game is run.  The method `run` then makes
+    a Kivy App that calls back into this object (see `_make_app`).
+    
+    If the keyword `backend` is a `NullBackend` or a `RecordingBackend`, the
+    game has no window and Kivy is never loaded.  It is then run frame by
+    frame with `runFrames`, which is how a game is timed or tested headless."""
     
     @property
     def width(self):
@@ -1549,6 +2809,52 @@ class GameApp(kivy.app.App):
         **Invariant**: Immutable float > 0."""
         return self._fps
     
+    @property
+    def tick(self):
+        """Simulation ticks per second
+        
+        The method `update` is called exactly this many times for every
+        second of real time, no matter how fast the screen is redrawn.
+        
+        **Invariant**: Immutable float > 0."""
+        return self._tick
+    
+    @property
+    def maxticks(self):
+        """Maximum number of ticks run to catch up in a single frame
+        
+        If the game falls further behind than this, the remaining time is
+        dropped and the game slows down instead of stalling.
+        
+        **Invariant**: Immutable int > 0."""
+        return self._maxticks
+    
+    @property
+    def alpha(self):
+        """Fraction of a tick that has passed since the last call to `update`
+        
+        Use this in `draw` to interpolate positions between the previous and
+        the current simulation tick.
+        
+        **Invariant**: float in [0,1)."""
+        return self._alpha
+    
+    @property
+    def stats(self):
+        """The frame time statistics, or None if they are not kept.
+        
+        See the module perf for what it holds.
+        
+        **Invariant**: Immutable instance of FrameStats, or None."""
+        return self._stats
+    
+    @property
+    def backend(self):
+        """The backend the game draws with, or None for a `KivyBackend`.
+        
+        **Invariant**: Immutable instance of Backend, or None."""
+        return self._backend
+    
     @property
     def view(self):
         """The Game view.
@@ -1574,37 +2880,74 @@ class GameApp(kivy.app.App):
             Game(width=400,height=400)
         
         The game window will not show until you start the game.
-        To start the game, use the method `run()`."""
-        w = keywords['width']  if  'width' in keywords else 0.0
-        h = keywords['height'] if 'height' in keywords else 0.0
-        f = keywords['fps']    if 'fps'    in keywords else 60.0
+        To start the game, use the method `run()`.
+        
+        The keyword `fps` sets the render rate, while `tick` sets how many
+        times a second `update` is called (both 60 by default).  At most
+        `maxticks` updates (default 5) are run to catch up in one frame.
+        
+        If the keyword `stats` is True, every frame is timed and kept in the
+        attribute `stats`.  If `overlay` is also True, a summary of them is
+        shown in the bottom left corner of the window.  If the keyword `trace`
+        is a file name, the phases of every frame are written to that file as
+        trace events while the game runs (see the module tracing).
+        
+        The keyword `backend` is the `Backend` the view draws with (a new
+        `KivyBackend` by default)."""
+        w = keywords.pop('width',0.0)
+        h = keywords.pop('height',0.0)
+        f = keywords.pop('fps',60.0)
+        t = keywords.pop('tick',60.0)
+        m = keywords.pop('maxticks',5)
+        s = keywords.pop('stats',False)
+        o = keywords.pop('overlay',False)
+        self._trace = keywords.pop('trace',None)
+        self._backend = keywords.pop('backend',None)
 
         assert type(w) in [int, float], f'{w} is not a number'
         assert type(h) in [int, float], f'{h} is not a number'
         assert type(f) in [int, float], f'{f} is not a number'
         assert f > 0.0, f'{f} is not positive'
+        assert type(t) in [int, float], f'{t} is not a number'
+        assert t > 0.0, f'{t} is not positive'
+        assert type(m) == int and m > 0, f'{m} is not a positive int'
+        assert self._backend is None or isinstance(self._backend,Backend), f'{self._backend} is not a Backend'
         self._wwidth = w
         self._wheight = h
         self._fps = f
-        Config.set('graphics', 'width', str(self.width))
-        Config.set('graphics', 'height', str(self.height))
-        
-        # Tell Kivy to build the application
-        kivy.app.App.__init__(self,**keywords)
+        self._tick = t
+        self._maxticks = m
+        # Simulation time not yet consumed by update
+        self._accum = 0.0
+        self._alpha = 0.0
+        self._stats = FrameStats() if s else None
+        self._overlay = None
+        self._showOverlay = bool(s and o)
+        self._view = None
+        # The Kivy App and its keywords, made by run
+        self._app = None
+        self._keywords = keywords
     
     def build(self):
         """Special Kivy method to initialize the graphics window"""
-        self._view = GView()
-        self._view.size_hint = (1,1)
-        return self.view
+        self._view = GView(self._backend)
+        if not self._view.widget is None:
+            self._view.widget.size_hint = (1,1)
+        return self.view.widget
     
     def _startup(self,dt):
         """Called to initialize.
         
         This is a callback-proxy for method init().  It handles
         important issues behind the scenes."""
-        Clock.schedule_interval(self._refresh,1.0/self._fps)
+        if not self._trace is None:
+            tracing.start(self._trace)
+        if not self._app is None:
+            from kivy.clock import Clock
+            Clock.schedule_interval(self._refresh,1.0/self._fps)
         self.init()
+        # The first frame always runs one tick
+        self._accum = 1.0/self._tick
     
     def _refresh(self,dt):
         """Called every animation frame.
@@ -1612,24 +2955,121 @@ class GameApp(kivy.app.App):
             :param dt: time in seconds since last update
             **Precondition**: a number (int or float)
         
-        This is a callback-proxy for method update().  It handles
-        important issues behind the scenes."""
+        This is a callback-proxy for method update().  It adds dt to an
+        accumulator and calls update() once for every whole tick in it, up
+        to `maxticks` times.  Whatever is left sets `alpha` for draw().
+        
+        If statistics are kept, each phase is timed and added to `stats`."""
+        with tracing.span('refresh'):
+            self._runFrame(dt)
+    
+    def _runFrame(self,dt):
+        """Helper for _refresh: runs one animation frame.
+        
+            :param dt: time in seconds since last update
+            **Precondition**: a number (int or float)"""
+        if self._stats is None:
+            self.view._redraw()
+            self._advance(dt)
+            with tracing.span('draw'):
+                self.draw()
+            return
+        
+        emitted = self.view.emitted
+        start = time.perf_counter()
         self.view._redraw()
-        self.update(dt)
-        self.draw()
+        redrawn = time.perf_counter()
+        ticks = self._advance(dt)
+        updated = time.perf_counter()
+        with tracing.span('draw'):
+            self.draw()
+        if self._showOverlay:
+            self._drawOverlay()
+        drawn = time.perf_counter()
+        self._stats.record(redrawn-start,updated-redrawn,drawn-updated,drawn-start,
+                           ticks,self.view.emitted-emitted)
+    
+    def _advance(self,dt):
+        """Adds dt to the accumulator and runs the whole ticks in it.
+        
+            :param dt: time in seconds since last update
+            **Precondition**: a number (int or float)
+        
+        **Returns**: the number of times update() was called."""
+        step = 1.0/self._tick
+        self._accum += dt
+        ticks = 0
+        while self._accum >= step and ticks < self._maxticks:
+            with tracing.span('update'):
+                self.update(step)
+            self._accum -= step
+            ticks += 1
+        if self._accum >= step:
+            # Too far behind; drop the time we cannot catch up on
+            self._accum %= step
+        self._alpha = self._accum/step
+        return ticks
+    
+    def _drawOverlay(self):
+        """Shows the summary of `stats` on top of the game.
+        
+        The text only changes every OVERLAY_PERIOD frames, so that the label
+        is not rendered again every frame."""
+        if self._overlay is None:
+            self._overlay = GLabel(text=self._stats.getText(),x=0,y=0,font_size=12)
+        elif self._stats.getFrames() % OVERLAY_PERIOD == 0:
+            self._overlay.text = self._stats.getText()
+        # Attach again if the game cleared the view, to stay on top
+        self.view.attach(self._overlay)
     
     def run(self):
         """Display the game window and start the game"""
+        from kivy.config import Config
+        Config.set('graphics', 'width', str(self.width))
+        Config.set('graphics', 'height', str(self.height))
+        from kivy.clock import Clock
+        self._app = _make_app(self,**self._keywords)
         Clock.schedule_once(self._startup,-1)
-        kivy.app.App.run(self)
+        self._app.run()
+    
+    def runFrames(self,frames,dt=None):
+        """Runs the given number of animation frames without a window.
+        
+            :param frames: The number of frames to run
+            **Precondition**: an int >= 0
+        
+            :param dt: The time in seconds between frames, 1/`fps` by default
+            **Precondition**: a number (int or float) > 0, or None
+        
+        The first call builds the view and calls init(), as `run` does.  Each
+        frame then calls update() and draw() exactly as in the window.  The
+        game must have been made with a backend that needs no window, such as
+        a `NullBackend`; use `view.setTouch` to move the mouse.  Call on_stop()
+        once the game is over."""
+        assert type(frames) == int and frames >= 0, f'{frames} is not an int >= 0'
+        assert not self._backend is None and self._backend.widget is None, 'this game needs a window'
+        if dt is None:
+            dt = 1.0/self._fps
+        if self._view is None:
+            self.build()
+            self._startup(0)
+        for frame in range(frames):
+            self._refresh(dt)
     
     def stop(self):
         """Close the game window and exit Python.
         
         You should never need to call this"""
-        kivy.app.App.stop(self)
+        if self._app is None:
+            self.on_stop()
+        else:
+            self._app.stop()
         sys.exit(0)
     
+    def on_stop(self):
+        """Special Kivy method called when the app stops; ends any trace"""
+        tracing.stop()
+    
     def init(self):
         """Initialize the game state.
         
@@ -1639,16 +3079,44 @@ class GameApp(kivy.app.App):
         pass
     
     def update(self,dt):
-        """Called every animation frame.
+        """Called every simulation tick.
         
-            :param dt: time in seconds since last update
+            :param dt: the fixed tick length in seconds, 1/`tick`
             **Precondition**: a number (int or float)
         
-        This method is called 60x a second to provide on-screen animation.
-        Think of it as the body of the loop.  It is best to have fields
+        This method is called `tick` times a second (60 by default), however
+        fast the screen is redrawn.  Think of it as the body of the loop.  It is best to have fields
         that represent the current animation state so that you know where
         you are in the animation."""
         pass
     
     def draw(self):
         pass
+
+
+def _make_app(game,**keywords):
+    """**Returns**: a Kivy App that runs the given game.
+    
+        :param game: The game to run
+        **Precondition**: game is a `GameApp`.
+    
+        :param keywords: The keywords of the Kivy App
+        **Precondition**: keywords are valid keywords of kivy.app.App.
+    
+    The App builds the window with `GameApp.build` and calls `GameApp.on_stop`
+    when it stops.  Its title is the name of the class of the game."""
+    import kivy.app
+    
+    class _GameApp(kivy.app.App):
+        """The Kivy App of a `GameApp`."""
+        
+        def build(self):
+            """Special Kivy method to initialize the graphics window"""
+            return game.build()
+        
+        def on_stop(self):
+            """Special Kivy method called when the app stops"""
+            game.on_stop()
+    
+    keywords.setdefault('title',type(game).__name__)
+    return _GameApp(**keywords)
@@ -12,12 +12,18 @@ objects.  The ball and the bricks are represented by classes stored in models.py
 The paddle does not need a new class (unless you want one), as it is an instance
 of GRectangle provided by game2d.py.
 
+The rules of the game are not in this module.  They are in the class Simulation
+of simulation.py, which does not need Kivy.  Gameplay forwards every update to
+its Simulation, and then moves the paddle and ball to match it.
+
 Most of your work on this assignment will be in either this module or models.py.
 Whether a helper method belongs in this module or models.py is often a complicated
 issue.  If you do not know, ask on Piazza and we will answer."""
 from constants import *
 from game2d import *
 from models import *
+from simulation import *
+import tracing
 
 class Gameplay(object):
     """An instance controls a single game of breakout.
@@ -31,13 +37,13 @@ class Gameplay(object):
     update.  See subcontrollers.py from Lecture 24 for an example.
     
     INSTANCE ATTRIBUTES:
-        _wall   [BrickWall]:  the bricks still remaining 
+        _sim    [Simulation]: the state and rules of the game
+        _wall   [BrickWall]:  draws the bricks still remaining in _sim
         _paddle [GRectangle]: the paddle to play with 
         _ball [Ball, or None if waiting for a serve]: 
             the ball to animate
-        _last [GPoint, or None if mouse button is not pressed]:  
-            last mouse position (if Button pressed)
-        _tries  [int >= 0]:   the number of tries left 
+        _view [GView, or None if not attached]:
+            the view the wall, paddle and ball are attached to
     
     As you can see, all of these attributes are hidden.  You may find that you
     want to access an attribute in call Breakout. It is okay if you do, but
@@ -45,55 +51,82 @@ class Gameplay(object):
     setter for any attribute that you need to access in Breakout.  Only add
     the getters and setters that you need for Breakout.
     
-    You may change any of the attributes above as you see fit. For example, you
-    might want to make a Paddle class for your paddle.  If you make changes,
-    please change the invariants above.  Also, if you add more attributes,
-    put them and their invariants below.
-                  
-    LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
-        _win     [bool]:
-            True indicates that the player has eliminated all of the bricks, so
-            that breakout can enter STATE_WIN.
-        _touchCount [int >= 0]:
-            Amount of times the ball has made contact with the paddle.
-            After 7 times, the speed of the ball will increase
+    The paddle and ball only draw the state of _sim.  They are moved to match
+    _sim after every update, and interpolate moves them between the last two
+    updates when the screen is redrawn faster than the game is updated.
+    
+    The game can be drawn every frame with draw and drawBall, or attached to a
+    GView once with attach.  An attached game stays on screen until detach is
+    called, and only the objects that change are updated.  The ball is only
+    shown while it is in play (above the bottom of the screen).
     """
     def getBall(self):
         '''Returns: the ball as a Ball object.
         
-        This method returns the attribute _ball directly. Any changes
-        made to this will modify the ball.'''
+        This method returns the attribute _ball directly. The ball is only a
+        drawing; changes made to it do not change the game.'''
         return self._ball
     
-    def setBall(self, ball):
-        "Sets the the ball to animate equal to ball"
-        self._ball = ball
+    def getSimulation(self):
+        '''Returns: the state and rules of this game as a Simulation object.
+        
+        This method returns the attribute _sim directly. Any changes made to
+        this will modify the game.'''
+        return self._sim
     
     def getTries(self):
         '''Returns: the number of tries left as an int'''
-        return self._tries
+        return self._sim.getTries()
     
     def getWin(self):
         '''Returns: the win attribute (bool) of the current game state
         
         This will return True when the bricks have been eliminated.'''
-        return self._win
+        return self._sim.getWin()
     
-    def __init__(self):
+    def __init__(self, rng=None):
         '''This initializes the game state.
         
         The wall and paddle are initialized right away because they are
         seen during STATE_COUNTDOWN. _ball begins as none and will be initialized
-        in createBall(). _tries starts at the max value dictated by constants.py.
-        _win begins as False and will only turn to true when the wall of bricks is empty.
+        in createBall().
+        
+        Precondition: rng is a random.Random object used to serve the ball, or
+        None to use the shared generator of the module random.
         '''
-        self._wall = BrickWall()
-        self._paddle = GRectangle(x=GAME_WIDTH/2-PADDLE_WIDTH/2,y=PADDLE_OFFSET,width= PADDLE_WIDTH,height=PADDLE_HEIGHT, linecolor = colormodel.RGB(0,0,0), fillcolor = colormodel.RGB(0,0,0))
-        self._last = None
+        self._sim = Simulation(rng)
+        self._wall = BrickWall(self._sim.getWall())
+        self._paddle = GRectangle(x=self._sim.getPaddle(),y=PADDLE_OFFSET,width= PADDLE_WIDTH,height=PADDLE_HEIGHT, linecolor = colormodel.BLACK, fillcolor = colormodel.BLACK)
         self._ball = None
-        self._tries = NUMBER_TURNS
-        self._win = False
-        self._touchCount = 0
+        self._view = None
+    
+    def attach(self,view):
+        '''Attaches the wall, paddle and ball (if in play) to the view
+        
+        Precondition: view is a GView'''
+        self._view = view
+        self._wall.attach(view)
+        view.attach(self._paddle)
+        self._showBall()
+    
+    def detach(self):
+        '''Detaches the wall, paddle and ball from the view they are attached to'''
+        if self._view is None:
+            return
+        self._wall.detach()
+        self._view.detach(self._paddle)
+        if not self._ball is None:
+            self._view.detach(self._ball)
+        self._view = None
+    
+    def _showBall(self):
+        '''Attaches the ball while it is in play, and detaches it once it is lost'''
+        if self._view is None or self._ball is None:
+            return
+        if self._ball.y > 0:
+            self._view.attach(self._ball)
+        else:
+            self._view.detach(self._ball)
     
     def draw(self,view):
         '''Draw the paddle and wall'''
@@ -103,7 +136,12 @@ class Gameplay(object):
     def createBall(self):
         '''Creates the ball. This is separate from the initializer
         because it should be created only in STATE_ACTIVE.'''
-        self._ball = Ball()
+        self._sim.createBall()
+        ball = self._sim.getBall()
+        if not self._view is None and not self._ball is None:
+            self._view.detach(self._ball)
+        self._ball = Ball(ball[0], ball[1])
+        self._showBall()
         
     def drawBall(self, view):
         '''Draw the ball'''
@@ -113,108 +151,66 @@ class Gameplay(object):
         '''This method allows the user to slide the paddle sideways, without
         making the paddle teleport to where the user clicked.
         When touch is equal to None, there has been no click.
-        When the last mouse position is None and touch is not None, last becomes the first click
-        When the last mouse position and touch are not None, the method will call _movePaddle
-        because the cursor has changed positions.'''
         
-        if touch == None:
-            self._last = None
-        elif self._last == None and touch != None: 
-            self._last = touch    
-        elif self._last != None and touch != None:
-            self._movePaddle(touch)
-                
-    def _movePaddle(self, touch):
-        '''This method is called upon by updatePaddle, and it ensures that the paddle will slide
-        but will not transport'''
+        Precondition: touch is a GPoint object received from the game's view, or None.'''
+        self._sim.updatePaddle(None if touch is None else touch.x)
+        self._paddle.x = self._sim.getPaddle()
+    
+    def interpolate(self, alpha):
+        '''Moves the paddle and ball a fraction alpha of the way from where they
+        were before the last update to where they are now.
         
-        distance = touch.x - self._last.x
-        if self._paddle.x + distance < 0:
-            self._paddle.x = 0
-        elif self._paddle.x + PADDLE_WIDTH > GAME_WIDTH:
-            self._paddle.x = GAME_WIDTH - PADDLE_WIDTH
-        else:
-            self._paddle.x = self._paddle.x + distance
-        self._last = touch
+        Precondition: alpha is a float in 0..1'''
+        self._paddle.x = self._sim.getPaddleAt(alpha)
+        ball = self._sim.getBallAt(alpha)
+        if not ball is None and not self._ball is None:
+            self._ball.setPosition(ball[0], ball[1])
     
-    def updateBall(self):
-        '''This method will update the ball's velocity after colliding with a wall.
+    def snapshot(self):
+        '''Returns: the state of this game, as an immutable simulation.State.
         
-           It calls _processCollision to detect collision with the paddle or bricks.
-           When the ball reaches the bottom of the screen, the _tries attribute is
-           decreased by 1.
-           
-           This method also checks if the touchCount reaches 7, in which the speed
-           is increased.
-        '''
-        xvelocity = self._ball.getVx()
-        yvelocity = self._ball.getVy()
-        if self._ball.x + BALL_DIAMETER >= GAME_WIDTH or self._ball.x <= 0:
-            self._ball.setVx(-xvelocity)
-        elif self._ball.y + BALL_DIAMETER >= GAME_HEIGHT or self._ball.y + BALL_DIAMETER <= 0:
-            if yvelocity > 0:
-                self._ball.setVy(-yvelocity)
-        elif self._ball.y <= 0:
-            self._tries = self._tries - 1
-            self._touchCount = 0
-        self._processCollision()
-        if self._touchCount == 10:
-            self._ball.setVy(-yvelocity*1.3)
+        The state has only numbers and arrays, no graphics.  The bricks are not
+        copied; the state shares them with the game until a brick is removed, so
+        taking a snapshot costs about the same whatever happens in the game.'''
+        return self._sim.getState()
+    
+    def restore(self, snap):
+        '''Puts this game back in the state of a snapshot.
         
-    def _processCollision(self):
-        '''This method first checks to see if either of the bottom corners of the ball
-           make contact with the paddle with the 'contain' method. If so, the y-velocity
-           will reverse (we check to make sure that it goes from negative to positive
-           to prevent 'bouncing'). Then it checks for all four corners making collisions
-           with the bricks, in which case the brick is deleted from _wall.
-           Finally, it checks to see if _wall is empty, when _win will change to True'''
-        if self._paddle.contains(self._ball.x,self._ball.y):
-            velocity = self._ball.getVy()
-            if velocity < 0:
-                self._ball.setVy(-velocity)
-                self._touchCount = self._touchCount + 1
-        elif self._paddle.contains(self._ball.x + BALL_DIAMETER, self._ball.y):
-            velocity = self._ball.getVy()
-            if velocity < 0:
-                self._ball.setVy(-velocity)
-                self._touchCount = self._touchCount + 1
-        for brick in self._wall.getBricks():
-            if brick.contains(self._ball.x,self._ball.y):
-                velocity = self._ball.getVy()
-                if velocity < 0:
-                    self._ball.setVy(-velocity)
-                self._wall.getBricks().remove(brick)
-            elif brick.contains(self._ball.x + BALL_DIAMETER,self._ball.y):
-                velocity = self._ball.getVy()
-                if velocity < 0:
-                    self._ball.setVy(-velocity)
-                self._wall.getBricks().remove(brick)
-            elif brick.contains(self._ball.x,self._ball.y + BALL_DIAMETER):
-                velocity = self._ball.getVy()
-                if velocity > 0:
-                    self._ball.setVy(-velocity)
-                self._wall.getBricks().remove(brick)
-            elif brick.contains(self._ball.x + BALL_DIAMETER,self._ball.y + BALL_DIAMETER):
-                velocity = self._ball.getVy()
-                if velocity > 0:
-                    self._ball.setVy(-velocity)
-                self._wall.getBricks().remove(brick)
-        if self._wall.getBricks() == []:
-            self._win = True    
-
+        The paddle, ball and bricks on screen are changed to match.  The same
+        snapshot can be restored any number of times.
+        
+        Precondition: snap is a State returned by snapshot (of any game).'''
+        self._sim.setState(snap)
+        self._wall.reset()
+        self._paddle.x = self._sim.getPaddle()
+        ball = self._sim.getBall()
+        if ball is None:
+            if not self._view is None and not self._ball is None:
+                self._view.detach(self._ball)
+            self._ball = None
+        elif self._ball is None:
+            self._ball = Ball(ball[0], ball[1])
+        else:
+            self._ball.setPosition(ball[0], ball[1])
+        self._showBall()
+    
     def score(self):
         '''Generates the current score in the game, which is the amount of Bricks broken'''
-        
-        score = BRICKS_IN_ROW*BRICK_ROWS - len(self._wall.getBricks())
-        return score
+        return self._sim.score()
     
     def update(self,touch):
-        '''Calls the three helper functions that move and update the ball and paddle.
+        '''Moves and updates the ball and paddle with the rules of the Simulation.
+           
+           The rules are traced as one span here rather than in Simulation, so
+           that games stepped headless do not pay for tracing.
            
-           Precondition: touch is a GPoint object received from the game's view.
+           Precondition: touch is a GPoint object received from the game's view, or None.
         '''
-        self._ball.moveBall()
-        self.updatePaddle(touch)
-        self.updateBall()
-        
-    
+        with tracing.span('Simulation.update'):
+            self._sim.update(None if touch is None else touch.x)
+        self._paddle.x = self._sim.getPaddle()
+        ball = self._sim.getBall()
+        self._ball.setPosition(ball[0], ball[1])
+        self._wall.refresh()
+        self._showBall()
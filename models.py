@@ -12,132 +12,162 @@ and individual bricks can just be instances of GRectangle.  There is no need for
 new class in the case of these objects.
 
 We only need a new class when we have to add extra features to our objects.  That
-is why we have classes for Ball and BrickWall.  Ball is usually a subclass of GEllipse,
-but it needs extra methods for movement and bouncing.  Similarly, BrickWall needs
-methods for accessing and removing individual bricks.
+is why we have classes for Ball and BrickWall.  The rules for movement, bouncing and
+removing bricks live in the headless module simulation.py; the classes here only
+draw the state of a simulation.Simulation.
 
 You are free to add new models to this module.  You may wish to do this when you add
 new features to your game.  If you are unsure about whether to make a new class or 
 not, please ask on Piazza."""
-import random # To randomly generate the ball velocity
+import numpy
 from constants import *
 from game2d import *
 
 
 class BrickWall(object):
-    """An instance represents the layer of bricks in the game.  When the wall is
-    empty, the game is over and the player has won. This model class keeps track of
-    all of the bricks in the game, allowing them to be added or removed.
+    """An instance draws the layer of bricks in the game.
     
-    INSTANCE ATTRIBUTES:
-        _bricks [list of GRectangle, can be empty]:
-            This is the list of currently active bricks in the game.  When a brick
-            is destroyed, it is removed from the list.
-    
-    As you can see, this attribute is hidden.  You may find that you want to access 
-    a brick from class Gameplay. It is okay if you do that,  but you MAY NOT 
-    ACCESS THE ATTRIBUTE DIRECTLY. You must use a getter and/or setter for any 
-    attribute that you need to access in GameController.  Only add the getters and 
-    setters that you need.
+    The bricks themselves are kept by a simulation.Wall, which has no graphics.
+    This class draws all of them with a single GBatch, which packs the bricks of
+    each row color into one mesh.  When a brick is destroyed, only its rectangle
+    in the batch is hidden; the batch is never rebuilt.  This keeps the cost of
+    drawing the wall the same no matter how many bricks there are.
     
-    We highly recommend a getter called getBrickAt(x,y).  This method returns the first
-    brick it finds for which the point (x,y) is INSIDE the brick.  This is useful for
-    collision detection (e.g. it is a helper for _getCollidingObject).
+    The wall can be drawn every frame with draw, or attached to a GView once with
+    attach.  Either way, refresh must be called after bricks are destroyed.
     
-    You will probably want a draw method too.  Otherwise, you need getters in Gameplay
-    to draw the individual bricks.
+    Making the batch is the only cost that grows with the size of the wall, so
+    it is not thrown away: when a wall is detached, its batch is kept by the
+    view (see GView.keep), and the next wall drawn in that view shows all of its
+    bricks again and uses it.  Starting a new game thus makes no new drawing.
     
-    LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    INSTANCE ATTRIBUTES:
+        _wall   [simulation.Wall]:
+            The bricks to draw.
+        _batch  [GBatch, or None if the wall was never drawn or was detached]:
+            The rectangles of all of the bricks of _wall, made (or taken from the
+            last wall detached from the view) on the first draw.
+            Rectangle i of the batch is brick i of _wall.
+        _shown  [numpy array of ints, or None if _batch is None]:
+            The indices of the bricks whose rectangle is not hidden in _batch.
+        _view   [GView, or None if not attached]:
+            The view the wall is attached to.
+    
+    As you can see, these attributes are hidden.  You may find that you want to
+    access a brick from class Gameplay. It is okay if you do that, but you MAY
+    NOT ACCESS THE ATTRIBUTE DIRECTLY. You must use a getter and/or setter for any 
+    attribute that you need to access in GameController.
     """
     
-    def getBricks(self):
-        '''Returns the list of bricks in the initial state of the game'''
-        return self._bricks
-    
-    def __init__(self):
-        '''Sets the initial state of the bricks in the game.
-        Changes the bricks x value based on its column
-        Changes the bricks y value based on its row
-        changes the bricks color based on its row'''
-        self._bricks = []
-        for x in range(0,BRICKS_IN_ROW):
-            for y in range(0,BRICK_ROWS):
-                self._bricks.append(GRectangle(x=BRICK_SEP_H/2 + x*BRICK_WIDTH
-                                    + x*BRICK_SEP_H,y=620-BRICK_Y_OFFSET - BRICK_HEIGHT*y - y*BRICK_SEP_V,width=
-                                    BRICK_WIDTH,height=BRICK_HEIGHT,linecolor = ROW_COLORS[y], fillcolor= ROW_COLORS[y]))
+    def __init__(self, wall):
+        '''Creates a drawing of the given wall.
+        
+        Precondition: wall is a simulation.Wall'''
+        self._wall = wall
+        self._batch = None
+        self._shown = None
+        self._view = None
+    
+    def _makeBatch(self, view):
+        '''Makes the GBatch for the bricks if it does not exist yet.
+        
+        The batch of the last wall detached from view is used if there is one
+        and it has a rectangle for each brick of this wall.  Otherwise a new
+        batch is made: each brick gets a rectangle LINE_SIZE
+        larger on every side than the brick, as its border is the same color as
+        its interior.  The bricks color is based on its row.  The frames come
+        from the wall, so they are trusted.
+        
+        Precondition: view is a GView'''
+        if not self._batch is None:
+            return
+        spare = view.take(BrickWall)
+        if not spare is None and len(spare[0].colors) == self._wall.getSize():
+            self._batch, self._shown = spare
+            self.reset()
+            return
+        frames = []
+        colors = []
+        for i in range(self._wall.getSize()):
+            left, bottom, right, top = self._wall.getBrick(i)
+            frames.append((left-LINE_SIZE,bottom-LINE_SIZE,
+                           right-left+2*LINE_SIZE,top-bottom+2*LINE_SIZE))
+            colors.append(ROW_COLORS[(i // BRICKS_IN_ROW) % len(ROW_COLORS)])
+        self._batch = GBatch.trusted(frames=frames,colors=colors)
+        self._shown = numpy.arange(self._wall.getSize())
+        self.refresh()
+    
+    def refresh(self):
+        '''Hides the bricks destroyed since the last refresh
+        
+        This only looks at the bricks if some were destroyed.  The bricks are
+        hidden in one batch, so each mesh is sent to the backend once.'''
+        if self._batch is None or self._wall.getCount() == len(self._shown):
+            return
+        alive = self._wall.getAlive()
+        with self._batch.batch():
+            for i in numpy.setdiff1d(self._shown, alive):
+                self._batch.hide(i)
+        self._shown = alive
+    
+    def reset(self):
+        '''Shows every brick in the wall and hides all the others
+        
+        Unlike refresh, this also shows bricks that were put back in the wall,
+        as when a game is restored from a snapshot.'''
+        if self._batch is None:
+            return
+        alive = self._wall.getAlive()
+        if len(alive) == self._wall.getSize():
+            self._batch.showAll()
+        else:
+            with self._batch.batch():
+                for i in numpy.setdiff1d(self._shown, alive):
+                    self._batch.hide(i)
+                for i in numpy.setdiff1d(alive, self._shown):
+                    self._batch.show(i)
+        self._shown = alive
+    
+    def attach(self,view):
+        '''Attaches the wall to the view
+        
+        Precondition: view is a GView'''
+        self._makeBatch(view)
+        self._view = view
+        view.attach(self._batch)
+    
+    def detach(self):
+        '''Detaches the wall from the view it is attached to, if any
+        
+        The batch is kept by the view for the next wall (see _makeBatch).'''
+        if self._view is None:
+            return
+        self._view.detach(self._batch)
+        self._view.keep(BrickWall, (self._batch, self._shown))
+        self._batch = None
+        self._shown = None
+        self._view = None
     
     def draw(self,view):
         '''Draws the bricks'''
-        for x in self._bricks:
-            x.draw(view)
+        self._makeBatch(view)
+        self.refresh()
+        self._batch.draw(view)
     
 
 class Ball(GEllipse):
     """Instance is a game ball.
     
-    We extend GEllipse because a ball must have additional attributes for velocity.
-    This class adds this attributes and manages them.
-    
-    INSTANCE ATTRIBUTES:
-        _vx [int or float]: Velocity in x direction 
-        _vy [int or float]: Velocity in y direction 
-    
-    The class Gameplay will need to look at these attributes, so you will need
-    getters for them.  However, it is possible to write this assignment with no
-    setters for the velocities.
-    
-    How? The only time the ball can change velocities is if it hits an obstacle
-    (paddle or brick) or if it hits a wall.  Why not just write methods for these
-    instead of using setters?  This cuts down on the amount of code in Gameplay.
-    
-    In addition you must add the following methods in this class: an __init__
-    method to set the starting velocity and a method to "move" the ball.  The
-    __init__ method will need to use the __init__ from GEllipse as a helper.
-    The move method should adjust the ball position according to  the velocity.
-    
-    NOTE: The ball does not have to be a GEllipse. It could be an instance
-    of GImage (why?). This change is allowed, but you must modify the class
-    header up above.
-    
-    LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    We extend GEllipse to draw the ball.  The position and velocity of the ball
+    are part of the rules of the game, so they are kept by simulation.Simulation.
+    Gameplay moves this ellipse to match the simulation after every update.
+    It adds no attributes, so it keeps the compact slots of GEllipse.
     """
     
-    def __init__(self):
-        '''Creates the ball and its initial location
-        Creates the ball's initial velocity in the x and y direction
-        Velocity x direction is randomized so it does not fall the same
-        way each time.'''
-        
-        GEllipse.__init__(self,x = GAME_WIDTH/2 - BALL_DIAMETER/2,y = GAME_HEIGHT/2,width = BALL_DIAMETER,height = BALL_DIAMETER,fillcolor = colormodel.RED)
-        self._vy = -5.0
-        self._vx = random.uniform(1.0,5.0)
-        self._vx = self._vx * random.choice([-1.0, 1.0])
-        
-    def getVy(self):
-        '''Returns: the velocity in the y direction'''
-        return self._vy
-    
-    def getVx(self):
-        '''Returns: the velocity in the x direction'''
-        return self._vx
-    
-    def setVy(self, v):
-        '''Sets the velocity in the y direction equal to v
-        
-        Precondition: v is a float.
-        '''
-        self._vy = v
-        
-    def setVx(self, v):
-        '''Sets the velocity in the x direction equal to v
-        
-        Precondition: v is a float.
-        '''
-        self._vx = v
+    __slots__ = ()
     
-    def moveBall(self):
-        '''Changes the y position of the ball with respect to the y-velocity
-        Changes the x position of the ball with respect to the x-velocity'''
+    def __init__(self, x, y):
+        '''Creates the ball at the given location
         
-        self.x = self.x + self._vx
-        self.y = self.y + self._vy
\ No newline at end of file
+        Precondition: x and y are floats, the bottom left corner of the ball.'''
+        GEllipse.__init__(self,x = x,y = y,width = BALL_DIAMETER,height = BALL_DIAMETER,fillcolor = colormodel.RED)
@@ -0,0 +1,114 @@
+# perf.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Frame time statistics for game2d
+
+This module keeps statistics on the animation frames of a GameApp: how long
+each phase of a frame took, how many simulation ticks it ran, and how many
+drawing instructions it sent to the canvas.  The last STATS_SIZE frames are
+kept in a ring buffer, so the memory used is fixed however long the game runs,
+and percentiles are computed over that window when they are asked for.
+
+This module does not use Kivy; GameApp feeds it the timings.  See the keywords
+stats and overlay of GameApp to turn it on."""
+import numpy
+
+#: the number of frames kept by a FrameStats
+STATS_SIZE = 600
+#: the phases of a frame: clearing the view, the updates, drawing, and the whole frame
+PHASES = ('redraw', 'update', 'draw', 'frame')
+#: the percentiles given by FrameStats.getSummary
+PERCENTILES = (50, 95, 99)
+
+
+class FrameStats(object):
+    """An instance keeps the timings of the last frames of a game.
+
+    Each frame is added with the method record.  The times of each phase are
+    kept in seconds in a numpy array with one row per phase, used as a ring
+    buffer: once it is full, each new frame replaces the oldest one.
+
+    INSTANCE ATTRIBUTES:
+        _times   [numpy array of floats, shape (len(PHASES), size)]:
+            the time of each phase of the frames kept, in seconds
+        _ticks   [numpy array of ints]: the number of updates of each frame kept
+        _drawn   [numpy array of ints]: the drawing instructions of each frame kept
+        _next    [int >= 0]: the position in the ring buffer of the next frame
+        _frames  [int >= 0]: the number of frames recorded in all
+    """
+
+    def __init__(self, size=STATS_SIZE):
+        '''Creates empty statistics keeping the last size frames.
+
+        Precondition: size is an int > 0.'''
+        assert type(size) == int and size > 0, repr(size)+' is not a positive int'
+        self._times = numpy.zeros((len(PHASES), size))
+        self._ticks = numpy.zeros(size, dtype=int)
+        self._drawn = numpy.zeros(size, dtype=int)
+        self._next = 0
+        self._frames = 0
+
+    def getFrames(self):
+        '''Returns: the number of frames recorded since these statistics were made'''
+        return self._frames
+
+    def getSize(self):
+        '''Returns: the number of frames kept (at most the size of the ring buffer)'''
+        return min(self._frames, self._times.shape[1])
+
+    def record(self, redraw, update, draw, frame, ticks, drawn):
+        '''Adds a frame to the statistics.
+
+        Precondition: redraw, update, draw and frame are the times of the phases
+        of the frame in seconds (floats); ticks is the number of updates run and
+        drawn the number of drawing instructions sent (ints).'''
+        k = self._next
+        self._times[0, k] = redraw
+        self._times[1, k] = update
+        self._times[2, k] = draw
+        self._times[3, k] = frame
+        self._ticks[k] = ticks
+        self._drawn[k] = drawn
+        self._next = (k + 1) % self._times.shape[1]
+        self._frames = self._frames + 1
+
+    def percentile(self, phase, q):
+        '''Returns: the q-th percentile of the time of a phase over the frames kept,
+        in seconds, or 0.0 if no frame was recorded.
+
+        Precondition: phase is one of PHASES; q is a number in 0..100.'''
+        size = self.getSize()
+        if size == 0:
+            return 0.0
+        return float(numpy.percentile(self._times[PHASES.index(phase), :size], q))
+
+    def getSummary(self):
+        '''Returns: a dict of the statistics of the frames kept.
+
+        For every phase p and every q in PERCENTILES, the key p+' p'+str(q) (as in
+        'frame p95') has the percentile of its time in milliseconds.  The key
+        'frames' has the number of frames kept, 'ticks' the mean updates per frame,
+        and 'instructions p50', 'instructions p99' and 'instructions max' the
+        drawing instructions per frame.'''
+        size = self.getSize()
+        result = {'frames': size}
+        if size == 0:
+            return result
+        for row in range(len(PHASES)):
+            times = numpy.percentile(self._times[row, :size], PERCENTILES)*1000
+            for q, time in zip(PERCENTILES, times):
+                result[PHASES[row]+' p'+str(q)] = float(time)
+        result['ticks'] = float(self._ticks[:size].mean())
+        result['instructions p50'] = float(numpy.percentile(self._drawn[:size], 50))
+        result['instructions p99'] = float(numpy.percentile(self._drawn[:size], 99))
+        result['instructions max'] = int(self._drawn[:size].max())
+        return result
+
+    def getText(self):
+        '''Returns: a short summary of the statistics, for showing on screen'''
+        summary = self.getSummary()
+        if summary['frames'] == 0:
+            return 'no frames'
+        return ('frame %.1f/%.1f/%.1f ms  update %.1f  draw %.1f  instr %d' %
+                (summary['frame p50'], summary['frame p95'], summary['frame p99'],
+                 summary['update p95'], summary['draw p95'], summary['instructions p99']))
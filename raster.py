@@ -0,0 +1,645 @@
+# raster.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Software rasterizer for game2d
+
+This module has RasterBackend, a render backend (see Backend in game2d.py) that
+draws the shapes of a GView into a numpy array of RGB pixels instead of a
+window.  It needs no display and no GPU, so a game run with GameApp.runFrames
+can give pixel observations to an agent, or screenshots to compare.
+
+Drawing is incremental.  Every change to an instruction (moving it, resizing
+it, adding it to a group or removing it) marks the rectangles of pixels that
+it covered and now covers as dirty, and getFrame only redraws those.  When a
+rectangle of a GBatch is hidden, only the pixels of that rectangle are dirty.
+In a frame of Breakout that means the ball, the paddle and a brick or two.
+
+Each shape is drawn with numpy over the pixels of its bounding box.  A pixel
+is inside a shape if its center is; there is no antialiasing, except in text.
+Text is drawn from glyph bitmaps, rendered once per character with pygame.font
+(which needs no display) and kept in a cache."""
+import collections
+import math
+import os
+import numpy
+from game2d import Backend, FONT_PATH, IMAGE_PATH, LABEL_CACHE_SIZE
+
+#: the most separate dirty rectangles kept; beyond that they are merged into one
+DIRTY_LIMIT = 16
+
+
+class _Command(object):
+    """An instance is a drawing instruction of a RasterBackend.
+
+    Setting an attribute tells the backend, which marks the pixels covered by
+    the instruction before and after the change as dirty.
+
+    INSTANCE ATTRIBUTES:
+        kind     [str]: 'color', 'rectangle', 'ellipse', 'line' or 'mesh'
+        _backend [RasterBackend]: the backend that made this instruction
+
+    A color has the attribute rgba; a rectangle pos, size, source and texture;
+    an ellipse pos and size; a line points; and a mesh vertices, indices and
+    mode, plus these attributes kept up to date from them:
+        _points    [numpy array of floats, shape (n,2)]: the position of each vertex
+        _triangles [numpy array of ints, shape (k,3)]: the vertices of each triangle
+        _extent    [tuple, or None]: the box around the triangles (see _box)
+    """
+
+    def __init__(self, backend, kind, **keywords):
+        '''Creates an instruction of the given kind and attributes for backend.
+
+        Precondition: backend is a RasterBackend; kind is one of the kinds above,
+        and keywords are its attributes.'''
+        self.__dict__['_backend'] = backend
+        self.__dict__['kind'] = kind
+        self.__dict__.update(keywords)
+        if kind == 'mesh':
+            self._reshape(_positions(keywords['vertices']))
+
+    def __setattr__(self, name, value):
+        if self.kind == 'mesh' and name == 'vertices':
+            self._backend._moveMesh(self, value)
+        elif self.kind == 'color':
+            self.__dict__[name] = value
+            self._backend._changeAll()
+        else:
+            self._backend._change(self)
+            self.__dict__[name] = value
+            if self.kind == 'mesh':
+                self._reshape(_positions(self.vertices))
+            self._backend._change(self)
+
+    def __repr__(self):
+        return '_Command(' + repr(self.kind) + ')'
+
+    def _reshape(self, points, triangles=None):
+        '''Sets the vertices of this mesh to points, and its triangles to triangles.
+
+        If triangles is None, they are made again from the indices and the mode.
+
+        Precondition: this is a mesh; points is a numpy array of floats of shape
+        (n,2); triangles is a numpy array of ints of shape (k,3) or None.'''
+        if triangles is None:
+            triangles = _triangles(len(points), self.indices, self.mode)
+        self.__dict__['_points'] = points
+        self.__dict__['_triangles'] = triangles
+        self.__dict__['_extent'] = _box(points[triangles.ravel()])
+
+
+class _Group(object):
+    """An instance is a group of instructions of a RasterBackend.
+
+    INSTANCE ATTRIBUTES:
+        children [list]: the instructions and groups in this group, in drawing order
+        _backend [RasterBackend]: the backend that made this group
+    """
+
+    def __init__(self, backend):
+        '''Creates an empty group for backend.
+
+        Precondition: backend is a RasterBackend.'''
+        self.children = []
+        self._backend = backend
+
+    def add(self, cmd):
+        '''Adds cmd at the end of this group.
+
+        Precondition: cmd is an instruction or a group of the same backend.'''
+        self.children.append(cmd)
+        self._backend._reorder(cmd)
+
+    def remove(self, cmd):
+        '''Removes cmd from this group, if it is in it.
+
+        Precondition: cmd is an instruction or a group of the same backend.'''
+        if cmd in self.children:
+            self.children.remove(cmd)
+            self._backend._reorder(cmd)
+
+    def clear(self):
+        '''Removes everything from this group.'''
+        children = self.children
+        self.children = []
+        for cmd in children:
+            self._backend._reorder(cmd)
+
+
+class _Texture(object):
+    """An instance is a text texture of a RasterBackend.
+
+    INSTANCE ATTRIBUTES:
+        size  [tuple]: the width and height of the texture, in pixels
+        alpha [numpy array of floats, shape (height,width)]: the coverage of each
+              pixel by the text, from 0 to 1; row 0 is the bottom
+        rgba  [list of 4 floats]: the color of the text
+    """
+
+    def __init__(self, alpha, rgba):
+        '''Creates a texture with the given coverage and color.
+
+        Precondition: alpha is a 2d numpy array of floats in 0..1; rgba is a list
+        of 4 floats in 0..1.'''
+        self.alpha = alpha
+        self.rgba = rgba
+        self.size = (alpha.shape[1], alpha.shape[0])
+
+
+def _positions(vertices):
+    '''Returns: the x and y of each vertex of a mesh, as a numpy array of shape (n,2).
+
+    Precondition: vertices is a sequence of numbers, x, y, u, v for each vertex.'''
+    return numpy.array(vertices, dtype=float).reshape(-1, 4)[:, :2]
+
+
+def _triangles(count, indices, mode):
+    '''Returns: the vertices of each triangle of a mesh, as a numpy array of shape (k,3).
+
+    Precondition: count is the number of vertices; indices is a sequence of ints in
+    0..count-1; mode is 'triangles', 'triangle_strip' or 'triangle_fan'.'''
+    indices = numpy.array(indices, dtype=int)
+    if mode == 'triangles':
+        return indices[:len(indices)//3*3].reshape(-1, 3)
+    if len(indices) < 3:
+        return numpy.zeros((0, 3), dtype=int)
+    k = numpy.arange(len(indices) - 2)
+    if mode == 'triangle_strip':
+        return numpy.stack([indices[k], indices[k+1], indices[k+2]], axis=1)
+    return numpy.stack([numpy.full(len(k), indices[0]), indices[k+1], indices[k+2]], axis=1)
+
+
+def _bounds(cmd):
+    '''Returns: the box (left, bottom, right, top) covered by cmd, or None if it
+    covers nothing.
+
+    Precondition: cmd is an instruction or a group of a RasterBackend.'''
+    if isinstance(cmd, _Group):
+        boxes = [box for box in map(_bounds, cmd.children) if not box is None]
+        if len(boxes) == 0:
+            return None
+        return (min(box[0] for box in boxes), min(box[1] for box in boxes),
+                max(box[2] for box in boxes), max(box[3] for box in boxes))
+    if cmd.kind in ('rectangle', 'ellipse'):
+        x, y = cmd.pos
+        w, h = cmd.size
+        return (min(x, x+w), min(y, y+h), max(x, x+w), max(y, y+h))
+    if cmd.kind == 'line':
+        if len(cmd.points) == 0:
+            return None
+        # A line is one pixel wide
+        return (min(cmd.points[0::2])-1, min(cmd.points[1::2])-1,
+                max(cmd.points[0::2])+1, max(cmd.points[1::2])+1)
+    if cmd.kind == 'mesh':
+        return cmd._extent
+    return None
+
+
+def _box(points):
+    '''Returns: the box (left, bottom, right, top) around points, or None if there
+    are none.
+
+    Precondition: points is a numpy array of floats of shape (n,2).'''
+    if len(points) == 0:
+        return None
+    low = points.min(axis=0)
+    high = points.max(axis=0)
+    return (low[0], low[1], high[0], high[1])
+
+
+def _span(low, high, limit):
+    '''Returns: the pixels (as a range first, last+1) whose centers are in low..high,
+    clipped to 0..limit.
+
+    Precondition: low <= high are numbers; limit is an int >= 0.'''
+    first = max(int(math.ceil(low - 0.5)), 0)
+    last = min(int(math.ceil(high - 0.5)), limit)
+    return first, max(first, last)
+
+
+class RasterBackend(Backend):
+    """An instance is a backend drawing into a numpy array of RGB pixels.
+
+    Use it as the backend of a GameApp (or a GView), and call getFrame after a
+    frame to get the picture.  The pixels outside of every shape have the
+    background color.
+
+    INSTANCE ATTRIBUTES:
+        _pixels     [numpy array of uint8, shape (height,width,3)]: the picture;
+                    row 0 is the bottom of the screen
+        _frame      [numpy array of uint8]: a read-only view of _pixels with row 0
+                    at the top, as returned by getFrame
+        _background [numpy array of floats]: the background color, from 0 to 255
+        _canvas     [_Group]: the group drawn by the view
+        _order      [list of (instruction, rgba) pairs, or None]: the instructions
+                    that draw something, in drawing order, with the color of each;
+                    None if the groups changed since it was made
+        _dirty      [list of tuples]: the boxes (left, bottom, right, top) of
+                    pixels to redraw, in pixels
+        _redrawn    [int >= 0]: the number of pixels redrawn by the last getFrame
+        _textures   [OrderedDict]: the text textures used most recently
+        _glyphs     [dict]: the coverage of each character, by font, size and bold
+        _fonts      [dict]: the pygame fonts, by font name, size and bold
+        _images     [dict]: the pixels of each image file, by name
+    """
+
+    def __init__(self, width, height, background=(1.0, 1.0, 1.0)):
+        '''Creates a backend drawing into a picture of the given size.
+
+        Precondition: width and height are ints > 0; background is a color
+        (a sequence of 3 floats in 0..1).'''
+        assert type(width) == int and width > 0, repr(width)+' is not a positive int'
+        assert type(height) == int and height > 0, repr(height)+' is not a positive int'
+        self._background = numpy.array(background[:3], dtype=float)*255
+        self._pixels = numpy.empty((height, width, 3), dtype=numpy.uint8)
+        self._pixels[:] = numpy.round(self._background)
+        self._frame = self._pixels[::-1]
+        self._frame.flags.writeable = False
+        self._canvas = _Group(self)
+        self._order = []
+        self._dirty = []
+        self._redrawn = 0
+        self._textures = collections.OrderedDict()
+        self._glyphs = {}
+        self._fonts = {}
+        self._images = {}
+
+    def getFrame(self):
+        '''Returns: the picture, after redrawing the pixels that changed.
+
+        The result is a read-only numpy array of uint8 of shape (height, width, 3),
+        with row 0 at the top of the screen.  It is a view that changes with
+        every call to getFrame; copy it to keep it.'''
+        self._render()
+        return self._frame
+
+    def getRedrawn(self):
+        '''Returns: the number of pixels redrawn by the last call to getFrame'''
+        return self._redrawn
+
+    # BACKEND INTERFACE
+    def color(self, r, g, b, a=1.0):
+        return _Command(self, 'color', rgba=[r, g, b, a])
+
+    def rectangle(self, pos, size, source=None, texture=None):
+        return _Command(self, 'rectangle', pos=pos, size=size, source=source, texture=texture)
+
+    def ellipse(self, pos, size):
+        return _Command(self, 'ellipse', pos=pos, size=size)
+
+    def line(self, points):
+        return _Command(self, 'line', points=points)
+
+    def mesh(self, vertices, indices, mode):
+        return _Command(self, 'mesh', vertices=vertices, indices=indices, mode=mode)
+
+    def group(self):
+        return _Group(self)
+
+    def text(self, text, font_name, font_size, bold, color):
+        key = (text, font_name, font_size, bold, tuple(color))
+        if key in self._textures:
+            self._textures.move_to_end(key)
+            return self._textures[key]
+        font = self._font(font_name, font_size, bold)
+        glyphs = [self._glyph(font, char, key[1:4]) for char in text]
+        if len(glyphs) == 0:
+            alpha = numpy.zeros((font.get_height(), 0))
+        else:
+            alpha = numpy.hstack(glyphs)
+        texture = _Texture(alpha, list(color))
+        self._textures[key] = texture
+        if len(self._textures) > LABEL_CACHE_SIZE:
+            self._textures.popitem(last=False)
+        return texture
+
+    @property
+    def canvas(self):
+        return self._canvas
+
+    # CHANGES
+    def _change(self, cmd):
+        '''Marks the pixels covered by cmd as dirty.
+
+        Precondition: cmd is an instruction or a group of this backend.'''
+        self._mark(_bounds(cmd))
+
+    def _changeAll(self):
+        '''Marks every pixel as dirty (used when a color changes)'''
+        height, width = self._pixels.shape[:2]
+        self._order = None
+        self._dirty = [(0, 0, width, height)]
+
+    def _reorder(self, cmd):
+        '''Marks the pixels of cmd as dirty after it was added to or removed from a group.
+
+        Precondition: cmd is an instruction or a group of this backend.'''
+        self._order = None
+        self._change(cmd)
+
+    def _moveMesh(self, mesh, vertices):
+        '''Sets the vertices of mesh, marking only the triangles that moved as dirty.
+
+        Precondition: mesh is a mesh of this backend; vertices is a sequence of
+        numbers, x, y, u, v for each vertex.'''
+        points = _positions(vertices)
+        if points.shape != mesh._points.shape:
+            self._change(mesh)
+            mesh.__dict__['vertices'] = vertices
+            mesh._reshape(points)
+            self._change(mesh)
+            return
+        moved = (points != mesh._points).any(axis=1)
+        triangles = mesh._triangles[moved[mesh._triangles].any(axis=1)]
+        self._mark(_box(mesh._points[triangles.ravel()]))
+        self._mark(_box(points[triangles.ravel()]))
+        mesh.__dict__['vertices'] = vertices
+        mesh._reshape(points, mesh._triangles)
+
+    def _mark(self, box):
+        '''Adds the pixels of box to the dirty ones.
+
+        Precondition: box is a tuple (left, bottom, right, top) of numbers, or None.'''
+        if box is None:
+            return
+        height, width = self._pixels.shape[:2]
+        left = max(int(math.floor(box[0])), 0)
+        bottom = max(int(math.floor(box[1])), 0)
+        right = min(int(math.ceil(box[2])) + 1, width)
+        top = min(int(math.ceil(box[3])) + 1, height)
+        if left >= right or bottom >= top:
+            return
+        # Merge the box with the dirty boxes it touches, so no pixel is redrawn twice
+        merged = True
+        while merged:
+            merged = False
+            for d in self._dirty:
+                if d[0] <= right and left <= d[2] and d[1] <= top and bottom <= d[3]:
+                    self._dirty.remove(d)
+                    left, bottom = min(left, d[0]), min(bottom, d[1])
+                    right, top = max(right, d[2]), max(top, d[3])
+                    merged = True
+                    break
+        self._dirty.append((left, bottom, right, top))
+        if len(self._dirty) > DIRTY_LIMIT:
+            dirty = self._dirty
+            self._dirty = [(min(d[0] for d in dirty), min(d[1] for d in dirty),
+                            max(d[2] for d in dirty), max(d[3] for d in dirty))]
+
+    # DRAWING
+    def _render(self):
+        '''Redraws the dirty pixels'''
+        self._redrawn = 0
+        if len(self._dirty) == 0:
+            return
+        if self._order is None:
+            self._order = []
+            self._flatten(self._canvas, [1.0, 1.0, 1.0, 1.0])
+        boxes = [_bounds(cmd) for cmd, rgba in self._order]
+        for clip in self._dirty:
+            left, bottom, right, top = clip
+            self._pixels[bottom:top, left:right] = numpy.round(self._background)
+            self._redrawn += (right-left)*(top-bottom)
+            for (cmd, rgba), box in zip(self._order, boxes):
+                if (not box is None and box[0] < right and box[2] > left and
+                    box[1] < top and box[3] > bottom):
+                    self._draw(cmd, rgba, clip)
+        self._dirty = []
+
+    def _flatten(self, group, rgba):
+        '''Adds the instructions in group to _order, and returns the color after them.
+
+        As in Kivy, a color applies to everything after it, even in other groups.
+
+        Precondition: group is a group of this backend; rgba is the current color.'''
+        for cmd in group.children:
+            if isinstance(cmd, _Group):
+                rgba = self._flatten(cmd, rgba)
+            elif cmd.kind == 'color':
+                rgba = cmd.rgba
+            else:
+                self._order.append((cmd, rgba))
+        return rgba
+
+    def _draw(self, cmd, rgba, clip):
+        '''Draws cmd in the color rgba, only in the pixels of clip.
+
+        Precondition: cmd is an instruction of this backend that is not a color;
+        rgba is a list of 4 floats; clip is a box (left, bottom, right, top) of ints.'''
+        if cmd.kind == 'rectangle':
+            if not cmd.texture is None:
+                self._drawTexture(cmd, rgba, clip)
+            elif not cmd.source is None:
+                self._drawImage(cmd, rgba, clip)
+            else:
+                self._drawRectangle(cmd, rgba, clip)
+        elif cmd.kind == 'ellipse':
+            self._drawEllipse(cmd, rgba, clip)
+        elif cmd.kind == 'line':
+            self._drawLine(cmd, rgba, clip)
+        elif cmd.kind == 'mesh':
+            self._drawMesh(cmd, rgba, clip)
+
+    def _area(self, box, clip):
+        '''Returns: the pixels with their center in box and in clip, as a tuple
+        (xs, ys) of ranges, or None if there are none.
+
+        Precondition: box is a box (left, bottom, right, top) of numbers; clip is a
+        box of ints.'''
+        x0, x1 = _span(box[0], box[2], clip[2])
+        y0, y1 = _span(box[1], box[3], clip[3])
+        x0 = max(x0, clip[0])
+        y0 = max(y0, clip[1])
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return (range(x0, x1), range(y0, y1))
+
+    def _paint(self, xs, ys, rgb, alpha, mask=None):
+        '''Blends the color rgb into the pixels xs, ys.
+
+        Precondition: xs and ys are ranges of pixels; rgb is a color (3 floats in
+        0..1, or a numpy array of them per pixel); alpha is the opacity (a float,
+        or a numpy array per pixel); mask is a numpy array of bools saying which
+        pixels to paint, or None for all of them.'''
+        region = self._pixels[ys.start:ys.stop, xs.start:xs.stop]
+        rgb = numpy.asarray(rgb, dtype=float)*255
+        if numpy.isscalar(alpha) and alpha >= 1.0 and rgb.ndim == 1:
+            if mask is None:
+                region[:] = numpy.round(rgb)
+            else:
+                region[mask] = numpy.round(rgb)
+            return
+        alpha = numpy.broadcast_to(numpy.asarray(alpha, dtype=float), region.shape[:2])
+        if not mask is None:
+            alpha = alpha*mask
+        alpha = alpha[..., None]
+        region[:] = numpy.round(region*(1-alpha) + rgb*alpha)
+
+    def _drawRectangle(self, cmd, rgba, clip):
+        '''Fills the rectangle cmd (see _draw)'''
+        if rgba[3] <= 0:
+            return
+        area = self._area(_bounds(cmd), clip)
+        if not area is None:
+            self._paint(area[0], area[1], rgba[:3], rgba[3])
+
+    def _drawEllipse(self, cmd, rgba, clip):
+        '''Fills the ellipse cmd (see _draw)'''
+        box = _bounds(cmd)
+        area = self._area(box, clip)
+        if rgba[3] <= 0 or area is None or box[2] == box[0] or box[3] == box[1]:
+            return
+        xs, ys = area
+        cx = (box[0]+box[2])/2
+        cy = (box[1]+box[3])/2
+        dx = ((numpy.arange(xs.start, xs.stop)+0.5-cx)/((box[2]-box[0])/2))**2
+        dy = ((numpy.arange(ys.start, ys.stop)+0.5-cy)/((box[3]-box[1])/2))**2
+        self._paint(xs, ys, rgba[:3], rgba[3], dy[:, None] + dx[None, :] <= 1.0)
+
+    def _drawLine(self, cmd, rgba, clip):
+        '''Draws the closed line cmd, one pixel wide (see _draw)'''
+        if rgba[3] <= 0 or len(cmd.points) < 4:
+            return
+        points = numpy.array(cmd.points, dtype=float).reshape(-1, 2)
+        ends = numpy.roll(points, -1, axis=0)
+        xs = []
+        ys = []
+        for start, end in zip(points, ends):
+            steps = int(max(abs(end[0]-start[0]), abs(end[1]-start[1]))) + 1
+            t = numpy.linspace(0.0, 1.0, steps+1)
+            xs.append(numpy.floor(start[0] + (end[0]-start[0])*t).astype(int))
+            ys.append(numpy.floor(start[1] + (end[1]-start[1])*t).astype(int))
+        xs = numpy.concatenate(xs)
+        ys = numpy.concatenate(ys)
+        inside = (clip[0] <= xs) & (xs < clip[2]) & (clip[1] <= ys) & (ys < clip[3])
+        xs = xs[inside]
+        ys = ys[inside]
+        if len(xs) == 0:
+            return
+        area = (range(xs.min(), xs.max()+1), range(ys.min(), ys.max()+1))
+        mask = numpy.zeros((len(area[1]), len(area[0])), dtype=bool)
+        mask[ys-area[1].start, xs-area[0].start] = True
+        self._paint(area[0], area[1], rgba[:3], rgba[3], mask)
+
+    def _drawMesh(self, cmd, rgba, clip):
+        '''Fills the triangles of the mesh cmd (see _draw)'''
+        if rgba[3] <= 0 or len(cmd._triangles) == 0:
+            return
+        corners = cmd._points[cmd._triangles]
+        low = corners.min(axis=1)
+        high = corners.max(axis=1)
+        a, b, c = corners[:, 0], corners[:, 1], corners[:, 2]
+        area = (b[:, 0]-a[:, 0])*(c[:, 1]-a[:, 1]) - (b[:, 1]-a[:, 1])*(c[:, 0]-a[:, 0])
+        near = ((area != 0) & (low[:, 0] < clip[2]) & (high[:, 0] > clip[0]) &
+                (low[:, 1] < clip[3]) & (high[:, 1] > clip[1]))
+        for k in numpy.flatnonzero(near):
+            box = (low[k, 0], low[k, 1], high[k, 0], high[k, 1])
+            pixels = self._area(box, clip)
+            if pixels is None:
+                continue
+            xs, ys = pixels
+            px = (numpy.arange(xs.start, xs.stop)+0.5)[None, :]
+            py = (numpy.arange(ys.start, ys.stop)+0.5)[:, None]
+            inside = None
+            for p, q in ((a[k], b[k]), (b[k], c[k]), (c[k], a[k])):
+                edge = (q[0]-p[0])*(py-p[1]) - (q[1]-p[1])*(px-p[0])
+                side = edge >= 0 if area[k] > 0 else edge <= 0
+                inside = side if inside is None else inside & side
+            self._paint(xs, ys, rgba[:3], rgba[3], inside)
+
+    def _drawTexture(self, cmd, rgba, clip):
+        '''Draws the text texture of the rectangle cmd (see _draw)'''
+        texture = cmd.texture
+        area = self._area(_bounds(cmd), clip)
+        if area is None or texture.size[0] == 0 or texture.size[1] == 0:
+            return
+        xs, ys = area
+        alpha = self._sample(texture.alpha, cmd, xs, ys)
+        color = numpy.array(texture.rgba[:3])*rgba[:3]
+        self._paint(xs, ys, color, alpha*texture.rgba[3]*rgba[3])
+
+    def _drawImage(self, cmd, rgba, clip):
+        '''Draws the image file of the rectangle cmd (see _draw)'''
+        area = self._area(_bounds(cmd), clip)
+        if area is None:
+            return
+        xs, ys = area
+        image = self._image(cmd.source)
+        colors = self._sample(image, cmd, xs, ys)
+        self._paint(xs, ys, colors[..., :3]*rgba[:3], colors[..., 3]*rgba[3])
+
+    def _sample(self, image, cmd, xs, ys):
+        '''Returns: image stretched over the rectangle cmd, at the pixels xs, ys.
+
+        The pixels nearest to each pixel center are taken.
+
+        Precondition: image is a numpy array with row 0 at the bottom; cmd is a
+        rectangle; xs and ys are ranges of pixels in it.'''
+        x, y = cmd.pos
+        w, h = cmd.size
+        u = ((numpy.arange(xs.start, xs.stop)+0.5-x)/w*image.shape[1]).astype(int)
+        v = ((numpy.arange(ys.start, ys.stop)+0.5-y)/h*image.shape[0]).astype(int)
+        u = numpy.clip(u, 0, image.shape[1]-1)
+        v = numpy.clip(v, 0, image.shape[0]-1)
+        return image[v[:, None], u[None, :]]
+
+    # RESOURCES
+    def _font(self, font_name, font_size, bold):
+        '''Returns: the pygame font with the given name, size and boldness.
+
+        The name is looked up in the Fonts folder, with or without the extension
+        .ttf.  Any other name (such as Kivy's 'Roboto') gets pygame's default font.
+
+        Precondition: font_name is a string; font_size is a number > 0; bold is a bool.'''
+        key = (font_name, font_size, bold)
+        if not key in self._fonts:
+            import pygame.font
+            if not pygame.font.get_init():
+                pygame.font.init()
+            path = None
+            for name in (font_name, font_name+'.ttf'):
+                if os.path.isfile(os.path.join(FONT_PATH, name)):
+                    path = os.path.join(FONT_PATH, name)
+                    break
+            font = pygame.font.Font(path, max(1, int(round(font_size))))
+            font.set_bold(bold)
+            self._fonts[key] = font
+        return self._fonts[key]
+
+    def _glyph(self, font, char, key):
+        '''Returns: the coverage of char in font, as a numpy array of floats with
+        row 0 at the bottom.
+
+        Precondition: font is a pygame font; char is a string of length 1; key is
+        the tuple (font_name, font_size, bold) of the font.'''
+        key = (char,) + key
+        if not key in self._glyphs:
+            import pygame.surfarray
+            surface = font.render(char, True, (255, 255, 255))
+            alpha = pygame.surfarray.array_alpha(surface).T[:font.get_height()]
+            # Glyphs are aligned at the top, so pad them to the height of the font
+            glyph = numpy.zeros((font.get_height(), alpha.shape[1]))
+            glyph[:alpha.shape[0]] = alpha/255
+            self._glyphs[key] = glyph[::-1].copy()
+        return self._glyphs[key]
+
+    def _image(self, source):
+        '''Returns: the pixels of the image file source as a numpy array of floats
+        in 0..1, of shape (height, width, 4), with row 0 at the bottom.
+
+        Images are loaded once, with pygame.image.
+
+        Precondition: source is the name of an image file, in the Images folder
+        or with its whole path.'''
+        if not source in self._images:
+            import pygame.image
+            import pygame.surfarray
+            path = source if os.path.isabs(source) else os.path.join(IMAGE_PATH, source)
+            surface = pygame.image.load(path)
+            rgb = pygame.surfarray.array3d(surface)
+            try:
+                alpha = pygame.surfarray.array_alpha(surface)
+            except ValueError:
+                alpha = numpy.full(rgb.shape[:2], 255)
+            image = numpy.dstack([rgb, alpha]).transpose(1, 0, 2)[::-1]
+            self._images[source] = numpy.ascontiguousarray(image, dtype=float)/255
+        return self._images[source]
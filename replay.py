@@ -0,0 +1,476 @@
+# replay.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Recording and replay module for Breakout
+
+This module saves the input of a Breakout session to a compact binary file, and
+plays such a file back without graphics.  The rules of the game are
+deterministic once the ball serves are known, so the input is all we need to
+save: the mouse position at every update, and the seed of the random generator
+of every game.  Replays are used to reproduce bugs and to check that a change
+to the physics does not change old games.
+
+A replay file starts with a header: the bytes MAGIC, the format VERSION and the
+brick layout (BRICKS_IN_ROW and BRICK_ROWS), as the struct HEADER.  Then there
+is one record for every call the controller made to its Gameplay.  A record is
+a single opcode byte:
+
+    OP_GAME     a new game, followed by its seed (a signed 64 bit int)
+    OP_PADDLE   the paddle was moved, as in Gameplay.updatePaddle
+    OP_UPDATE   the game was updated, as in Gameplay.update
+    OP_SERVE    a ball was served, as in Gameplay.createBall
+    OP_KEYFRAME the whole state of the game, followed by a keyframe
+
+The opcodes OP_PADDLE and OP_UPDATE have the bit TOUCH set if the mouse was
+pressed, and are then followed by its x coordinate (a double).  All numbers are
+little-endian.
+
+Every KEYFRAME_INTERVAL records of a game, a keyframe saves its whole state:
+the record number (as FRAME), the Simulation attributes (as STATE), the bricks
+(one bit each) and the state of the random generator (as RNG).  Keyframes are
+not counted as records of the game.
+
+When a file is closed, an index of the games and keyframes is added at its end,
+and then the struct TRAILER (the offset of the index and INDEX_MAGIC).  The
+index lets a Replay seek to any record of any game by loading the keyframe
+before it and playing at most KEYFRAME_INTERVAL records, however long the file
+is.  A file without an index (say, if the game crashed) can still be read; it
+is just scanned once when opened.
+
+Files are written by a Recorder, which buffers the records and leaves the disk
+writes to a background thread, so the game never waits on the disk.  They are
+read by a Replay, which maps the file into memory instead of reading it."""
+import bisect
+import mmap
+import queue
+import random
+import struct
+import threading
+import numpy
+from constants import *
+from simulation import *
+
+#: the first bytes of every replay file
+MAGIC = b'BRKR'
+#: the version of the file format
+VERSION = 2
+#: the header: MAGIC, VERSION, BRICKS_IN_ROW and BRICK_ROWS
+HEADER = struct.Struct('<4sHHH')
+#: a new game; followed by a seed
+OP_GAME = 0
+#: a paddle move
+OP_PADDLE = 1
+#: a game update
+OP_UPDATE = 2
+#: a ball serve
+OP_SERVE = 3
+#: a keyframe
+OP_KEYFRAME = 4
+#: the bit set in an opcode followed by a mouse position
+TOUCH = 0x80
+#: the seed of a game
+SEED = struct.Struct('<q')
+#: the x coordinate of the mouse
+POSITION = struct.Struct('<d')
+#: the number of records of a game before a keyframe
+FRAME = struct.Struct('<I')
+#: paddle, prevPaddle, last, x, y, vx, vy, prevX, prevY, the flags (1 if last is
+#: not None, 2 if serve, 4 if win), tries, touchCount and touches
+STATE = struct.Struct('<9dB3i')
+#: the version, the 625 words and the flag and value of gauss_next of random.getstate()
+RNG = struct.Struct('<i625I?d')
+#: an entry of the index for a game: offset of OP_GAME, seed, records and keyframes
+GAME = struct.Struct('<QqII')
+#: an entry of the index for a keyframe: its record number and the offset of OP_KEYFRAME
+KEYFRAME = struct.Struct('<IQ')
+#: the end of a file: the offset of its index, and INDEX_MAGIC
+TRAILER = struct.Struct('<Q4s')
+#: the last bytes of a file with an index
+INDEX_MAGIC = b'BRKI'
+#: the number of records of a game between keyframes
+KEYFRAME_INTERVAL = 600
+#: the number of bytes buffered before they are handed to the writer thread
+BUFFER_SIZE = 1 << 16
+
+
+def _packState(state):
+    '''Returns: the keyframe of a State, as bytes (without the record number).
+
+    Precondition: state is a State with the brick layout of this game.'''
+    flags = (0 if state.last is None else 1) | (2 if state.serve else 0) | (4 if state.win else 0)
+    rng = state.rng
+    return (STATE.pack(state.paddle, state.prevPaddle, 0.0 if state.last is None else state.last,
+                       state.x, state.y, state.vx, state.vy, state.prevX, state.prevY,
+                       flags, state.tries, state.touchCount, state.touches) +
+            numpy.packbits(state.alive).tobytes() +
+            RNG.pack(rng[0], *rng[1], not rng[2] is None, 0.0 if rng[2] is None else rng[2]))
+
+
+def _unpackState(data, pos):
+    '''Returns: the State saved in data at offset pos (after the record number).
+
+    Precondition: data is a bytes-like object holding a keyframe at pos.'''
+    values = STATE.unpack_from(data, pos)
+    pos = pos + STATE.size
+    size = BRICKS_IN_ROW*BRICK_ROWS
+    bits = numpy.frombuffer(data, dtype=numpy.uint8, count=(size+7)//8, offset=pos)
+    alive = numpy.unpackbits(bits)[:size].astype(bool)
+    alive.flags.writeable = False
+    pos = pos + (size+7)//8
+    rng = RNG.unpack_from(data, pos)
+    flags = values[9]
+    return State(values[0], values[1], values[2] if flags & 1 else None, bool(flags & 2),
+                 values[3], values[4], values[5], values[6], values[7], values[8],
+                 values[10], bool(flags & 4), values[11], values[12], alive,
+                 (rng[0], tuple(rng[1:626]), rng[627] if rng[626] else None))
+
+
+def _keyframe(keyframes, frame):
+    '''Returns: the last keyframe at or before the given record, as a tuple (record
+    number, offset), or None if there is none.
+
+    The keyframes are found by binary search, so this costs the same however long
+    the game is.
+
+    Precondition: keyframes is a list of (record number, offset) tuples sorted by
+    record number, as in the index of a Replay; frame is an int >= 0.'''
+    k = bisect.bisect_right(keyframes, frame, key=lambda keyframe: keyframe[0])
+    return None if k == 0 else keyframes[k-1]
+
+
+def _keyframeSize():
+    '''Returns: the number of bytes of a keyframe after its opcode'''
+    return FRAME.size + STATE.size + (BRICKS_IN_ROW*BRICK_ROWS+7)//8 + RNG.size
+
+
+class Recorder(object):
+    """An instance writes a replay file.
+
+    The records are added to a buffer in memory.  When the buffer is full, it is
+    handed to a background thread that writes it to the file, so recording costs
+    only a few bytes of memory per update.  Call close when done, or the end of
+    the replay and its index are lost.
+
+    INSTANCE ATTRIBUTES:
+        _file   [file object, or None once closed]: the file being written
+        _buffer [bytearray]: the records not yet handed to the writer thread
+        _queue  [queue.Queue]: buffers waiting to be written, ended by None
+        _thread [threading.Thread]: the thread writing the buffers
+        _size   [int >= 0]: the number of bytes recorded so far
+        _sim    [Simulation, or None before the first game]: the game recorded
+        _frames [int >= 0]: the number of records of the current game
+        _index  [list of [offset, seed, records, keyframes]]:
+            the index of the games so far, where keyframes is a list of
+            (record number, offset) tuples
+    """
+
+    def __init__(self, path):
+        '''Creates the replay file at path and writes its header.
+
+        Precondition: path is a string naming a file that can be written.'''
+        self._file = open(path, 'wb')
+        self._buffer = bytearray(HEADER.pack(MAGIC, VERSION, BRICKS_IN_ROW, BRICK_ROWS))
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write, daemon=True)
+        self._thread.start()
+        self._size = len(self._buffer)
+        self._sim = None
+        self._frames = 0
+        self._index = []
+
+    def game(self, seed, sim):
+        '''Records the start of a new game with the given seed.
+
+        The game is kept, so that its state can be saved in keyframes.
+
+        Precondition: seed is an int that fits in 64 bits (signed); sim is the
+        Simulation of the game, which has not been updated yet.'''
+        self._index.append([self._size, seed, 0, []])
+        self._sim = sim
+        self._frames = 0
+        self._add(bytes([OP_GAME]) + SEED.pack(seed))
+
+    def paddle(self, touch):
+        '''Records a paddle move.
+
+        Precondition: touch is a GPoint, or None.'''
+        self._touch(OP_PADDLE, touch)
+
+    def update(self, touch):
+        '''Records a game update.
+
+        Precondition: touch is a GPoint, or None.'''
+        self._touch(OP_UPDATE, touch)
+
+    def serve(self):
+        '''Records a ball serve.'''
+        self._add(bytes([OP_SERVE]))
+        self._count()
+
+    def close(self):
+        '''Writes the rest of the records and the index, and closes the file.
+
+        It is safe to call this more than once.'''
+        if self._file is None:
+            return
+        start = self._size
+        index = bytearray(FRAME.pack(len(self._index)))
+        for offset, seed, frames, keyframes in self._index:
+            index += GAME.pack(offset, seed, frames, len(keyframes))
+            for keyframe in keyframes:
+                index += KEYFRAME.pack(*keyframe)
+        self._add(bytes(index) + TRAILER.pack(start, INDEX_MAGIC))
+        self._flush(True)
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        self._file = None
+
+    def _touch(self, op, touch):
+        '''Adds a record with opcode op and the mouse position touch.
+
+        Precondition: op is OP_PADDLE or OP_UPDATE; touch is a GPoint, or None.'''
+        if touch is None:
+            self._add(bytes([op]))
+        else:
+            self._add(bytes([op | TOUCH]) + POSITION.pack(touch.x))
+        self._count()
+
+    def _count(self):
+        '''Counts a record of the current game, adding a keyframe if it is time.'''
+        self._frames = self._frames + 1
+        self._index[-1][2] = self._frames
+        if self._frames % KEYFRAME_INTERVAL == 0:
+            self._index[-1][3].append((self._frames, self._size))
+            self._add(bytes([OP_KEYFRAME]) + FRAME.pack(self._frames) +
+                      _packState(self._sim.getState()))
+
+    def _add(self, data):
+        '''Adds data to the buffer, handing the buffer over if it is full.
+
+        Precondition: data is a bytes object.'''
+        self._buffer += data
+        self._size = self._size + len(data)
+        self._flush()
+
+    def _flush(self, force=False):
+        '''Hands the buffer to the writer thread if it is full (or if force is True).'''
+        if force or len(self._buffer) >= BUFFER_SIZE:
+            self._queue.put(bytes(self._buffer))
+            self._buffer = bytearray()
+
+    def _write(self):
+        '''Writes the buffers in the queue to the file until it gets None.
+
+        This is the body of the writer thread.'''
+        data = self._queue.get()
+        while not data is None:
+            self._file.write(data)
+            data = self._queue.get()
+        self._file.flush()
+
+
+class Replay(object):
+    """An instance is a replay file opened for reading.
+
+    The file is mapped into memory, so only the parts that are used are read from
+    the disk.  Games are numbered from 0, and the records of a game from 1; record
+    0 is the start of the game.  The method seek makes the Simulation of a game
+    after any number of its records, starting from the keyframe before it.
+
+    INSTANCE ATTRIBUTES:
+        _file  [file object]: the replay file
+        _data  [mmap.mmap, or bytes for an empty file]: the contents of the file
+        _end   [int]: the offset of the end of the records (the index, if any)
+        _games [list of (offset, seed, records, keyframes)]:
+            the index of the games, where keyframes is a list of (record number,
+            offset) tuples
+    """
+
+    def __init__(self, path):
+        '''Opens the replay file at path and loads its index.
+
+        It raises ValueError if the file is not a replay, or was recorded with a
+        different brick layout.
+
+        Precondition: path is a string naming a file that can be read.'''
+        self._file = open(path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._data = b''
+        if len(self._data) < HEADER.size:
+            self.close()
+            raise ValueError('%s is not a Breakout replay' % repr(path))
+        magic, version, columns, rows = HEADER.unpack_from(self._data)
+        if magic != MAGIC or not version in (1, VERSION):
+            self.close()
+            raise ValueError('%s is not a Breakout replay' % repr(path))
+        if (columns, rows) != (BRICKS_IN_ROW, BRICK_ROWS):
+            self.close()
+            raise ValueError('%s was recorded with %d rows of %d bricks' % (repr(path), rows, columns))
+        self._end = len(self._data)
+        if (len(self._data) >= HEADER.size + TRAILER.size and
+            self._data[-len(INDEX_MAGIC):] == INDEX_MAGIC):
+            self._end = TRAILER.unpack_from(self._data, len(self._data) - TRAILER.size)[0]
+            self._games = self._loadIndex(self._end)
+        else:
+            self._games = self._scan()
+
+    def getGames(self):
+        '''Returns: the number of games in the file'''
+        return len(self._games)
+
+    def getSeed(self, game):
+        '''Returns: the seed of the given game
+
+        Precondition: game is an int in 0..getGames()-1'''
+        return self._games[game][1]
+
+    def getLength(self, game):
+        '''Returns: the number of records of the given game
+
+        Precondition: game is an int in 0..getGames()-1'''
+        return self._games[game][2]
+
+    def records(self, game, start=0):
+        '''Yields the records of the given game, from record start+1 on, as
+        (op, touch) tuples.
+
+        op is OP_PADDLE, OP_UPDATE or OP_SERVE, and touch is the x coordinate of
+        the mouse (a float), or None.
+
+        Precondition: game is an int in 0..getGames()-1; start is a record number
+        of the game with a keyframe, or 0.'''
+        offset, seed, frames, keyframes = self._games[game]
+        pos = offset + 1 + SEED.size
+        keyframe = _keyframe(keyframes, start)
+        if not keyframe is None and keyframe[0] == start:
+            pos = keyframe[1] + 1 + _keyframeSize()
+        data = self._data
+        while pos < self._end:
+            op = data[pos]
+            pos = pos + 1
+            if op == OP_GAME:
+                return
+            elif op == OP_KEYFRAME:
+                pos = pos + _keyframeSize()
+            elif op & TOUCH:
+                yield (op & ~TOUCH, POSITION.unpack_from(data, pos)[0])
+                pos = pos + POSITION.size
+            else:
+                yield (op, None)
+
+    def seek(self, game, frame):
+        '''Returns: the Simulation of the given game after the given number of records.
+
+        The game starts from the last keyframe at or before frame, found by
+        binary search, so this plays less than KEYFRAME_INTERVAL records and
+        unpacks a single keyframe, however long the game is.
+
+        Precondition: game is an int in 0..getGames()-1; frame is an int in
+        0..getLength(game)'''
+        offset, seed, frames, keyframes = self._games[game]
+        sim = Simulation(random.Random(seed))
+        start = 0
+        keyframe = _keyframe(keyframes, frame)
+        if not keyframe is None:
+            start = keyframe[0]
+            sim.setState(_unpackState(self._data, keyframe[1] + 1 + FRAME.size))
+        done = start
+        for op, touch in self.records(game, start):
+            if done == frame:
+                break
+            _apply(sim, op, touch)
+            done = done + 1
+        return sim
+
+    def close(self):
+        '''Closes the file'''
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def _loadIndex(self, pos):
+        '''Returns: the index of the games, read from the index at offset pos'''
+        data = self._data
+        games = []
+        count = FRAME.unpack_from(data, pos)[0]
+        pos = pos + FRAME.size
+        for game in range(count):
+            offset, seed, frames, size = GAME.unpack_from(data, pos)
+            pos = pos + GAME.size
+            keyframes = []
+            for k in range(size):
+                keyframes.append(KEYFRAME.unpack_from(data, pos))
+                pos = pos + KEYFRAME.size
+            games.append((offset, seed, frames, keyframes))
+        return games
+
+    def _scan(self):
+        '''Returns: the index of the games, found by reading the whole file.
+
+        A record cut short at the end of the file is dropped.'''
+        data = self._data
+        games = []
+        pos = HEADER.size
+        while pos < self._end:
+            op = data[pos]
+            if op == OP_GAME:
+                size = SEED.size
+            elif op == OP_KEYFRAME:
+                size = _keyframeSize()
+            elif op & TOUCH:
+                size = POSITION.size
+            else:
+                size = 0
+            if pos + 1 + size > self._end:
+                self._end = pos
+                break
+            if op == OP_GAME:
+                games.append([pos, SEED.unpack_from(data, pos+1)[0], 0, []])
+            elif op == OP_KEYFRAME:
+                games[-1][3].append((FRAME.unpack_from(data, pos+1)[0], pos))
+            else:
+                games[-1][2] = games[-1][2] + 1
+            pos = pos + 1 + size
+        return [tuple(game) for game in games]
+
+
+def _apply(sim, op, touch):
+    '''Plays a record on a Simulation.
+
+    Precondition: sim is a Simulation; op and touch are a record of a Replay.'''
+    if op == OP_UPDATE:
+        sim.update(touch)
+    elif op == OP_PADDLE:
+        sim.updatePaddle(touch)
+    elif op == OP_SERVE:
+        sim.createBall()
+
+
+def play(replay, game):
+    '''Returns: the Simulation of a recorded game, after playing all its records.
+
+    This needs no graphics, and runs as fast as the Simulation can update.
+
+    Precondition: replay is a Replay; game is an int in 0..replay.getGames()-1'''
+    sim = Simulation(random.Random(replay.getSeed(game)))
+    for op, touch in replay.records(game):
+        _apply(sim, op, touch)
+    return sim
+
+
+def main(args):
+    '''Plays every game of a replay file and prints how each one ended.
+
+    Precondition: args is a list of strings (the arguments after "replay").'''
+    if len(args) != 1:
+        print('usage: breakout replay FILE')
+        return
+    replay = Replay(args[0])
+    for game in range(replay.getGames()):
+        sim = play(replay, game)
+        print('seed %d: %d records, score %d, %d tries left' %
+              (replay.getSeed(game), replay.getLength(game), sim.score(), sim.getTries()))
+    replay.close()
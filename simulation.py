@@ -0,0 +1,916 @@
+# simulation.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Headless simulation module for Breakout
+
+This module contains the rules of a single game of Breakout, with no graphics.
+It does not import game2d, so it does not need Kivy, pygame, a display or an
+audio device.  This lets us step games on machines that cannot open a window,
+and much faster than the frame rate.
+
+The class Simulation keeps the whole state of a game as plain numbers: the
+paddle position, the ball position and velocity, and a Wall of bricks.  The
+subcontroller Gameplay (in gameplay.py) owns a Simulation and is only a view of
+it: after every update it moves its GObjects to match the Simulation.
+
+Touches are given to this module as the x coordinate of the mouse (a float), or
+None if the mouse button is not pressed.  The y coordinate is never used by the
+rules of the game."""
+import collections
+import random # To randomly generate the ball velocity
+import numpy
+from constants import *
+
+#: The whole state of a Simulation (but its storm), as given by Simulation.getState.
+#: It is immutable.  The field alive is the read-only mask of the Wall (see
+#: Wall.getMask), shared by every State taken while no brick was removed, and rng
+#: is the state of the random generator (see random.getstate).  The other fields
+#: are the attributes of Simulation with the same names.
+State = collections.namedtuple('State', ['paddle', 'prevPaddle', 'last', 'serve', 'x', 'y',
+                                         'vx', 'vy', 'prevX', 'prevY', 'tries', 'win',
+                                         'touchCount', 'touches', 'alive', 'rng'])
+
+# The arrays shared by every new Wall of each size, made by _layout the first time
+# they are needed: a dict from (rows, columns) to the tuple returned by _layout
+_layouts = {}
+
+
+def _layout(rows, columns):
+    '''Returns the bricks of a new wall with the given number of rows and columns,
+    as a tuple (left, bottom, right, top, alive) of read-only numpy arrays.
+
+    The arrays are made once for each size and shared by every Wall of that size.
+    The edges of the bricks never change, and a wall copies alive (every brick in
+    the wall) the first time it removes a brick, so making a wall allocates no
+    arrays.
+
+    Precondition: rows and columns are ints > 0.'''
+    if not (rows, columns) in _layouts:
+        cols = numpy.tile(numpy.arange(columns), rows)
+        row = numpy.repeat(numpy.arange(rows), columns)
+        left = BRICK_SEP_H/2 + cols*BRICK_WIDTH + cols*BRICK_SEP_H
+        bottom = (620 - BRICK_Y_OFFSET - BRICK_HEIGHT*row - row*BRICK_SEP_V).astype(float)
+        arrays = (left, bottom, left + BRICK_WIDTH, bottom + BRICK_HEIGHT,
+                  numpy.ones(columns*rows, dtype=bool))
+        for array in arrays:
+            array.flags.writeable = False
+        _layouts[(rows, columns)] = arrays
+    return _layouts[(rows, columns)]
+
+
+class Wall(object):
+    """An instance represents the layer of bricks in the game, without graphics.
+
+    The wall keeps one numpy array for each edge of the bricks, and a mask saying
+    which bricks are still alive.  Brick i is in row i // _columns (row 0 is the
+    top row) and column i % _columns of the initial layout.  This keeps the wall
+    compact and lets the ball be tested against it with array operations.  The
+    edges are shared by every wall of the same size, as is the mask of a new wall
+    (see _layout).  The wall of a game has BRICK_ROWS rows of BRICKS_IN_ROW bricks.
+
+    INSTANCE ATTRIBUTES:
+        _rows    [int > 0]: the number of rows of bricks
+        _columns [int > 0]: the number of bricks in each row
+        _left   [numpy array of _columns*_rows floats]:
+            The left edge of each brick
+        _bottom [numpy array of _columns*_rows floats]:
+            The bottom edge of each brick
+        _right  [numpy array of _columns*_rows floats]:
+            The right edge of each brick
+        _top    [numpy array of _columns*_rows floats]:
+            The top edge of each brick
+        _alive  [numpy array of _columns*_rows bools]:
+            True for the bricks still in the wall.  When a brick is destroyed,
+            its entry is set to False.
+        _count  [int >= 0]:
+            The number of True entries in _alive.
+        _shared [bool]:
+            True if _alive is also held by a State (see getMask).  A shared
+            _alive is read-only, and is copied before the wall changes.
+    """
+
+    def getCount(self):
+        '''Returns the number of bricks still in the wall'''
+        return self._count
+
+    def getBottom(self):
+        '''Returns the bottom edge of the lowest row of bricks (a float)'''
+        return float(self._bottom[-1])
+
+    def getBrick(self, i):
+        '''Returns the brick i as a tuple (left, bottom, right, top) of floats.
+
+        Precondition: i is an int in 0..getSize()-1'''
+        return (float(self._left[i]), float(self._bottom[i]),
+                float(self._right[i]), float(self._top[i]))
+
+    def getBricks(self, indices):
+        '''Returns the bricks with the given indices as a tuple (left, bottom, right,
+        top) of numpy arrays.
+
+        Precondition: indices is a numpy array of ints in 0..getSize()-1'''
+        return (self._left[indices], self._bottom[indices],
+                self._right[indices], self._top[indices])
+
+    def getEdges(self):
+        '''Returns the edges of every brick as a tuple (left, bottom, right, top) of
+        read-only numpy arrays.
+
+        The arrays are not copied, so this costs nothing.  They are shared by every
+        wall of the same size.'''
+        return (self._left, self._bottom, self._right, self._top)
+
+    def getMask(self):
+        '''Returns a read-only numpy array of bools saying which bricks are still
+        in the wall
+
+        The array is not copied.  It is shared with the wall, which copies it
+        the next time a brick is removed, so taking many masks of a wall that
+        does not change costs nothing.'''
+        self._alive.flags.writeable = False
+        self._shared = True
+        return self._alive
+
+    def setMask(self, mask):
+        '''Puts back the bricks given by mask, and takes out all the others.
+
+        A read-only mask is shared with the wall, as in getMask.
+
+        Precondition: mask is a numpy array of getSize() bools, as returned by getMask.'''
+        if mask.flags.writeable:
+            mask = mask.copy()
+            mask.flags.writeable = False
+        self._alive = mask
+        self._shared = True
+        self._count = int(mask.sum())
+
+    def _own(self):
+        '''Copies _alive if it is shared, so it can be changed'''
+        if self._shared:
+            self._alive = self._alive.copy()
+            self._shared = False
+
+    def getSize(self):
+        '''Returns the number of bricks in the initial wall'''
+        return len(self._alive)
+
+    def isAlive(self, i):
+        '''Returns True if brick i is still in the wall
+
+        Precondition: i is an int in 0..getSize()-1'''
+        return bool(self._alive[i])
+
+    def getAlive(self):
+        '''Returns the indices of the bricks still in the wall as a numpy array'''
+        return numpy.flatnonzero(self._alive)
+
+    def getBrickAt(self, x, y):
+        '''Returns the index of the brick containing the point (x,y), or None if
+        there is none.
+
+        The row and column are computed directly from the wall layout, so this
+        only ever looks at a single brick, no matter how many bricks there are.
+
+        Precondition: x and y are ints or floats.'''
+        col = int((x - BRICK_SEP_H/2) // (BRICK_WIDTH + BRICK_SEP_H))
+        row = int((620 - BRICK_Y_OFFSET + BRICK_HEIGHT - y) // (BRICK_HEIGHT + BRICK_SEP_V))
+        if not (0 <= row < self._rows and 0 <= col < self._columns):
+            return None
+        i = row*self._columns + col
+        if (self._alive[i] and self._left[i] <= x <= self._right[i] and
+            self._bottom[i] <= y <= self._top[i]):
+            return i
+        return None
+
+    def getBricksIn(self, left, bottom, right, top):
+        '''Returns the list of indices of the bricks still in the wall whose cells
+        overlap the rectangle from (left,bottom) to (right,top).
+
+        Only the cells of the wall layout under the rectangle are looked at, so a
+        small rectangle costs the same no matter how many bricks there are.
+
+        Precondition: left <= right and bottom <= top are ints or floats.'''
+        if top < self._bottom[-1] or bottom > self._top[0]:
+            return []
+        col0 = max(int((left - BRICK_SEP_H/2) // (BRICK_WIDTH + BRICK_SEP_H)), 0)
+        col1 = min(int((right - BRICK_SEP_H/2) // (BRICK_WIDTH + BRICK_SEP_H)), self._columns-1)
+        row0 = max(int((620 - BRICK_Y_OFFSET + BRICK_HEIGHT - top) // (BRICK_HEIGHT + BRICK_SEP_V)), 0)
+        row1 = min(int((620 - BRICK_Y_OFFSET + BRICK_HEIGHT - bottom) // (BRICK_HEIGHT + BRICK_SEP_V)),
+                   self._rows-1)
+        result = []
+        for row in range(row0, row1+1):
+            for i in range(row*self._columns + col0, row*self._columns + col1+1):
+                if self._alive[i]:
+                    result.append(i)
+        return result
+
+    def removeBrick(self, i):
+        '''Removes brick i from the wall
+
+        Precondition: i is an int in 0..getSize()-1, and brick i is alive.'''
+        self._own()
+        self._alive[i] = False
+        self._count = self._count - 1
+
+    def removeBricksAt(self, xs, ys):
+        '''Removes every brick containing one of the points (xs[k],ys[k]).
+
+        All of the points are tested at once with array operations.  Each point
+        is looked up in the cell of the wall layout that holds it, so the cost
+        does not depend on the number of bricks.
+
+        Returns: a numpy array of bools, True for each point that was inside a brick.
+
+        Precondition: xs and ys are numpy arrays of floats of the same length.'''
+        cols = numpy.floor((xs - BRICK_SEP_H/2) / (BRICK_WIDTH + BRICK_SEP_H)).astype(int)
+        rows = numpy.floor((620 - BRICK_Y_OFFSET + BRICK_HEIGHT - ys) /
+                           (BRICK_HEIGHT + BRICK_SEP_V)).astype(int)
+        inside = (rows >= 0) & (rows < self._rows) & (cols >= 0) & (cols < self._columns)
+        index = numpy.where(inside, rows*self._columns + cols, 0)
+        hits = (inside & self._alive[index] &
+                (self._left[index] <= xs) & (xs <= self._right[index]) &
+                (self._bottom[index] <= ys) & (ys <= self._top[index]))
+        if hits.any():
+            dead = numpy.unique(index[hits])
+            self._own()
+            self._alive[dead] = False
+            self._count = self._count - len(dead)
+        return hits
+
+    def __init__(self, rows=BRICK_ROWS, columns=BRICKS_IN_ROW):
+        '''Sets the initial state of the bricks in the game.
+
+        The bricks are those of the layout made by _layout, with every brick in
+        the wall.  The mask is shared with the layout until a brick is removed.
+
+        Precondition: rows and columns are ints > 0, the size of the wall.'''
+        self._rows = rows
+        self._columns = columns
+        self._left, self._bottom, self._right, self._top, self._alive = _layout(rows, columns)
+        self._count = len(self._alive)
+        self._shared = True
+
+
+def _impact(x, y, dx, dy, left, bottom, right, top):
+    '''Returns: the first time the moving ball touches a box, as a tuple (t, axis),
+    or None if it does not hit the box.
+
+    The ball has its bottom left corner at (x,y) and moves by (dx,dy).  t is the
+    fraction of that move (in 0..1) done when the ball meets the box.  axis is 0
+    if the ball meets a side of the box (so vx reverses) and 1 if it meets the top
+    or bottom (so vy reverses).  A ball that only grazes the box, or that is
+    already inside it, does not hit it.
+
+    This is a swept test of the two boxes: the box is grown by the size of the
+    ball, and the path of the corner is clipped against each pair of edges.
+
+    Precondition: all arguments are floats, left <= right and bottom <= top.'''
+    left = left - BALL_DIAMETER
+    bottom = bottom - BALL_DIAMETER
+    if dx == 0:
+        if not left < x < right:
+            return None
+        tx0 = float('-inf')
+        tx1 = float('inf')
+    else:
+        tx0 = (left - x)/dx
+        tx1 = (right - x)/dx
+        if tx0 > tx1:
+            tx0, tx1 = tx1, tx0
+    if dy == 0:
+        if not bottom < y < top:
+            return None
+        ty0 = float('-inf')
+        ty1 = float('inf')
+    else:
+        ty0 = (bottom - y)/dy
+        ty1 = (top - y)/dy
+        if ty0 > ty1:
+            ty0, ty1 = ty1, ty0
+    t0 = max(tx0, ty0)
+    t1 = min(tx1, ty1)
+    if t0 >= t1 or t0 < 0 or t0 > 1:
+        return None
+    return (t0, 0 if tx0 > ty0 else 1)
+
+
+def _impacts(x, y, dx, dy, left, bottom, right, top):
+    '''Returns: the first times many moving balls touch many boxes, as a tuple
+    (t, side) of numpy arrays.
+
+    This is _impact done with array operations.  The balls are given as columns
+    (arrays of shape (m,1)) and the boxes as rows (arrays of shape (1,k)), so both
+    results have shape (m,k).  t is numpy.inf where a ball does not hit a box, and
+    side is True where a ball meets a side of a box (so vx reverses).  The results
+    are exactly the ones _impact gives for each pair.
+
+    Precondition: all arguments are numpy arrays of floats of those shapes.'''
+    left = left - BALL_DIAMETER
+    bottom = bottom - BALL_DIAMETER
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        ax = (left - x)/dx
+        bx = (right - x)/dx
+        ay = (bottom - y)/dy
+        by = (top - y)/dy
+    inside = (left < x) & (x < right)
+    tx0 = numpy.where(dx == 0, numpy.where(inside, -numpy.inf, numpy.inf), numpy.minimum(ax, bx))
+    tx1 = numpy.where(dx == 0, numpy.where(inside, numpy.inf, -numpy.inf), numpy.maximum(ax, bx))
+    inside = (bottom < y) & (y < top)
+    ty0 = numpy.where(dy == 0, numpy.where(inside, -numpy.inf, numpy.inf), numpy.minimum(ay, by))
+    ty1 = numpy.where(dy == 0, numpy.where(inside, numpy.inf, -numpy.inf), numpy.maximum(ay, by))
+    t0 = numpy.maximum(tx0, ty0)
+    t1 = numpy.minimum(tx1, ty1)
+    t = numpy.where((t0 < t1) & (t0 >= 0) & (t0 <= 1), t0, numpy.inf)
+    return (t, tx0 > ty0)
+
+
+def lifted(x, y, vy, paddle):
+    '''Returns: a numpy array of bools, True for each falling ball that the paddle
+    has moved into, which is sent up (see Simulation._liftBall).
+
+    Precondition: x, y and vy are numpy arrays of floats of the same length, the
+    bottom left corners and y velocities of the balls.  paddle is the left of the
+    paddle, a float or a numpy array of floats of the same length.'''
+    return ((vy < 0) & (paddle - BALL_DIAMETER < x) & (x < paddle + PADDLE_WIDTH) &
+            (PADDLE_OFFSET - BALL_DIAMETER < y) & (y < PADDLE_OFFSET + PADDLE_HEIGHT))
+
+
+def collide(x, y, dx, dy, paddle, bricks, alive=None):
+    '''Returns: the earliest impact of each of many balls moving by (dx,dy).
+
+    This is Simulation._processCollision done for many balls at once with array
+    operations.  It is shared by Storm and by the environment in env.py, so that
+    all of them follow the same rules.
+
+    The result is a tuple (t, flipx, flipy, touched, hits).  t is a numpy array
+    with the fraction of the move done by each ball when it hits (numpy.inf if
+    it hits nothing).  flipx and flipy are arrays of bools, True where vx and vy
+    should reverse, and touched is True where the ball hits the paddle.  hits[j,k]
+    is True if ball j hits brick k at its time t[j].
+
+    Precondition: x, y, dx, dy and paddle are numpy arrays of floats of the same
+    length; paddle[j] is the left of the paddle ball j may hit.  bricks is a tuple
+    (left, bottom, right, top) of numpy arrays of floats of the same length, as
+    given by Wall.getBricks.  alive is None if a ball may hit every brick, or a
+    numpy array of bools of shape (len(x), len(bricks[0])), True where ball j
+    may hit brick k.'''
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        wall = numpy.where(dx < 0, numpy.maximum(-x/dx, 0.0),
+                           numpy.where(dx > 0, numpy.maximum((GAME_WIDTH - BALL_DIAMETER - x)/dx, 0.0),
+                                       numpy.inf))
+        ceiling = numpy.where(dy > 0, numpy.maximum((GAME_HEIGHT - BALL_DIAMETER - y)/dy, 0.0),
+                              numpy.inf)
+    paddle = paddle[:, None]
+    x = x[:, None]
+    y = y[:, None]
+    dx = dx[:, None]
+    dy = dy[:, None]
+    tp, sp = _impacts(x, y, dx, dy, paddle, numpy.full_like(paddle, PADDLE_OFFSET),
+                      paddle + PADDLE_WIDTH, numpy.full_like(paddle, PADDLE_OFFSET + PADDLE_HEIGHT))
+    left, bottom, right, top = bricks
+    tb = numpy.full((len(x), len(left)), numpy.inf)
+    sb = numpy.zeros((len(x), len(left)), dtype=bool)
+    if len(left) > 0:
+        # Only the balls that reach the lowest brick can hit one
+        near = numpy.flatnonzero(numpy.maximum(y, y+dy)[:, 0] + BALL_DIAMETER >= bottom.min())
+        if len(near) > 0:
+            tb[near], sb[near] = _impacts(x[near], y[near], dx[near], dy[near],
+                                          left[None, :], bottom[None, :],
+                                          right[None, :], top[None, :])
+            if not alive is None:
+                tb[~alive] = numpy.inf
+    times = numpy.hstack([wall[:, None], ceiling[:, None], tp, tb])
+    sides = numpy.hstack([numpy.ones((len(x), 1), dtype=bool),
+                          numpy.zeros((len(x), 1), dtype=bool), sp, sb])
+    t = times.min(axis=1)
+    first = (times == t[:, None]) & (t[:, None] <= 1.0)
+    flipx = (first & sides).any(axis=1)
+    flipy = (first & ~sides).any(axis=1)
+    return (t, flipx, flipy, first[:, 2], first[:, 3:])
+
+
+class Simulation(object):
+    """An instance is the state and rules of a single game of breakout.
+
+    This class has the same rules as the original Gameplay subcontroller, but
+    every object is a plain number, so a step costs only a few arithmetic
+    operations.  Collisions are found along the whole path of the ball in a
+    step (see _moveBall), not only at the position it ends up in.  Gameplay
+    draws a Simulation; batch tools can step one on its own.
+
+    INSTANCE ATTRIBUTES:
+        _wall   [Wall]:  the bricks still remaining
+        _paddle [float]: the x coordinate of the left side of the paddle
+        _last   [float, or None if mouse button is not pressed]:
+            x coordinate of the last mouse position (if Button pressed)
+        _serve  [bool]: True if a ball is in play, False if waiting for a serve
+        _x      [float]: x coordinate of the left side of the ball
+        _y      [float]: y coordinate of the bottom of the ball
+        _vx     [float]: velocity of the ball in x direction
+        _vy     [float]: velocity of the ball in y direction
+        _prevX, _prevY [float]: position of the ball before the last update
+        _prevPaddle [float]: position of the paddle before the last move
+        _tries  [int >= 0]: the number of tries left
+        _win    [bool]:
+            True indicates that the player has eliminated all of the bricks
+        _touchCount [int >= 0]:
+            Amount of times the ball has made contact with the paddle since the
+            last ball was lost.
+        _touches [int >= 0]:
+            Amount of times the ball has made contact with the paddle in the game.
+        _rng    [random.Random, or the module random]:
+            the random number generator used to serve the ball
+        _storm  [Storm, or None if there is no storm]:
+            extra balls sharing the wall and paddle
+
+    The ball attributes _x, _y, _vx and _vy are only meaningful if _serve is True.
+    """
+
+    def getWall(self):
+        '''Returns: the bricks as a Wall object.
+
+        This method returns the attribute _wall directly. Any changes
+        made to this will modify the game.'''
+        return self._wall
+
+    def getPaddle(self):
+        '''Returns: the x coordinate of the left side of the paddle (a float)'''
+        return self._paddle
+
+    def getBall(self):
+        '''Returns: the ball as a tuple (x, y, vx, vy) of floats, or None if
+        waiting for a serve.
+
+        (x, y) is the bottom left corner of the ball.'''
+        if not self._serve:
+            return None
+        return (self._x, self._y, self._vx, self._vy)
+
+    def getBallAt(self, alpha):
+        '''Returns: the ball position (x, y) a fraction alpha of the way from its
+        position before the last update to its current one, or None if waiting
+        for a serve.
+
+        Precondition: alpha is a float in 0..1'''
+        if not self._serve:
+            return None
+        return (self._prevX + (self._x-self._prevX)*alpha,
+                self._prevY + (self._y-self._prevY)*alpha)
+
+    def getPaddleAt(self, alpha):
+        '''Returns: the paddle position a fraction alpha of the way from its
+        position before the last move to its current one (a float)
+
+        Precondition: alpha is a float in 0..1'''
+        return self._prevPaddle + (self._paddle-self._prevPaddle)*alpha
+
+    def getTouches(self):
+        '''Returns: the number of times the ball has hit the paddle in this game'''
+        return self._touches
+
+    def getStorm(self):
+        '''Returns: the extra balls as a Storm object, or None if there is no storm.
+
+        This method returns the attribute _storm directly.'''
+        return self._storm
+
+    def getTries(self):
+        '''Returns: the number of tries left as an int'''
+        return self._tries
+
+    def getWin(self):
+        '''Returns: True when the bricks have been eliminated'''
+        return self._win
+
+    def __init__(self, rng=None):
+        '''This initializes the game state.
+
+        The ball begins as not served; use createBall() to serve it.
+
+        Precondition: rng is a random.Random object, or None to use the shared
+        generator of the module random.'''
+        self._wall = Wall()
+        self._paddle = float(GAME_WIDTH/2-PADDLE_WIDTH/2)
+        self._prevPaddle = self._paddle
+        self._last = None
+        self._serve = False
+        self._x = 0.0
+        self._y = 0.0
+        self._vx = 0.0
+        self._vy = 0.0
+        self._prevX = 0.0
+        self._prevY = 0.0
+        self._tries = NUMBER_TURNS
+        self._win = False
+        self._touchCount = 0
+        self._touches = 0
+        self._rng = random if rng is None else rng
+        self._storm = None
+
+    def getState(self):
+        '''Returns: the state of this game as a State.
+
+        The storm is not part of the state.'''
+        return State(self._paddle, self._prevPaddle, self._last, self._serve,
+                     self._x, self._y, self._vx, self._vy, self._prevX, self._prevY,
+                     self._tries, self._win, self._touchCount, self._touches,
+                     self._wall.getMask(), self._rng.getstate())
+
+    def setState(self, state):
+        '''Puts this game back in the given state.
+
+        The random generator is put back in its state too, so the game goes on
+        exactly as it did after the state was taken.
+
+        Precondition: state is a State returned by getState, with the same brick
+        layout.'''
+        self._paddle = state.paddle
+        self._prevPaddle = state.prevPaddle
+        self._last = state.last
+        self._serve = state.serve
+        self._x = state.x
+        self._y = state.y
+        self._vx = state.vx
+        self._vy = state.vy
+        self._prevX = state.prevX
+        self._prevY = state.prevY
+        self._tries = state.tries
+        self._win = state.win
+        self._touchCount = state.touchCount
+        self._touches = state.touches
+        self._wall.setMask(state.alive)
+        self._rng.setstate(state.rng)
+
+    def createBall(self):
+        '''Serves a new ball from the center of the screen.
+
+        Velocity x direction is randomized so it does not fall the same
+        way each time.'''
+        self._serve = True
+        self._x = float(GAME_WIDTH/2 - BALL_DIAMETER/2)
+        self._y = float(GAME_HEIGHT/2)
+        self._vy = -5.0
+        self._vx = self._rng.uniform(1.0,5.0)
+        self._vx = self._vx * self._rng.choice([-1.0, 1.0])
+        self._prevX = self._x
+        self._prevY = self._y
+
+    def createStorm(self, n):
+        '''Serves n extra balls from the center of the screen.
+
+        The balls move with every update until they are lost, breaking bricks
+        like the ball in play.  A new storm replaces the old one.
+
+        Precondition: n is an int >= 0.'''
+        self._storm = Storm(self._wall, n, self._rng)
+
+    def updatePaddle(self, touch):
+        '''This method allows the user to slide the paddle sideways, without
+        making the paddle teleport to where the user clicked.
+
+        Precondition: touch is the x coordinate of the mouse (a float), or None
+        if there has been no click.'''
+        self._prevPaddle = self._paddle
+        if touch is None:
+            self._last = None
+        elif self._last is None:
+            self._last = touch
+        else:
+            self._movePaddle(touch)
+
+    def _movePaddle(self, touch):
+        '''This method is called upon by updatePaddle, and it ensures that the paddle will slide
+        but will not transport'''
+        distance = touch - self._last
+        if self._paddle + distance < 0:
+            self._paddle = 0.0
+        elif self._paddle + PADDLE_WIDTH > GAME_WIDTH:
+            self._paddle = float(GAME_WIDTH - PADDLE_WIDTH)
+        else:
+            self._paddle = self._paddle + distance
+        self._last = touch
+
+    def updateBall(self):
+        '''This method moves the ball for one update and applies the rules when
+        it is lost or speeds up.
+
+        The ball is moved by _moveBall, which bounces it off the walls, paddle
+        and bricks.  When the ball crosses the bottom of the screen, the _tries
+        attribute is decreased by 1.  While the touchCount is 10, the speed is
+        increased.'''
+        yvelocity = self._vy
+        above = self._y > 0
+        self._moveBall()
+        if above and self._y <= 0:
+            self._tries = self._tries - 1
+            self._touchCount = 0
+        if self._touchCount == 10:
+            self._vy = -yvelocity*1.3
+
+    def _moveBall(self):
+        '''This method moves the ball by its velocity, bouncing it off the first
+        thing in its way.
+
+        The path of the ball is tested against the walls, the paddle and the
+        bricks near it, and the ball is moved to the earliest impact.  There the
+        velocity is reflected, every brick hit at that moment is deleted, and the
+        rest of the move is done the same way, up to MAX_BOUNCES times.  Since the
+        whole path is tested, the ball cannot pass through a brick or the paddle
+        however fast it goes.  Finally, it checks to see if the wall is empty,
+        when _win will change to True.'''
+        self._liftBall()
+        time = 1.0
+        for bounce in range(MAX_BOUNCES):
+            dx = self._vx*time
+            dy = self._vy*time
+            hit = self._processCollision(dx, dy)
+            if hit is None:
+                self._x = self._x + dx
+                self._y = self._y + dy
+                break
+            t, flipx, flipy, paddle, bricks = hit
+            self._x = self._x + dx*t
+            self._y = self._y + dy*t
+            if paddle and flipy and self._vy < 0:
+                self._touchCount = self._touchCount + 1
+                self._touches = self._touches + 1
+            if flipx:
+                self._vx = -self._vx
+            if flipy:
+                self._vy = -self._vy
+            for i in bricks:
+                self._wall.removeBrick(i)
+            time = time*(1-t)
+        if self._wall.getCount() == 0:
+            self._win = True
+
+    def _liftBall(self):
+        '''This method sends a falling ball up if the paddle has moved into it.'''
+        if (self._vy < 0 and
+            self._paddle - BALL_DIAMETER < self._x < self._paddle + PADDLE_WIDTH and
+            PADDLE_OFFSET - BALL_DIAMETER < self._y < PADDLE_OFFSET + PADDLE_HEIGHT):
+            self._vy = -self._vy
+            self._touchCount = self._touchCount + 1
+            self._touches = self._touches + 1
+
+    def _processCollision(self, dx, dy):
+        '''Returns: the earliest impact of the ball moving by (dx,dy), or None if
+        it hits nothing.
+
+        The impact is a tuple (t, flipx, flipy, paddle, bricks).  t is the fraction
+        of the move done when the ball hits.  flipx and flipy are True if vx and vy
+        should reverse.  paddle is True if the ball hits the paddle, and bricks is
+        the list of bricks hit.  Everything hit at the same moment is included.
+
+        Precondition: dx and dy are floats.'''
+        x = self._x
+        y = self._y
+        impacts = []
+        if dx < 0:
+            impacts.append((max(-x/dx, 0.0), 0, None))
+        elif dx > 0:
+            impacts.append((max((GAME_WIDTH - BALL_DIAMETER - x)/dx, 0.0), 0, None))
+        if dy > 0:
+            impacts.append((max((GAME_HEIGHT - BALL_DIAMETER - y)/dy, 0.0), 1, None))
+        hit = _impact(x, y, dx, dy, self._paddle, float(PADDLE_OFFSET),
+                      self._paddle + PADDLE_WIDTH, float(PADDLE_OFFSET + PADDLE_HEIGHT))
+        if not hit is None:
+            impacts.append((hit[0], hit[1], -1))
+        for i in self._wall.getBricksIn(min(x, x+dx), min(y, y+dy),
+                                        max(x, x+dx) + BALL_DIAMETER,
+                                        max(y, y+dy) + BALL_DIAMETER):
+            left, bottom, right, top = self._wall.getBrick(i)
+            hit = _impact(x, y, dx, dy, left, bottom, right, top)
+            if not hit is None:
+                impacts.append((hit[0], hit[1], i))
+        impacts = [item for item in impacts if item[0] <= 1.0]
+        if len(impacts) == 0:
+            return None
+        t = min(item[0] for item in impacts)
+        flipx = False
+        flipy = False
+        paddle = False
+        bricks = []
+        for item in impacts:
+            if item[0] == t:
+                flipx = flipx or item[1] == 0
+                flipy = flipy or item[1] == 1
+                if item[2] == -1:
+                    paddle = True
+                elif not item[2] is None:
+                    bricks.append(item[2])
+        return (t, flipx, flipy, paddle, bricks)
+
+    def score(self):
+        '''Returns: the current score in the game, which is the amount of Bricks broken'''
+        return BRICKS_IN_ROW*BRICK_ROWS - self._wall.getCount()
+
+    def update(self, touch):
+        '''Moves the paddle, then moves the ball and processes the collisions.
+
+        Precondition: touch is the x coordinate of the mouse (a float), or None.
+        A ball is in play.'''
+        self.updatePaddle(touch)
+        self._prevX = self._x
+        self._prevY = self._y
+        self.updateBall()
+        if not self._storm is None:
+            self._storm.update(self._paddle)
+            if self._wall.getCount() == 0:
+                self._win = True
+
+    def advance(self, touch, ticks):
+        '''Updates the game up to ticks times while the mouse stays at touch, and
+        returns the number of updates done.
+
+        This gives exactly the same game as calling update(touch) that many
+        times, but it skips ahead between collisions.  Once the paddle stands
+        still (see _standing), the straight flight of the ball up to the next
+        event (a bounce or the ball crossing the bottom of the screen) is known
+        in advance.  Only the updates around an event are done with update.
+        The others just add the velocity to the position, as update would, so
+        the positions match to the last bit.  While the paddle can still move,
+        while the touchCount is 10 (the ball speeds up every update), and while
+        there is a storm (the other balls can hit something at any time), every
+        update is done in full.
+
+        It stops early once the ball is at or below the bottom of the screen,
+        or the wall is empty.
+
+        Precondition: touch is the x coordinate of the mouse (a float), or None.
+        ticks is an int >= 0.  A ball is in play.'''
+        done = 0
+        while done < ticks and self._y > 0 and not self._win:
+            skip = 0
+            if self._standing(touch) and self._touchCount != 10 and self._storm is None:
+                skip = min(self._flight(ticks - done) - 1, ticks - done)
+            if skip > 0:
+                self._fly(skip)
+                done = done + skip
+            else:
+                self.update(touch)
+                done = done + 1
+        return done
+
+    def _standing(self, touch):
+        '''Returns: True if update(touch) would leave the paddle and the mouse as
+        they are, and so would every update after it.
+
+        That is the case when the mouse has not moved since the last update (or
+        stays released), and the paddle is inside the screen.  A paddle pushed
+        past the edge is only put back on the screen by the next update, even if
+        the mouse does not move (see _movePaddle).
+
+        Precondition: touch is the x coordinate of the mouse (a float), or None.'''
+        if touch is None:
+            return self._last is None
+        return self._last == touch and 0 <= self._paddle <= GAME_WIDTH - PADDLE_WIDTH
+
+    def _flight(self, ticks):
+        '''Returns: the number of updates (an int) the ball can fly in a straight
+        line before the update in which it hits something or is lost, at most ticks.
+
+        Precondition: ticks is an int > 0.  The paddle is standing (see _standing).'''
+        if (self._vy < 0 and
+            self._paddle - BALL_DIAMETER < self._x < self._paddle + PADDLE_WIDTH and
+            PADDLE_OFFSET - BALL_DIAMETER < self._y < PADDLE_OFFSET + PADDLE_HEIGHT):
+            return 0
+        time = float(ticks)
+        hit = self._processCollision(self._vx*ticks, self._vy*ticks)
+        if not hit is None:
+            time = hit[0]*ticks
+        if self._vy < 0:
+            time = min(time, self._y/-self._vy)
+        return int(time)
+
+    def _fly(self, ticks):
+        '''Moves the ball in a straight line for the given number of updates.
+
+        The velocity is added once per update, as update does, and not
+        multiplied by ticks: x + vx*ticks is rounded differently, and would
+        make the game drift from one played with update (and from its replays).
+        This costs no more than the collisions: as the speed of the ball in y
+        is always at least 5, a flight lasts at most GAME_HEIGHT/5 updates, and
+        each is a couple of float additions.
+
+        Precondition: ticks is an int > 0, and the ball hits nothing meanwhile.'''
+        x = self._x
+        y = self._y
+        vx = self._vx
+        vy = self._vy
+        for tick in range(ticks-1):
+            x = x + vx
+            y = y + vy
+        self._prevX = x
+        self._prevY = y
+        self._x = x + vx
+        self._y = y + vy
+        self._prevPaddle = self._paddle
+
+
+class Storm(object):
+    """An instance is a storm of many balls sharing the wall and paddle of a game.
+
+    The position and velocity of every ball are kept in numpy arrays, and each
+    update moves all of the balls at once.  Balls bounce like the ball of a
+    Simulation (see Simulation._moveBall), except that a ball of a storm does not
+    cost a try when it is lost; it is simply taken out of the storm.  The balls
+    do not collide with each other, and they never speed up.
+
+    The balls are processed together, one bounce at a time.  In each pass, the
+    earliest impact of every ball is found against the wall as it was at the start
+    of the pass.  If several balls hit the same brick in a pass, they all bounce,
+    and the brick is credited only to the ball with the lowest index.  This makes
+    the result the same on every run, whatever the order of the hits.
+
+    INSTANCE ATTRIBUTES:
+        _wall   [Wall]: the bricks, shared with the game
+        _x      [numpy array of floats]: x coordinate of the left side of each ball
+        _y      [numpy array of floats]: y coordinate of the bottom of each ball
+        _vx     [numpy array of floats]: velocity of each ball in x direction
+        _vy     [numpy array of floats]: velocity of each ball in y direction
+        _alive  [numpy array of bools]: True for the balls still in play
+        _credit [numpy array of ints]: the number of bricks broken by each ball
+
+    All of the arrays have one entry per ball ever served, so indices never change.
+    """
+
+    def getCount(self):
+        '''Returns: the number of balls still in play'''
+        return int(self._alive.sum())
+
+    def getBalls(self):
+        '''Returns: the balls still in play as a tuple (x, y, vx, vy) of numpy arrays.
+
+        (x, y) are the bottom left corners of the balls.  The arrays are copies.'''
+        return (self._x[self._alive], self._y[self._alive],
+                self._vx[self._alive], self._vy[self._alive])
+
+    def getAlive(self):
+        '''Returns: a copy of the numpy array of bools saying which balls are in play'''
+        return self._alive.copy()
+
+    def getCredit(self):
+        '''Returns: a copy of the numpy array of the bricks broken by each ball'''
+        return self._credit.copy()
+
+    def __init__(self, wall, n, rng):
+        '''Serves n balls from the center of the screen.
+
+        Each ball gets a random x velocity, drawn from rng as in
+        Simulation.createBall.
+
+        Precondition: wall is a Wall; n is an int >= 0; rng is a random.Random
+        object or the module random.'''
+        self._wall = wall
+        self._x = numpy.full(n, float(GAME_WIDTH/2 - BALL_DIAMETER/2))
+        self._y = numpy.full(n, float(GAME_HEIGHT/2))
+        self._vx = numpy.array([rng.uniform(1.0,5.0)*rng.choice([-1.0, 1.0]) for k in range(n)],
+                               dtype=float)
+        self._vy = numpy.full(n, -5.0)
+        self._alive = numpy.ones(n, dtype=bool)
+        self._credit = numpy.zeros(n, dtype=int)
+
+    def update(self, paddle):
+        '''Moves every ball in play for one update, deleting the bricks they hit.
+
+        Balls that cross the bottom of the screen are taken out of play.
+
+        Precondition: paddle is the x coordinate of the left side of the paddle
+        (a float).'''
+        start = numpy.flatnonzero(self._alive)
+        above = self._y[start] > 0
+        lift = start[lifted(self._x[start], self._y[start], self._vy[start], paddle)]
+        self._vy[lift] = -self._vy[lift]
+        active = start
+        time = numpy.ones(len(active))
+        for bounce in range(MAX_BOUNCES):
+            if len(active) == 0:
+                break
+            x = self._x[active]
+            y = self._y[active]
+            dx = self._vx[active]*time
+            dy = self._vy[active]*time
+            bricks = self._wall.getAlive()
+            t, flipx, flipy, touched, hits = collide(x, y, dx, dy, numpy.full(len(active), paddle),
+                                                     self._wall.getBricks(bricks))
+            hit = t <= 1.0
+            miss = ~hit
+            self._x[active[miss]] = x[miss] + dx[miss]
+            self._y[active[miss]] = y[miss] + dy[miss]
+            self._x[active[hit]] = x[hit] + dx[hit]*t[hit]
+            self._y[active[hit]] = y[hit] + dy[hit]*t[hit]
+            flip = active[hit & flipx]
+            self._vx[flip] = -self._vx[flip]
+            flip = active[hit & flipy]
+            self._vy[flip] = -self._vy[flip]
+            broken = hits.any(axis=0)
+            if broken.any():
+                # The first row with a hit is the lowest index, as active is sorted
+                winners = active[hits[:, broken].argmax(axis=0)]
+                numpy.add.at(self._credit, winners, 1)
+                for i in bricks[broken]:
+                    self._wall.removeBrick(i)
+            time = time[hit]*(1-t[hit])
+            active = active[hit]
+        self._alive[start[above & (self._y[start] <= 0)]] = False
@@ -0,0 +1,12 @@
+# conftest.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Configuration of the tests of Breakout
+
+The modules of Breakout import each other by their plain names, as they do when
+the game is run with "python breakout".  This puts the directory containing them
+on the path, so the tests can import them the same way."""
+import os.path
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,21 @@
+# test_batch.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Tests of the batch runner batch.py"""
+import batch
+
+
+def test_games_with_a_storm_are_the_same_for_the_same_seed():
+    '''A game played twice with the same seed and storm gives the same result'''
+    first = batch.play(3, storm=200)
+    assert first == batch.play(3, storm=200)
+    assert first['storm'] > 0 and first['score'] >= first['storm']
+    assert batch.play(3)['storm'] == 0
+
+
+def test_workers_play_the_same_games():
+    '''The games played by a pool of workers are those played in this process'''
+    alone = sorted(batch.run(4, 1, seed=10, storm=50), key=lambda result: result['seed'])
+    pool = sorted(batch.run(4, 2, seed=10, storm=50), key=lambda result: result['seed'])
+    assert alone == pool
+    assert batch.summarize(pool)['games'] == 4
@@ -0,0 +1,62 @@
+# test_env.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Tests of the vectorized environment in env.py"""
+import random
+import numpy
+from constants import *
+from simulation import *
+from env import *
+
+
+def start(seed):
+    '''Returns: a new Simulation with the given seed, as a game of BreakoutEnv starts.
+
+    The ball is served, and the mouse is held at 0, so that update(touch) slides
+    the paddle by touch.'''
+    sim = Simulation(random.Random(seed))
+    sim.createBall()
+    sim.setState(sim.getState()._replace(last=0.0))
+    return sim
+
+
+def test_env_matches_simulation():
+    '''Every game of a BreakoutEnv is the game a Simulation plays with the same
+    seed and the same paddle moves, including the games started when one ends'''
+    games = 16
+    limit = 1500
+    env = BreakoutEnv(games, limit)
+    obs = env.reset(7)
+    sims = [start(int(seed)) for seed in env.getSeeds()]
+    touches = [0.0]*games
+    steps = [0]*games
+    noise = numpy.random.default_rng(0)
+    ended = 0
+    for step in range(4000):
+        # Chase the ball, with some noise so that the paddle also misses.  The
+        # moves are whole quarters, so the mouse moves by exactly the action.
+        actions = obs[:, 1] + BALL_DIAMETER/2 - obs[:, 0] - PADDLE_WIDTH/2
+        actions = numpy.round((actions + noise.normal(0, 20, games))*4)/4
+        obs, rewards, dones = env.step(actions)
+        for k in range(games):
+            sim = sims[k]
+            score = sim.score()
+            touches[k] = touches[k] + actions[k]
+            sim.update(float(touches[k]))
+            steps[k] = steps[k] + 1
+            assert rewards[k] == sim.score() - score
+            lost = sim.getBall()[1] <= 0
+            over = sim.getWin() or sim.getTries() == 0 or steps[k] >= limit
+            assert dones[k] == over
+            if over:
+                ended = ended + 1
+                sims[k] = start(int(env.getSeeds()[k]))
+                touches[k] = 0.0
+                steps[k] = 0
+                continue
+            if lost:
+                sim.createBall()
+            assert env.getTries()[k] == sim.getTries()
+            assert tuple(obs[k, :len(OBSERVATION)]) == (sim.getPaddle(),) + sim.getBall()
+            assert (obs[k, len(OBSERVATION):] == sim.getWall().getMask()).all()
+    assert ended > games
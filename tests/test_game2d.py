@@ -0,0 +1,142 @@
+# test_game2d.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Tests of the drawing module game2d.py, without a window"""
+import pytest
+import game2d
+
+
+def test_incomplete_backend_cannot_be_made():
+    '''A backend missing a method fails when it is made, not when it is drawn'''
+    class Colors(game2d.Backend):
+        def color(self,r,g,b,a=1.0):
+            return None
+    with pytest.raises(TypeError):
+        Colors()
+
+
+@pytest.mark.parametrize('backend', [game2d.NullBackend, game2d.RecordingBackend])
+def test_headless_backends_are_complete(backend):
+    '''The backends without a window define the whole interface'''
+    view = game2d.GView(backend())
+    assert view.widget is None
+
+
+def test_view_keeps_values_until_taken():
+    '''A value kept by a view is only given back by that view, and only once'''
+    backend = game2d.NullBackend()
+    view = game2d.GView(backend)
+    other = game2d.GView(backend)
+    view.keep('spare', 42)
+    assert other.take('spare') is None
+    assert view.take('spare') == 42
+    assert view.take('spare') is None
+
+
+def _vertices(batch):
+    '''Returns: the vertices of every mesh of a drawn batch, as one list'''
+    return [v for color, mesh in batch._mcache for v in mesh.vertices.tolist()]
+
+
+def test_batch_hides_and_shows_rectangles_in_place():
+    '''Hiding and showing rectangles of a drawn batch gives the meshes of a new batch'''
+    view = game2d.GView(game2d.RecordingBackend())
+    frames = [(0,0,10,10),(20,0,10,10),(40,0,10,10),(60,0,10,10)]
+    colors = [(1,0,0,1),(0,0,1,1),(1,0,0,1),(0,0,1,1)]
+    bricks = game2d.GBatch(frames=frames,colors=colors)
+    bricks.draw(view)
+    meshes = [mesh for color, mesh in bricks._mcache]
+    
+    with bricks.batch():
+        bricks.hide(1)
+        bricks.hide(2)
+    assert not bricks.contains(25,5) and bricks.contains(5,5)
+    hidden = game2d.GBatch(frames=frames,colors=colors)
+    hidden.hide(1)
+    hidden.hide(2)
+    hidden.draw(view)
+    assert _vertices(bricks) == _vertices(hidden)
+    
+    bricks.show(2)
+    bricks.showAll()
+    fresh = game2d.GBatch(frames=frames,colors=colors)
+    fresh.draw(view)
+    assert _vertices(bricks) == _vertices(fresh)
+    assert [mesh for color, mesh in bricks._mcache] == meshes
+    assert bricks.frames == tuple(frames)
+
+
+def test_validation_can_be_turned_off():
+    '''Bad values fail only while validation is on, and trusted leaves it as it was'''
+    game2d.GView(game2d.NullBackend())
+    with pytest.raises(AssertionError):
+        game2d.GRectangle(x='left',y=0,width=10,height=10)
+    game2d.setValidation(False)
+    try:
+        game2d.GRectangle(x=0,y=0,width=10,height=10).width = '10'
+        assert not game2d.getValidation()
+    finally:
+        game2d.setValidation(True)
+    game2d.GRectangle.trusted(x=0,y=0,width=10,height=10)
+    assert game2d.getValidation()
+
+
+@pytest.mark.parametrize('keywords', [{'text':3}, {'font_size':'big'}, {'font_name':'Missing.ttf'},
+                                      {'bold':1}, {'halign':'middle'}, {'valign':'center'}])
+def test_label_checks_its_keywords(keywords):
+    '''A label made with a bad text keyword fails while validation is on'''
+    game2d.GView(game2d.NullBackend())
+    with pytest.raises(AssertionError):
+        game2d.GLabel(**keywords)
+
+
+def test_label_textures_are_cached(monkeypatch):
+    '''A text is rendered once, and the least recently used text is evicted first'''
+    kivy_text = pytest.importorskip('kivy.core.text')
+    rendered = []
+    class Label(object):
+        # Rendering text needs a window, so this only records what is rendered
+        def __init__(self,text,**keywords):
+            self.text = text
+        def refresh(self):
+            rendered.append(self.text)
+            self.texture = object()
+    monkeypatch.setattr(kivy_text,'Label',Label)
+    monkeypatch.setattr(game2d,'_TEXTURES',game2d._TEXTURES.__class__())
+    
+    first = game2d._text_texture('0','Roboto',15,False,[1,1,1,1])
+    assert game2d._text_texture('0','Roboto',15,True,[1,1,1,1]) is not first
+    assert game2d._text_texture('0','Roboto',15,False,[1,1,1,1]) is first
+    for i in range(1,game2d.LABEL_CACHE_SIZE):
+        game2d._text_texture(str(i),'Roboto',15,False,[1,1,1,1])
+    assert len(rendered) == game2d.LABEL_CACHE_SIZE+1
+    
+    # '0' was used after the bold '0', which is the one evicted
+    game2d._text_texture('0','Roboto',15,False,[1,1,1,1])
+    assert len(rendered) == game2d.LABEL_CACHE_SIZE+1
+    game2d._text_texture('0','Roboto',15,True,[1,1,1,1])
+    assert len(rendered) == game2d.LABEL_CACHE_SIZE+2
+    assert len(game2d._TEXTURES) == game2d.LABEL_CACHE_SIZE
+
+
+def test_shapes_of_a_color_share_its_instruction():
+    '''Shapes of the same color use one color instruction, made once per backend,
+    and interned colors are one object'''
+    assert game2d.colormodel.intern(255,0,0) is game2d.colormodel.RED
+    backend = game2d.RecordingBackend()
+    view = game2d.GView(backend)
+    made = backend.getMade()['color']
+    for x in range(0,100,10):
+        view.attach(game2d.GRectangle(x=x,y=0,width=5,height=5,fillcolor=game2d.colormodel.RED,
+                                      linecolor=[1,0,0,1]))
+    assert backend.getMade()['color'] == made+1
+    # The view draws its backdrop first, then each square has the same red
+    colors = [cmd for cmd in backend.getDrawn() if cmd.kind == 'color'][1:]
+    assert len(colors) == 10 and all(cmd is colors[0] for cmd in colors)
+    assert colors[0].rgba == [1.0,0.0,0.0,1.0]
+    
+    # A new view makes its own instructions, with its own backend
+    other = game2d.RecordingBackend()
+    game2d.GView(other).attach(game2d.GRectangle(x=0,y=0,width=5,height=5,fillcolor=[1,0,0,1]))
+    red = [cmd for cmd in other.getDrawn() if cmd.kind == 'color'][-1]
+    assert red.rgba == colors[0].rgba and not red is colors[0]
@@ -0,0 +1,49 @@
+# test_gameplay.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Tests of the subcontroller in gameplay.py, without a window"""
+import random
+import game2d
+from constants import *
+from gameplay import *
+
+
+def same(a, b):
+    '''Returns: True if the States a and b are equal, comparing the masks by value'''
+    return (a._replace(alive=None) == b._replace(alive=None) and
+            bool((a.alive == b.alive).all()))
+
+
+def play(game, ticks):
+    '''Plays up to ticks updates of game with a mouse sweeping back and forth,
+    serving a new ball when one is lost, and returns the State at the end'''
+    for tick in range(ticks):
+        if game.getBall() is None or game.getBall().y <= 0:
+            if game.getTries() == 0 or game.getWin():
+                break
+            game.createBall()
+        game.update(game2d.GPoint(GAME_WIDTH/2 + 150*((tick // 40) % 3 - 1), 0))
+    return game.snapshot()
+
+
+def test_restore_puts_the_game_back():
+    '''A restored game has the State of the snapshot, shows the bricks of that
+    State, and plays on exactly as it did after the snapshot was taken'''
+    game = Gameplay(random.Random(4))
+    game.attach(game2d.GView(game2d.RecordingBackend()))
+    game.createBall()
+    play(game, 300)
+    snap = game.snapshot()
+    later = play(game, 3000)
+    assert game.score() > 0 and not same(snap, later)
+    
+    game.restore(snap)
+    assert same(game.snapshot(), snap)
+    bricks = game._wall._batch
+    assert [bricks.isVisible(i) for i in range(len(snap.alive))] == list(snap.alive)
+    assert same(play(game, 3000), later)
+    
+    # A snapshot can be restored again, into another game
+    other = Gameplay()
+    other.restore(snap)
+    assert same(other.snapshot(), snap)
@@ -0,0 +1,57 @@
+# test_models.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Tests of the models in models.py, without a window"""
+import pytest
+import game2d
+import simulation
+from models import *
+
+
+def test_wall_batch_is_reused_by_its_view_only():
+    '''A detached wall leaves its batch to the next wall in the same view, with
+    every brick shown again, and never to a wall in another view'''
+    backend = game2d.RecordingBackend()
+    view = game2d.GView(backend)
+    other = game2d.GView(backend)
+    wall = simulation.Wall()
+    old = BrickWall(wall)
+    old.attach(view)
+    wall.removeBrick(0)
+    old.refresh()
+    batch = old._batch
+    old.detach()
+    elsewhere = BrickWall(simulation.Wall())
+    elsewhere.attach(other)
+    assert not elsewhere._batch is batch
+    new = BrickWall(simulation.Wall())
+    new.attach(view)
+    assert new._batch is batch
+    assert batch.isVisible(0)
+
+
+def test_wall_batch_is_not_reused_by_a_wall_of_another_size():
+    '''A wall with more or fewer bricks than the last one makes its own batch'''
+    view = game2d.GView(game2d.RecordingBackend())
+    old = BrickWall(simulation.Wall(rows=2))
+    old.attach(view)
+    batch = old._batch
+    old.detach()
+    new = BrickWall(simulation.Wall(rows=3))
+    new.attach(view)
+    assert not new._batch is batch
+    assert len(new._batch.colors) == new._wall.getSize()
+
+
+def test_shapes_have_no_instance_dictionary():
+    '''Points, colors, boxes and the shapes of the game keep their attributes
+    in slots, so a misspelled attribute cannot be set by mistake'''
+    game2d.GView(game2d.NullBackend())
+    shapes = [game2d.GPoint(1,2), game2d.colormodel.RGB(1,2,3), game2d.GBox(0,0,10,10),
+              game2d.GRectangle(x=0,y=0,width=10,height=10), Ball(0.0,0.0),
+              game2d.GLine(points=[0,0,10,10]), game2d.GLabel(text='Score'),
+              game2d.GBatch(frames=[(0,0,10,10)])]
+    for shape in shapes:
+        assert not hasattr(shape,'__dict__'), type(shape).__name__
+        with pytest.raises(AttributeError):
+            shape.colour = None
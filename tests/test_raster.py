@@ -0,0 +1,67 @@
+# test_raster.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Tests of the software rasterizer raster.py"""
+import numpy
+import game2d
+import raster
+
+
+def scene(backend, x, y):
+    '''Returns: the red square at (x,y) attached to a new view of backend, next
+    to a blue square and a batch of two green squares'''
+    view = game2d.GView(backend)
+    square = game2d.GRectangle(x=x,y=y,width=10,height=10,fillcolor=[1,0,0,1],linecolor=[1,0,0,1])
+    view.attach(game2d.GRectangle(x=70,y=50,width=10,height=10,fillcolor=[0,0,1,1],linecolor=[0,0,1,1]))
+    bricks = game2d.GBatch(frames=[(10,50,20,8),(40,50,20,8)],colors=[[0,1,0,1]]*2)
+    view.attach(bricks)
+    view.attach(square)
+    return square, bricks
+
+
+def test_only_the_pixels_that_changed_are_redrawn():
+    '''Moving a shape or hiding a rectangle of a batch redraws the boxes it
+    covered and covers, and gives the picture of a scene drawn from scratch'''
+    backend = raster.RasterBackend(100,80)
+    square, bricks = scene(backend,10,10)
+    backend.getFrame()
+    backend.getFrame()
+    assert backend.getRedrawn() == 0
+    
+    square.setPosition(40,20)
+    bricks.hide(0)
+    frame = backend.getFrame().copy()
+    # With its border, each box is at most 2 pixels larger than the shape on every side
+    assert 2*10*10 + 20*8 <= backend.getRedrawn() <= 2*14*14 + 24*12
+    
+    fresh = raster.RasterBackend(100,80)
+    other, hidden = scene(fresh,40,20)
+    hidden.hide(0)
+    assert (fresh.getFrame() == frame).all()
+    assert fresh.getRedrawn() > backend.getRedrawn()
+    # Row 0 of the frame is the top of the screen
+    assert list(frame[80-25,45]) == [255,0,0] and list(frame[80-15,15]) == [255,255,255]
+    assert list(frame[80-54,15]) == [255,255,255] and list(frame[80-54,45]) == [0,255,0]
+
+
+def test_changes_in_a_batch_are_sent_once():
+    '''Moving a shape in a batch changes its instruction once, as setPosition
+    does, instead of once for every attribute'''
+    redrawn = []
+    for move in ('setPosition','batch','attributes'):
+        backend = raster.RasterBackend(100,80)
+        square, bricks = scene(backend,10,10)
+        backend.getFrame()
+        if move == 'setPosition':
+            square.setPosition(40,20)
+        elif move == 'batch':
+            with square.batch():
+                square.x = 40
+                square.y = 20
+        else:
+            square.x = 40
+            square.y = 20
+        frame = backend.getFrame()
+        assert list(frame[80-25,45]) == [255,0,0]
+        redrawn.append(backend.getRedrawn())
+    assert redrawn[0] == redrawn[1] < redrawn[2]
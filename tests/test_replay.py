@@ -0,0 +1,81 @@
+# test_replay.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Tests of the replay files written and read by replay.py"""
+import random
+import pytest
+from constants import *
+from game2d import GPoint
+from simulation import *
+from replay import *
+
+
+def same(a, b):
+    '''Returns: True if the States a and b are equal, comparing the masks by value'''
+    return (a._replace(alive=None) == b._replace(alive=None) and
+            bool((a.alive == b.alive).all()))
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    '''Returns: the path of a replay of two games, and the list of the States of
+    each game after each of its records (the first is the start of the game)'''
+    path = str(tmp_path / 'games.brk')
+    recorder = Recorder(path)
+    moves = random.Random(0)
+    states = []
+    for seed in (11, 12):
+        sim = Simulation(random.Random(seed))
+        recorder.game(seed, sim)
+        states.append([sim.getState()])
+        sim.createBall()
+        recorder.serve()
+        states[-1].append(sim.getState())
+        touch = 0.0
+        while len(states[-1]) <= 2*KEYFRAME_INTERVAL + 100:
+            touch = touch + moves.uniform(-20, 20)
+            point = None if moves.random() < 0.1 else GPoint(touch, 0)
+            sim.update(None if point is None else point.x)
+            recorder.update(point)
+            states[-1].append(sim.getState())
+            if sim.getBall()[1] <= 0:
+                sim.createBall()
+                recorder.serve()
+                states[-1].append(sim.getState())
+    recorder.close()
+    return (path, states)
+
+
+def test_replay_plays_the_recorded_games(recorded):
+    '''Playing every record of a game gives the game that was recorded'''
+    path, states = recorded
+    replay = Replay(path)
+    assert replay.getGames() == len(states)
+    for game in range(replay.getGames()):
+        assert replay.getSeed(game) == 11 + game
+        assert replay.getLength(game) == len(states[game]) - 1
+        assert same(play(replay, game).getState(), states[game][-1])
+    replay.close()
+
+
+def test_seek_matches_playing_from_the_start(recorded):
+    '''seek(game, n) gives the game after n records, on both sides of a keyframe'''
+    path, states = recorded
+    replay = Replay(path)
+    for game in range(replay.getGames()):
+        length = replay.getLength(game)
+        frames = [0, 1, KEYFRAME_INTERVAL-1, KEYFRAME_INTERVAL, KEYFRAME_INTERVAL+1,
+                  2*KEYFRAME_INTERVAL-1, 2*KEYFRAME_INTERVAL, 2*KEYFRAME_INTERVAL+1, length]
+        for frame in frames:
+            assert same(replay.seek(game, frame).getState(), states[game][frame]), frame
+    replay.close()
+
+
+def test_records_start_at_a_keyframe(recorded):
+    '''The records after a keyframe are the tail of the records of the game'''
+    path, states = recorded
+    replay = Replay(path)
+    every = list(replay.records(1))
+    assert list(replay.records(1, KEYFRAME_INTERVAL)) == every[KEYFRAME_INTERVAL:]
+    assert list(replay.records(1, 2*KEYFRAME_INTERVAL)) == every[2*KEYFRAME_INTERVAL:]
+    replay.close()
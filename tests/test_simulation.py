@@ -0,0 +1,111 @@
+# test_simulation.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Tests of the headless rules in simulation.py"""
+import random
+import numpy
+import pytest
+from constants import *
+from simulation import *
+
+
+def same(a, b):
+    '''Returns: True if the States a and b are equal, comparing the masks by value'''
+    return (a._replace(alive=None) == b._replace(alive=None) and
+            bool((a.alive == b.alive).all()))
+
+
+@pytest.mark.parametrize('push', [None, 0.0, 400.0, -400.0, 37.5, -12.25])
+def test_advance_matches_update(push):
+    '''advance(touch, n) plays the same game as n calls of update(touch), even
+    while the touch keeps pushing the paddle past the edge of the screen'''
+    for seed in range(40):
+        plain = Simulation(random.Random(seed))
+        skip = Simulation(random.Random(seed))
+        # Grab the mouse at 0, then hold it at push for a while at a time
+        moves = random.Random(1000+seed)
+        for sim in (plain, skip):
+            sim.createBall()
+            sim.update(0.0)
+        while plain.getTries() > 0 and not plain.getWin():
+            touch = None if push is None else push*moves.randint(1, 3)
+            ticks = moves.randint(1, 400)
+            done = skip.advance(touch, ticks)
+            for tick in range(done):
+                plain.update(touch)
+            assert same(plain.getState(), skip.getState()), 'seed '+repr(seed)
+            if plain.getBall()[1] <= 0:
+                if plain.getTries() == 0:
+                    break
+                plain.createBall()
+                skip.createBall()
+
+
+@pytest.mark.parametrize('rows, columns', [(BRICK_ROWS, BRICKS_IN_ROW), (3, 5), (30, 12)])
+def test_wall_finds_its_bricks(rows, columns):
+    '''Each brick of a wall of any size is found at its own center'''
+    wall = Wall(rows, columns)
+    assert wall.getSize() == rows*columns
+    left, bottom, right, top = wall.getEdges()
+    xs = (left + right)/2
+    ys = (bottom + top)/2
+    for i in range(wall.getSize()):
+        assert wall.getBrickAt(xs[i], ys[i]) == i
+        assert wall.getBricksIn(xs[i], ys[i], xs[i], ys[i]) == [i]
+    assert wall.removeBricksAt(xs, ys).all()
+    assert wall.getCount() == 0
+
+
+def test_advance_matches_update_over_a_long_flight():
+    '''A ball flying thousands of updates without hitting anything ends up where
+    as many updates put it, to the last bit, where x + vx*ticks would not'''
+    plain = Simulation(random.Random(0))
+    plain.createBall()
+    # A slow ball rising from the center has a long way to the bricks
+    state = plain.getState()._replace(vx=0.0123, vy=0.0371)
+    plain.setState(state)
+    skip = Simulation(random.Random(0))
+    skip.setState(state)
+    assert skip.advance(None, 3000) == 3000
+    for tick in range(3000):
+        plain.update(None)
+    assert same(plain.getState(), skip.getState())
+    assert plain.getBall()[:2] != (state.x + state.vx*3000, state.y + state.vy*3000)
+
+
+def test_storm_credits_a_brick_to_the_lowest_ball():
+    '''Balls hitting the same brick in the same pass all bounce, and only the one
+    with the lowest index is credited'''
+    wall = Wall()
+    storm = Storm(wall, 3, random.Random(0))
+    # Ball 2 is ball 0 again, and ball 1 flies straight up
+    storm._vx[2] = storm._vx[0]
+    storm._vx[1] = 0.0
+    storm._vy[:] = 5.0
+    while wall.getCount() == BRICKS_IN_ROW*BRICK_ROWS:
+        storm.update(0.0)
+    x, y, vx, vy = storm.getBalls()
+    assert list(vy) == [-5.0, -5.0, -5.0]
+    assert x[0] == x[2] and y[0] == y[2]
+    credit = storm.getCredit()
+    assert credit[0] > 0 and credit[2] == 0
+    assert credit.sum() == BRICKS_IN_ROW*BRICK_ROWS - wall.getCount()
+
+
+@pytest.mark.parametrize('speed', [30.0, 60.0, 200.0])
+def test_fast_ball_does_not_tunnel_through_a_brick(speed):
+    '''A ball moving further than a brick is thick in one update still hits it'''
+    sim = Simulation(random.Random(0))
+    sim.createBall()
+    left, bottom, right, top = sim.getWall().getBrick(0)
+    alive = numpy.zeros(BRICKS_IN_ROW*BRICK_ROWS, dtype=bool)
+    alive[0] = True
+    # The top of the ball is just below the brick, which it passes in one update
+    y = bottom - BALL_DIAMETER - 1.0
+    assert y + speed > top
+    sim.setState(sim.getState()._replace(x=left+1.0, y=y, prevX=left+1.0, prevY=y,
+                                          vx=0.0, vy=speed, alive=alive))
+    sim.update(None)
+    state = sim.getState()
+    assert not sim.getWall().isAlive(0)
+    assert state.vy == -speed and state.y + BALL_DIAMETER <= bottom
@@ -0,0 +1,30 @@
+# test_tracing.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Tests of the trace-event writer tracing.py"""
+import json
+import tracing
+
+
+def test_trace_file_has_the_spans(tmp_path):
+    '''The spans and traced calls made while tracing is on are written as "X" events'''
+    @tracing.traced('double')
+    def double(x):
+        return 2*x
+    
+    assert double(1) == 2 and not tracing.enabled()
+    path = str(tmp_path / 'trace.json')
+    tracing.start(path)
+    try:
+        with tracing.span('frame'):
+            for x in range(tracing.TRACE_BUFFER):
+                double(x)
+    finally:
+        tracing.stop()
+    assert not tracing.enabled()
+    
+    with open(path) as file:
+        events = json.load(file)
+    names = [event['name'] for event in events]
+    assert names.count('double') == tracing.TRACE_BUFFER and names[-1] == 'frame'
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
@@ -0,0 +1,210 @@
+# tracing.py
+# Thomas Noone tgn8 and Theodore Comora thc34
+# 10/18/2026
+"""Trace events for Breakout
+
+This module records spans of time spent in the game loop, and writes them as a
+Chrome trace-event file (a JSON array of complete "X" events), which can be
+opened in chrome://tracing or https://ui.perfetto.dev.  The viewer then shows
+every frame, with the update, draw, physics and text rendering inside it.
+
+Tracing is off unless start is called.  While it is off, span returns a shared
+object that does nothing and a traced function calls the function it wraps
+right away, so the instrumented code costs almost nothing.
+
+Spans are kept in a list of at most TRACE_BUFFER events.  A full list is handed
+to a background thread that writes it to the file.  If the thread falls more
+than TRACE_QUEUE lists behind, new lists are dropped (and counted) rather than
+making the game wait for the disk.
+
+This module does not use Kivy, so the simulation can be traced headless too."""
+import functools
+import json
+import os
+import queue
+import threading
+import time
+
+#: the number of events kept before they are handed to the writer thread
+TRACE_BUFFER = 4096
+#: the most lists of events waiting for the writer thread
+TRACE_QUEUE = 16
+
+# The tracer in use, or None if tracing is off
+_tracer = None
+
+
+class Tracer(object):
+    """An instance writes a trace-event file.
+
+    INSTANCE ATTRIBUTES:
+        _file    [file object, or None once closed]: the file being written
+        _events  [list of dict]: the events not yet handed to the writer thread
+        _queue   [queue.Queue]: lists of events waiting to be written, ended by None
+        _thread  [threading.Thread]: the thread writing the events
+        _dropped [int >= 0]: the number of events dropped because the writer was behind
+        _pid     [int]: the process id written in every event
+        _first   [bool]: True if no event has been written to the file yet
+    """
+
+    def getDropped(self):
+        '''Returns: the number of events dropped because the writer was behind'''
+        return self._dropped
+
+    def __init__(self, path):
+        '''Creates the trace file at path.
+
+        Precondition: path is a string naming a file that can be written.'''
+        self._file = open(path, 'w')
+        self._file.write('[')
+        self._events = []
+        self._queue = queue.Queue(TRACE_QUEUE)
+        self._thread = threading.Thread(target=self._write, daemon=True)
+        self._thread.start()
+        self._dropped = 0
+        self._pid = os.getpid()
+        self._first = True
+
+    def add(self, name, start, end):
+        '''Adds a span that ran from start to end.
+
+        Precondition: name is a string; start <= end are times from
+        time.perf_counter() (floats, in seconds).'''
+        self._events.append({'name': name, 'ph': 'X', 'ts': start*1e6, 'dur': (end-start)*1e6,
+                             'pid': self._pid, 'tid': threading.get_ident()})
+        if len(self._events) >= TRACE_BUFFER:
+            self._flush()
+
+    def close(self):
+        '''Writes the rest of the events and closes the file.
+
+        It is safe to call this more than once.'''
+        if self._file is None:
+            return
+        self._flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._file.write(']\n')
+        self._file.close()
+        self._file = None
+
+    def _flush(self):
+        '''Hands the events to the writer thread, or drops them if it is behind'''
+        if len(self._events) == 0:
+            return
+        try:
+            self._queue.put_nowait(self._events)
+        except queue.Full:
+            self._dropped = self._dropped + len(self._events)
+        self._events = []
+
+    def _write(self):
+        '''Writes the lists of events in the queue to the file until it gets None.
+
+        This is the body of the writer thread.'''
+        events = self._queue.get()
+        while not events is None:
+            for event in events:
+                if not self._first:
+                    self._file.write(',\n')
+                self._file.write(json.dumps(event))
+                self._first = False
+            events = self._queue.get()
+        self._file.flush()
+
+
+class _Span(object):
+    """An instance times a span of a Tracer, as a context manager.
+
+    INSTANCE ATTRIBUTES:
+        _tracer [Tracer]: the tracer to add the span to
+        _name   [str]: the name of the span
+        _start  [float]: the time the span began, from time.perf_counter()
+    """
+
+    def __init__(self, tracer, name):
+        '''Creates a span with the given name for the given tracer.
+
+        Precondition: tracer is a Tracer; name is a string.'''
+        self._tracer = tracer
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, kind, value, traceback):
+        self._tracer.add(self._name, self._start, time.perf_counter())
+        return False
+
+
+class _NoSpan(object):
+    """An instance is a context manager that does nothing, used while tracing is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, kind, value, traceback):
+        return False
+
+
+# The span returned while tracing is off
+_NOSPAN = _NoSpan()
+
+
+def start(path):
+    '''Starts tracing to the file at path, closing any trace already running.
+
+    Precondition: path is a string naming a file that can be written.'''
+    global _tracer
+    stop()
+    _tracer = Tracer(path)
+
+
+def stop():
+    '''Stops tracing, writing the rest of the trace file.
+
+    It does nothing if tracing is off.'''
+    global _tracer
+    if not _tracer is None:
+        _tracer.close()
+        _tracer = None
+
+
+def enabled():
+    '''Returns: True if tracing is on'''
+    return not _tracer is None
+
+
+def span(name):
+    '''Returns: a context manager timing the code in its with block as a span.
+
+    For example
+
+        with tracing.span('draw'):
+            self.draw()
+
+    Precondition: name is a string.'''
+    if _tracer is None:
+        return _NOSPAN
+    return _Span(_tracer, name)
+
+
+def traced(name):
+    '''Returns: a decorator that times every call of a function as a span.
+
+    Precondition: name is a string, the name of the spans.'''
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **keywords):
+            tracer = _tracer
+            if tracer is None:
+                return function(*args, **keywords)
+            start = time.perf_counter()
+            try:
+                return function(*args, **keywords)
+            finally:
+                tracer.add(name, start, time.perf_counter())
+        return wrapper
+    return decorate